@@ -3,11 +3,22 @@ from typing import Optional
 
 from flask import Flask
 from flask_jwt_extended import JWTManager
+from werkzeug.middleware.proxy_fix import ProxyFix
 
+from app.core.cache import profile_cache, token_state_cache
 from app.core.error_handlers import error_handler_bp
+from app.core.idempotency import idempotency_store
+from app.core.json_provider import init_json_provider
+from app.core.password_hasher import password_hasher
+from app.core.rate_limiter import login_rate_limiter
+from app.core.token_denylist import token_denylist
 from app.db.database import init_db
+from app.extensions.metrics import init_metrics
 from app.extensions.sentry import init_sentry
+from app.v1.api.jwt_callbacks import register_jwt_callbacks
 from app.v1.api.routes import register_v1_routes
+from app.v1.commands.user_commands import users_cli
+from app.v1.events.email_publisher import init_email_publisher
 from config import DevelopmentConfig, ProductionConfig
 
 jwt = JWTManager()
@@ -28,10 +39,25 @@ def create_app(db_url: Optional[str] = None, testing: Optional[bool] = False) ->
     app.config["SQLALCHEMY_DATABASE_URI"] = db_url or app.config["DATABASE_URL"]
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
+    if app.config["TRUSTED_PROXY_COUNT"]:
+        app.wsgi_app = ProxyFix(  # type: ignore[method-assign]
+            app.wsgi_app, x_for=app.config["TRUSTED_PROXY_COUNT"]
+        )
+
     # Initialize extensions
     init_sentry(app)
+    init_json_provider(app)
     init_db(app)
+    init_metrics(app)
     jwt.init_app(app)
+    register_jwt_callbacks(jwt)
+    password_hasher.init_app(app)
+    login_rate_limiter.init_app(app)
+    profile_cache.init_app(app)
+    token_state_cache.init_app(app)
+    idempotency_store.init_app(app)
+    token_denylist.init_app(app)
+    init_email_publisher(app)
 
     # Register blueprints
     register_v1_routes(app)
@@ -39,4 +65,7 @@ def create_app(db_url: Optional[str] = None, testing: Optional[bool] = False) ->
     # Register error handlers
     app.register_blueprint(error_handler_bp)
 
+    # Register CLI commands
+    app.cli.add_command(users_cli)
+
     return app
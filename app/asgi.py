@@ -0,0 +1,86 @@
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app import create_app
+from app.core.error_handlers import INTERNAL_SERVER_ERROR
+from app.db.async_database import AsyncDatabase
+from app.v1.api.async_routes import v1_async_routes
+
+logger = logging.getLogger(__name__)
+
+
+async def handle_generic_exception(_request: Request, e: Exception) -> JSONResponse:
+    logger.exception("Unhandled exception: %s", str(e))
+    return JSONResponse(INTERNAL_SERVER_ERROR, status_code=500)
+
+
+class ForwardedForMiddleware:
+    """Resolve the client address from X-Forwarded-For as werkzeug's
+    ``ProxyFix(x_for=trusted_proxy_count)`` does for the WSGI app: the entry
+    the outermost trusted proxy appended, counted from the right. Entries
+    further left are client-supplied and ignored; with fewer entries than
+    trusted proxies the connection's address is kept."""
+
+    def __init__(self, app: ASGIApp, trusted_proxy_count: int):
+        self.app = app
+        self.trusted_proxy_count = trusted_proxy_count
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] in ("http", "websocket"):
+            forwarded = [
+                entry.strip()
+                for name, value in scope["headers"]
+                if name == b"x-forwarded-for"
+                for entry in value.decode("latin-1").split(",")
+            ]
+            if len(forwarded) >= self.trusted_proxy_count:
+                client = scope.get("client")
+                port = client[1] if client else 0
+                scope = dict(scope, client=(forwarded[-self.trusted_proxy_count], port))
+        await self.app(scope, receive, send)
+
+
+def create_asgi_app(
+    db_url: Optional[str] = None, testing: Optional[bool] = False
+) -> Starlette:
+    """The /v1/auth and /v1/users API on an asyncio database driver.
+
+    Configuration, JWT, caches, the password hasher and the email publisher
+    come from the Flask app ``create_app`` builds, so both entry points
+    behave alike; the internal and CLI endpoints stay on WSGI.
+    """
+    flask_app = create_app(db_url, testing)
+    database = AsyncDatabase(
+        flask_app.config, flask_app.config["SQLALCHEMY_DATABASE_URI"]
+    )
+
+    @asynccontextmanager
+    async def lifespan(_app: Starlette) -> AsyncIterator[None]:
+        yield
+        await database.dispose()
+
+    middleware: List[Middleware] = []
+    if flask_app.config["TRUSTED_PROXY_COUNT"]:
+        middleware.append(
+            Middleware(
+                ForwardedForMiddleware,
+                trusted_proxy_count=flask_app.config["TRUSTED_PROXY_COUNT"],
+            )
+        )
+
+    app = Starlette(
+        routes=v1_async_routes,
+        middleware=middleware,
+        exception_handlers={Exception: handle_generic_exception},
+        lifespan=lifespan,
+    )
+    app.state.flask_app = flask_app
+    app.state.db = database
+    return app
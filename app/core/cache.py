@@ -0,0 +1,87 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Protocol, Tuple
+
+from flask import Flask
+
+from app.core.metrics import CACHE_EVICTIONS, CACHE_LOOKUPS
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Optional[Any]: ...
+
+    def set(self, key: str, value: Any) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+
+class TTLCache:
+    """Thread-safe in-process LRU cache whose entries also expire after ``ttl``.
+
+    A shared store (e.g. Redis) can replace it anywhere a ``CacheBackend`` is
+    accepted. Sizes and TTL come from ``<NAME>_CACHE_MAX_SIZE`` and
+    ``<NAME>_CACHE_TTL``; a max size of 0 disables caching. Lookups and
+    evictions are counted in ``stats()`` and as cache_* Prometheus counters.
+    """
+
+    def __init__(self, name: str, max_size: int = 10_000, ttl: float = 60.0):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def init_app(self, app: Flask) -> None:
+        prefix = self.name.upper()
+        self.max_size = app.config[f"{prefix}_CACHE_MAX_SIZE"]
+        self.ttl = app.config[f"{prefix}_CACHE_TTL"]
+        self.clear()
+        app.extensions[f"{self.name}_cache"] = self
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                value, result = None, "miss"
+            elif entry[0] <= time.monotonic():
+                del self._entries[key]
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                value, result = None, "miss"
+                CACHE_EVICTIONS.labels(self.name, "expired").inc()
+            else:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                value, result = entry[1], "hit"
+        CACHE_LOOKUPS.labels(self.name, result).inc()
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+                CACHE_EVICTIONS.labels(self.name, "capacity").inc()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, size=len(self._entries))
+
+
+profile_cache = TTLCache("profile")
+token_state_cache = TTLCache("token_state", ttl=30.0)
@@ -6,6 +6,13 @@ from werkzeug.exceptions import HTTPException
 error_handler_bp = Blueprint("error_handlers", __name__)
 logger = logging.getLogger(__name__)
 
+INTERNAL_SERVER_ERROR = {
+    "error": {
+        "type": "InternalServerError",
+        "message": "An unexpected error occurred.",
+    }
+}
+
 
 @error_handler_bp.app_errorhandler(HTTPException)
 def handle_http_exception(e: HTTPException) -> tuple[Response, int]:
@@ -23,13 +30,7 @@ def handle_http_exception(e: HTTPException) -> tuple[Response, int]:
 @error_handler_bp.app_errorhandler(Exception)
 def handle_generic_exception(e: Exception) -> tuple[Response, int]:
     logger.exception("Unhandled exception: %s", str(e))
-    response = {
-        "error": {
-            "type": "InternalServerError",
-            "message": "An unexpected error occurred.",
-        }
-    }
-    return jsonify(response), 500
+    return jsonify(INTERNAL_SERVER_ERROR), 500
 
 
 class UserNotFoundException(Exception):
@@ -0,0 +1,302 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import threading
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, TypeVar, cast
+
+import pytz
+from flask import Flask
+from sqlalchemy.orm.scoping import scoped_session
+
+from app.core.error_handlers import ValidationException
+from app.core.metrics import IDEMPOTENT_REQUESTS, IDEMPOTENT_WORK_SAVED
+from app.v1.models.idempotency_key import IdempotencyKey
+from app.v1.repositories.idempotency_key_repository import IdempotencyKeyRepository
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+KEY_MISMATCH_ERROR = "Idempotency-Key was already used with a different request"
+IN_FLIGHT_ERROR = "A request with this Idempotency-Key is still in progress"
+
+T = TypeVar("T")
+# Runs a function with a database session, the way AsyncAPI.run does.
+SessionRunner = Callable[[Callable[[scoped_session], T]], Awaitable[T]]
+
+
+class IdempotencyKeyMismatch(Exception):
+    pass
+
+
+class IdempotencyInFlight(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class IdempotentResponse:
+    body: Any
+    status: int
+    # Whether the body comes from another execution of the same request.
+    replayed: bool = False
+    # Whether the work already stored it for retries, see IdempotencyStore.stage.
+    stored: bool = False
+
+
+@dataclass(frozen=True)
+class IdempotentRequest:
+    endpoint: str
+    # The Idempotency-Key, if one was sent.
+    key: Optional[str]
+    # A digest of the body: a key is only replayed for the body it came with.
+    fingerprint: str
+
+    @property
+    def flight_key(self) -> str:
+        if self.key:
+            return f"{self.endpoint}:key:{self.key}"
+        return f"{self.endpoint}:body:{self.fingerprint}"
+
+    @property
+    def response_key(self) -> str:
+        return f"{self.endpoint}:{self.key}"
+
+
+def idempotency_key(value: Optional[str]) -> Optional[str]:
+    """The ``Idempotency-Key`` header value, if one was sent."""
+    if value is None:
+        return None
+    if not 0 < len(value) <= IDEMPOTENCY_KEY_MAX_LENGTH:
+        raise ValidationException(
+            f"{IDEMPOTENCY_KEY_HEADER} must be 1-{IDEMPOTENCY_KEY_MAX_LENGTH} "
+            "characters"
+        )
+    return value
+
+
+class _Flight:
+    """An execution in progress, shared with the requests that join it."""
+
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.response: Optional[IdempotentResponse] = None
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+        self.future: Optional["asyncio.Future[None]"] = None
+
+
+class IdempotencyStore:
+    """Runs each request once per ``Idempotency-Key`` and replays its response
+    to retries for IDEMPOTENCY_KEY_TTL.
+
+    Responses are stored in the idempotency_keys table, so a retry landing on
+    any worker is replayed; work that writes to the database stores its
+    response in the same transaction (``stage``). Keys are scoped by endpoint
+    and tied to the body they were first used with. 5xx responses are not
+    kept, so a retry after a failure runs again. In front of the table,
+    concurrent requests with the same key, or without a key but with the same
+    body, join the execution already in progress in this process instead of
+    starting their own.
+    """
+
+    def __init__(
+        self,
+        name: str = "idempotency",
+        wait_timeout: float = 30.0,
+        ttl: float = 86_400.0,
+    ):
+        self.name = name
+        self.wait_timeout = wait_timeout
+        self.ttl = ttl
+        self.secret = b""
+        self._flights: Dict[str, _Flight] = {}
+        # Only touched from the event loop's thread.
+        self._async_flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app: Flask) -> None:
+        self.wait_timeout = app.config["IDEMPOTENCY_WAIT_TIMEOUT"]
+        self.ttl = app.config["IDEMPOTENCY_KEY_TTL"]
+        self.secret = app.config["SECRET_KEY"].encode()
+        app.extensions[f"{self.name}_store"] = self
+
+    def fingerprint(self, payload: Any) -> str:
+        """A digest of a request body. Keyed with SECRET_KEY: bodies carry
+        passwords, and the digest is stored in idempotency_keys."""
+        canonical = json.dumps(
+            payload, sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hmac.new(self.secret, canonical.encode(), hashlib.sha256).hexdigest()
+
+    def stage(
+        self,
+        session: scoped_session,
+        request: IdempotentRequest,
+        response: IdempotentResponse,
+    ) -> IdempotentResponse:
+        """Add ``response`` to ``session`` as the one to replay for
+        ``request``, so it commits, or rolls back, with the writes it
+        reports. Returns it marked as stored."""
+        if not request.key:
+            return response
+        IdempotencyKeyRepository(session).stage(self._record(request, response))
+        return replace(response, stored=True)
+
+    def execute(
+        self,
+        request: IdempotentRequest,
+        work: Callable[[], IdempotentResponse],
+        session: scoped_session,
+        saved_work: Sequence[str] = (),
+    ) -> IdempotentResponse:
+        """``work()``'s response, or the response of an earlier or concurrent
+        execution of the same request; ``saved_work`` names what a request
+        that does not run ``work`` is spared, for the metrics. Requests
+        without a key do not touch ``session``."""
+        flight_key = request.flight_key
+        with self._lock:
+            flight = self._flights.get(flight_key)
+            leader = flight is None
+            if flight is None:
+                flight = self._flights[flight_key] = _Flight(request.fingerprint)
+        if not leader:
+            self._check_fingerprint(request, flight)
+            if not flight.done.wait(self.wait_timeout):
+                IDEMPOTENT_REQUESTS.labels(request.endpoint, "in_flight").inc()
+                raise IdempotencyInFlight()
+            return self._shared(request, flight, saved_work)
+        try:
+            response = self._replay(session, request, saved_work)
+            if response is None:
+                response = work()
+                IDEMPOTENT_REQUESTS.labels(request.endpoint, "executed").inc()
+                if self._keeps(request, response):
+                    self._remember(session, request, response)
+            flight.response = response
+            return response
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            # Forgotten only once the response is stored, so a request
+            # arriving now either joins the flight or finds the response.
+            with self._lock:
+                del self._flights[flight_key]
+            flight.done.set()
+
+    async def execute_async(
+        self,
+        request: IdempotentRequest,
+        work: Callable[[], Awaitable[IdempotentResponse]],
+        run: SessionRunner[Optional[IdempotentResponse]],
+        saved_work: Sequence[str] = (),
+    ) -> IdempotentResponse:
+        """``execute`` for the event loop: requests joining a flight wait on
+        it without holding a thread, and the idempotency_keys table is read
+        and written through ``run``."""
+        flight_key = request.flight_key
+        flight = self._async_flights.get(flight_key)
+        if flight is not None and flight.future is not None:
+            self._check_fingerprint(request, flight)
+            try:
+                await asyncio.wait_for(
+                    asyncio.shield(flight.future), timeout=self.wait_timeout
+                )
+            except asyncio.TimeoutError as e:
+                IDEMPOTENT_REQUESTS.labels(request.endpoint, "in_flight").inc()
+                raise IdempotencyInFlight() from e
+            return self._shared(request, flight, saved_work)
+
+        flight = self._async_flights[flight_key] = _Flight(request.fingerprint)
+        flight.future = asyncio.get_running_loop().create_future()
+        try:
+            response = None
+            if request.key:
+                response = await run(
+                    lambda session: self._replay(session, request, saved_work)
+                )
+            if response is None:
+                executed = await work()
+                IDEMPOTENT_REQUESTS.labels(request.endpoint, "executed").inc()
+                if self._keeps(request, executed):
+                    await run(
+                        lambda session: self._remember(session, request, executed)
+                    )
+                response = executed
+            flight.response = response
+            return response
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            del self._async_flights[flight_key]
+            flight.future.set_result(None)
+
+    @staticmethod
+    def _check_fingerprint(request: IdempotentRequest, flight: _Flight) -> None:
+        if flight.fingerprint != request.fingerprint:
+            IDEMPOTENT_REQUESTS.labels(request.endpoint, "mismatched").inc()
+            raise IdempotencyKeyMismatch()
+
+    def _replay(
+        self,
+        session: scoped_session,
+        request: IdempotentRequest,
+        saved_work: Sequence[str],
+    ) -> Optional[IdempotentResponse]:
+        if not request.key:
+            return None
+        stored = IdempotencyKeyRepository(session).get(request.response_key)
+        if stored is None:
+            return None
+        if stored.fingerprint != request.fingerprint:
+            IDEMPOTENT_REQUESTS.labels(request.endpoint, "mismatched").inc()
+            raise IdempotencyKeyMismatch()
+        self._count_saved(request.endpoint, "replayed", saved_work)
+        return IdempotentResponse(json.loads(stored.body), stored.status, True, True)
+
+    @staticmethod
+    def _keeps(request: IdempotentRequest, response: IdempotentResponse) -> bool:
+        """Whether ``response`` is still to be stored for retries."""
+        return bool(request.key) and response.status < 500 and not response.stored
+
+    def _remember(
+        self,
+        session: scoped_session,
+        request: IdempotentRequest,
+        response: IdempotentResponse,
+    ) -> None:
+        # A worker running the same request concurrently may have stored its
+        # response first; either one is fine to replay.
+        IdempotencyKeyRepository(session).save(self._record(request, response))
+
+    def _record(
+        self, request: IdempotentRequest, response: IdempotentResponse
+    ) -> IdempotencyKey:
+        record = IdempotencyKey()
+        record.key = request.response_key
+        record.fingerprint = request.fingerprint
+        record.status = response.status
+        record.body = json.dumps(response.body)
+        record.expires_at = datetime.now(tz=pytz.utc) + timedelta(seconds=self.ttl)
+        return record
+
+    def _shared(
+        self, request: IdempotentRequest, flight: _Flight, saved_work: Sequence[str]
+    ) -> IdempotentResponse:
+        if flight.error is not None:
+            raise flight.error
+        self._count_saved(request.endpoint, "coalesced", saved_work)
+        return replace(cast(IdempotentResponse, flight.response), replayed=True)
+
+    @staticmethod
+    def _count_saved(endpoint: str, outcome: str, saved_work: Sequence[str]) -> None:
+        IDEMPOTENT_REQUESTS.labels(endpoint, outcome).inc()
+        for work in saved_work:
+            IDEMPOTENT_WORK_SAVED.labels(endpoint, work).inc()
+
+
+idempotency_store = IdempotencyStore()
@@ -0,0 +1,67 @@
+import logging
+from typing import Any, Type, cast
+
+from flask import Flask
+from flask import Response as FlaskResponse
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.sansio.response import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speed-up
+    orjson = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """``app.json`` backed by orjson, writing response bodies as bytes.
+
+    Datetimes still go through Flask's ``default`` so their format does not
+    change. Keys are not sorted and non-ASCII text is written as UTF-8
+    rather than escaped; calls with stdlib-only arguments (``indent``,
+    ``cls``, ...), non-compact responses and values orjson rejects (e.g.
+    integers over 64 bits) fall back to the stdlib provider.
+    """
+
+    options = 0
+
+    def __init__(self, app: Flask):
+        super().__init__(app)
+        self.options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def _dump_bytes(self, obj: Any) -> bytes:
+        return orjson.dumps(obj, default=self.default, option=self.options)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        try:
+            return self._dump_bytes(obj).decode()
+        except orjson.JSONEncodeError:
+            return super().dumps(obj)
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        try:
+            body = self._dump_bytes(obj)
+        except orjson.JSONEncodeError:
+            return super().response(*args, **kwargs)
+        response_class = cast(Type[FlaskResponse], self._app.response_class)
+        return response_class(body + b"\n", mimetype=self.mimetype)
+
+
+def init_json_provider(app: Flask) -> None:
+    if app.config["JSON_PROVIDER"] != "orjson":
+        return
+    if orjson is None:
+        logger.warning("JSON_PROVIDER=orjson but orjson is not installed")
+        return
+    app.json = OrjsonProvider(app)
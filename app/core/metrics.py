@@ -0,0 +1,116 @@
+"""Prometheus metrics shared by the API, the outbox relay and the email worker.
+
+When ``PROMETHEUS_MULTIPROC_DIR`` is set before this module is imported,
+each process writes its samples to files in that directory and gunicorn's
+master serves them, aggregated across its workers, on METRICS_PORT.
+Otherwise samples live in the process and are served from the default
+registry by the email worker and the relay.
+"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Most API calls finish in milliseconds; bcrypt-bound ones take ~0.1-0.5s.
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time to handle a request, by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "Time spent executing a SQL statement, by statement type",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_POOL_CHECKOUT_LATENCY = Histogram(
+    "db_pool_checkout_duration_seconds",
+    "Time to get a connection from the pool, including any wait for a free one",
+    ["pool"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up after DB_POOL_TIMEOUT",
+    ["pool"],
+)
+# Summed over the live processes, so they read as the whole service's use.
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_connections_checked_out",
+    "Connections currently checked out of the pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Connections open beyond DB_POOL_SIZE",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_LATENCY = Histogram(
+    "password_hash_duration_seconds",
+    "Time to hash or verify passwords, including any wait for the pool",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+PUBLISH_LATENCY = Histogram(
+    "amqp_publish_duration_seconds",
+    "Time to publish and confirm one batch of messages",
+    buckets=LATENCY_BUCKETS,
+)
+MESSAGES_PUBLISHED = Counter(
+    "amqp_messages_published_total", "Messages published to the broker"
+)
+EMAIL_SEND_LATENCY = Histogram(
+    "email_send_duration_seconds",
+    "Time to hand one email to Mailtrap",
+    buckets=LATENCY_BUCKETS,
+)
+EMAILS_PROCESSED = Counter(
+    "email_worker_messages_total",
+    "Email deliveries settled by the worker, by outcome",
+    ["outcome"],
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "In-process cache lookups, by result: hit or miss",
+    ["cache", "result"],
+)
+CACHE_EVICTIONS = Counter(
+    "cache_evictions_total",
+    "Entries dropped from an in-process cache, by reason: capacity or expired",
+    ["cache", "reason"],
+)
+RATE_LIMIT_CHECKS = Counter(
+    "rate_limit_checks_total", "Attempts checked by a rate limiter", ["limiter"]
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections_total",
+    "Attempts a rate limiter rejected, by the rule that rejected them",
+    ["limiter", "rule"],
+)
+IDEMPOTENT_REQUESTS = Counter(
+    "idempotent_requests_total",
+    "Requests through an idempotency store, by outcome: executed, replayed "
+    "(an earlier response), coalesced (a concurrent one), mismatched, in_flight",
+    ["endpoint", "outcome"],
+)
+IDEMPOTENT_WORK_SAVED = Counter(
+    "idempotent_work_saved_total",
+    "Work not redone because a request was replayed or coalesced",
+    ["endpoint", "work"],
+)
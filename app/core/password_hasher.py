@@ -0,0 +1,145 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import List, Optional, Sequence, Tuple
+
+from flask import Flask
+from passlib.context import CryptContext
+from werkzeug.security import check_password_hash
+
+from app.core.metrics import PASSWORD_HASH_LATENCY
+
+SUPPORTED_SCHEMES = ("bcrypt", "pbkdf2_sha256")
+# The least cost each scheme is accepted with: bcrypt's own lower bound, and
+# RFC 8018's minimum iteration count for PBKDF2.
+MIN_ROUNDS = {"bcrypt": 4, "pbkdf2_sha256": 1000}
+# Prefixes of hashes written by werkzeug's generate_password_hash.
+WERKZEUG_PREFIXES = ("scrypt:", "pbkdf2:")
+
+
+@lru_cache(maxsize=None)
+def _crypt_context(scheme: str, rounds: Optional[int]) -> CryptContext:
+    # Every supported scheme stays verifiable; anything that is not the
+    # configured scheme and cost is reported as needing a rehash. Without
+    # ``rounds``, passlib's default cost for the scheme applies.
+    schemes = [scheme] + [s for s in SUPPORTED_SCHEMES if s != scheme]
+    settings = {} if rounds is None else {f"{scheme}__rounds": rounds}
+    return CryptContext(schemes=schemes, default=scheme, deprecated="auto", **settings)
+
+
+def _hash(scheme: str, rounds: Optional[int], password: str) -> str:
+    return _crypt_context(scheme, rounds).hash(password)
+
+
+def _verify_and_update(
+    scheme: str, rounds: Optional[int], password: str, password_hash: str
+) -> Tuple[bool, Optional[str]]:
+    if password_hash.startswith(WERKZEUG_PREFIXES):
+        if not check_password_hash(password_hash, password):
+            return False, None
+        return True, _hash(scheme, rounds, password)
+    try:
+        return _crypt_context(scheme, rounds).verify_and_update(password, password_hash)
+    except ValueError:
+        # Not a hash any supported scheme recognises.
+        return False, None
+
+
+class PasswordHasher:
+    """Hashes and verifies passwords with the configured scheme and cost.
+
+    With ``PASSWORD_HASH_POOL_SIZE`` set, the key derivation runs in a
+    process pool so it holds neither the GIL nor a request thread's CPU.
+    """
+
+    def __init__(
+        self, scheme: str = "bcrypt", rounds: Optional[int] = None, pool_size: int = 0
+    ):
+        self.configure(scheme, rounds, pool_size)
+        self._lock = threading.Lock()
+        self._executor: Optional[Executor] = None
+        self._executor_pid: Optional[int] = None
+
+    def configure(self, scheme: str, rounds: Optional[int], pool_size: int) -> None:
+        if scheme not in SUPPORTED_SCHEMES:
+            raise ValueError(f"Unsupported password hash scheme: {scheme}")
+        if rounds is not None and rounds < MIN_ROUNDS[scheme]:
+            raise ValueError(
+                f"{scheme} needs at least {MIN_ROUNDS[scheme]} rounds, got {rounds}"
+            )
+        self.scheme = scheme
+        self.rounds = rounds
+        self.pool_size = pool_size
+
+    def init_app(self, app: Flask) -> None:
+        self.configure(
+            app.config["PASSWORD_HASH_SCHEME"],
+            app.config["PASSWORD_HASH_ROUNDS"],
+            app.config["PASSWORD_HASH_POOL_SIZE"],
+        )
+        app.extensions["password_hasher"] = self
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.pool_size <= 0:
+            return None
+        if self._executor is None or self._executor_pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._executor_pid != os.getpid():
+                    # spawn, not fork: request threads may hold locks at fork time.
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.pool_size,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                    self._executor_pid = os.getpid()
+        return self._executor
+
+    @PASSWORD_HASH_LATENCY.labels("hash").time()
+    def hash(self, password: str) -> str:
+        executor = self._get_executor()
+        if executor is None:
+            return _hash(self.scheme, self.rounds, password)
+        return executor.submit(_hash, self.scheme, self.rounds, password).result()
+
+    @PASSWORD_HASH_LATENCY.labels("hash_many").time()
+    def hash_many(self, passwords: Sequence[str]) -> List[str]:
+        """Hash a batch, spread over the whole pool when there is one."""
+        executor = self._get_executor()
+        hash_one = partial(_hash, self.scheme, self.rounds)
+        if executor is None:
+            return [hash_one(password) for password in passwords]
+        chunksize = max(1, len(passwords) // (self.pool_size * 4))
+        return list(executor.map(hash_one, passwords, chunksize=chunksize))
+
+    @PASSWORD_HASH_LATENCY.labels("verify").time()
+    def verify_and_update(
+        self, password: str, password_hash: str
+    ) -> Tuple[bool, Optional[str]]:
+        """Return whether the password matches and, when the stored hash uses
+        an outdated scheme or cost, a replacement hash to persist."""
+        executor = self._get_executor()
+        if executor is None:
+            return _verify_and_update(self.scheme, self.rounds, password, password_hash)
+        return executor.submit(
+            _verify_and_update, self.scheme, self.rounds, password, password_hash
+        ).result()
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        return self.verify_and_update(password, password_hash)[0]
+
+    def is_known_hash(self, password_hash: str) -> bool:
+        """Whether ``password_hash`` is in a format ``verify`` can check:
+        one of the SUPPORTED_SCHEMES or werkzeug's ``method$salt$hash``."""
+        if password_hash.startswith(WERKZEUG_PREFIXES):
+            return password_hash.count("$") == 2
+        context = _crypt_context(self.scheme, self.rounds)
+        return context.identify(password_hash) is not None
+
+    def shutdown(self) -> None:
+        if self._executor is not None and self._executor_pid == os.getpid():
+            self._executor.shutdown()
+        self._executor = None
+
+
+password_hasher = PasswordHasher()
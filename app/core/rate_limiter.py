@@ -0,0 +1,149 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Protocol, Tuple
+
+from flask import Flask
+
+from app.core.metrics import RATE_LIMIT_CHECKS, RATE_LIMIT_REJECTIONS
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    limit: int
+    window: float
+
+    @classmethod
+    def parse(cls, spec: str) -> "RateLimit":
+        """Parse ``"<attempts>/<seconds>"``, e.g. ``"10/300"``."""
+        limit, window = spec.split("/")
+        return cls(limit=int(limit), window=float(window))
+
+
+class RateLimitBackend(Protocol):
+    def hit(self, key: str, rate: RateLimit, now: float) -> Tuple[bool, float]:
+        """Count an attempt against ``key`` unless it is over ``rate``.
+
+        Returns whether the attempt is allowed and, if not, how many seconds
+        until it would be. A shared implementation (e.g. Redis) must perform
+        the check and the increment atomically.
+        """
+
+
+class InMemoryRateLimitBackend:
+    """Sliding-window counter per key, bounded to ``max_keys`` entries.
+
+    Each key keeps the counts of the current and previous fixed windows and
+    weights the previous one by how much of it still overlaps the sliding
+    window, which is O(1) per key instead of a log of timestamps.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._windows: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, rate: RateLimit, now: float) -> Tuple[bool, float]:
+        window_start = now - now % rate.window
+        with self._lock:
+            entry = self._windows.get(key)
+            if entry is None or entry[0] < window_start - rate.window:
+                entry = [window_start, 0.0, 0.0]
+            elif entry[0] < window_start:
+                entry = [window_start, 0.0, entry[1]]
+            _, current, previous = entry
+
+            elapsed = now - window_start
+            weight = 1 - elapsed / rate.window
+            if previous * weight + current >= rate.limit:
+                self._store(key, entry)
+                return False, self._retry_after(rate, current, previous, elapsed)
+
+            entry[1] += 1
+            self._store(key, entry)
+            return True, 0.0
+
+    def _store(self, key: str, entry: List[float]) -> None:
+        self._windows[key] = entry
+        self._windows.move_to_end(key)
+        while len(self._windows) > self.max_keys:
+            self._windows.popitem(last=False)
+
+    @staticmethod
+    def _retry_after(
+        rate: RateLimit, current: float, previous: float, elapsed: float
+    ) -> float:
+        if current >= rate.limit or not previous:
+            return rate.window - elapsed
+        # Time until the previous window's weight has decayed enough.
+        overlap_allowed = (rate.limit - current) / previous
+        return max(rate.window * (1 - overlap_allowed) - elapsed, 0.0) + 0.001
+
+
+class RateLimiter:
+    """Evaluates named rate limits and counts evaluated/rejected attempts,
+    both in ``stats()`` and as the rate_limit_* Prometheus counters.
+
+    ``rule_settings`` maps each rule name to the config key holding its
+    ``"<attempts>/<seconds>"`` limit.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rule_settings: Dict[str, str],
+        backend: Optional[RateLimitBackend] = None,
+    ):
+        self.name = name
+        self.rule_settings = rule_settings
+        self.backend: RateLimitBackend = backend or InMemoryRateLimitBackend()
+        self.rules: Dict[str, RateLimit] = {}
+        self.evaluated_total = 0
+        self.rejected_total: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app: Flask) -> None:
+        self.rules = {}
+        if app.config["RATE_LIMIT_ENABLED"]:
+            self.rules = {
+                rule: RateLimit.parse(app.config[setting])
+                for rule, setting in self.rule_settings.items()
+            }
+        app.extensions[f"{self.name}_rate_limiter"] = self
+
+    def check(self, keys: Dict[str, str]) -> Optional[int]:
+        """Count an attempt for each ``rule -> key`` pair, in order.
+
+        Returns ``None`` when allowed, otherwise the ``Retry-After`` seconds
+        from the first rule that rejected; later rules are not counted.
+        """
+        if not self.rules:
+            return None
+        with self._lock:
+            self.evaluated_total += 1
+        RATE_LIMIT_CHECKS.labels(self.name).inc()
+        now = time.time()
+        for rule, key in keys.items():
+            allowed, retry_after = self.backend.hit(
+                f"{rule}:{key}", self.rules[rule], now
+            )
+            if not allowed:
+                with self._lock:
+                    self.rejected_total[rule] = self.rejected_total.get(rule, 0) + 1
+                RATE_LIMIT_REJECTIONS.labels(self.name, rule).inc()
+                return max(1, math.ceil(retry_after))
+        return None
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "evaluated_total": self.evaluated_total,
+                "rejected_total": dict(self.rejected_total),
+            }
+
+
+login_rate_limiter = RateLimiter(
+    "login", {"ip": "LOGIN_RATE_LIMIT_PER_IP", "email": "LOGIN_RATE_LIMIT_PER_EMAIL"}
+)
@@ -0,0 +1,261 @@
+import hashlib
+import heapq
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+)
+
+from flask import Flask
+from sqlalchemy.orm.scoping import scoped_session
+
+from app.db.database import db
+from app.v1.repositories.revoked_token_repository import RevokedTokenRepository
+
+logger = logging.getLogger(__name__)
+
+
+class DenylistStore(Protocol):
+    def add(self, session: scoped_session, jti: str, expires_at: float) -> bool: ...
+
+    def contains(self, session: scoped_session, jti: str) -> bool: ...
+
+    def live_jtis(self, session: scoped_session) -> Iterable[str]: ...
+
+
+class DatabaseDenylistStore:
+    """Revoked ``jti`` values in the revoked_tokens table, seen by every
+    worker; expired rows are deleted by purge_expired_rows.py."""
+
+    def add(self, session: scoped_session, jti: str, expires_at: float) -> bool:
+        return RevokedTokenRepository(session).revoke(jti, expires_at)
+
+    def contains(self, session: scoped_session, jti: str) -> bool:
+        return RevokedTokenRepository(session).is_revoked(jti)
+
+    def live_jtis(self, session: scoped_session) -> Iterable[str]:
+        return RevokedTokenRepository(session).live_jtis()
+
+
+class InMemoryDenylistStore:
+    """Revoked ``jti`` values kept only until the token would expire anyway.
+
+    Only this process sees them, so it suits a single worker (and tests);
+    the ``session`` arguments are ignored. A min-heap ordered by expiry lets
+    every call drop expired entries in O(log n) each, so memory is bounded
+    by the number of live revoked tokens.
+    """
+
+    def __init__(self) -> None:
+        self._expiry: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float) -> None:
+        evicted = 0
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, jti = heapq.heappop(self._heap)
+            if self._expiry.get(jti) == expires_at:
+                del self._expiry[jti]
+            evicted += 1
+        if evicted > len(self._heap):
+            # Neither dicts nor lists give memory back as they shrink; copy
+            # them once most entries are gone so a burst of revocations
+            # does not pin its peak footprint.
+            self._expiry = dict(self._expiry)
+            self._heap = list(self._heap)
+
+    def add(self, _session: Any, jti: str, expires_at: float) -> bool:
+        with self._lock:
+            self._evict(time.time())
+            if jti in self._expiry:
+                return False
+            self._expiry[jti] = expires_at
+            heapq.heappush(self._heap, (expires_at, jti))
+            return True
+
+    def contains(self, _session: Any, jti: str) -> bool:
+        with self._lock:
+            expires_at = self._expiry.get(jti)
+            if expires_at is None:
+                return False
+            if expires_at <= time.time():
+                self._evict(time.time())
+                return False
+            return True
+
+    def live_jtis(self, _session: Any) -> Iterable[str]:
+        with self._lock:
+            self._evict(time.time())
+            return list(self._expiry)
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+@dataclass
+class _BloomFront:
+    """The filter in use and the state of its background refresh."""
+
+    bloom: Optional[BloomFilter] = None
+    synced_at: float = 0.0
+    refreshing: bool = False
+    # Revoked here while a refresh is loading, for the filter it builds.
+    pending: List[str] = field(default_factory=list)
+
+
+class TokenDenylist:
+    """Revocation check for the ``token_in_blocklist_loader`` callback.
+
+    JWT_DENYLIST_STORE picks the store: ``database`` (the default) shares
+    revocations between workers, ``memory`` keeps them in this process.
+    ``use_bloom`` (JWT_DENYLIST_BLOOM, on by default) puts a local Bloom
+    filter in front of the store so the common case (token not revoked)
+    needs no query. The filter is loaded by the first check in the process;
+    after that it is rebuilt from the store in a background thread every
+    ``sync_interval`` seconds while requests keep using the previous one.
+    That is how revocations made by other workers reach this one, so they
+    can take that long to be enforced here.
+    """
+
+    def __init__(self, store: Optional[DenylistStore] = None):
+        self.store: DenylistStore = (
+            store if store is not None else DatabaseDenylistStore()
+        )
+        self.use_bloom = False
+        self.bloom_capacity = 100_000
+        self.sync_interval = 5.0
+        self._app: Optional[Flask] = None
+        self._front = _BloomFront()
+        self._lock = threading.Lock()
+
+    def init_app(self, app: Flask) -> None:
+        self.store = DENYLIST_STORES[app.config["JWT_DENYLIST_STORE"]]()
+        self.use_bloom = app.config["JWT_DENYLIST_BLOOM"]
+        self.bloom_capacity = app.config["JWT_DENYLIST_BLOOM_CAPACITY"]
+        self.sync_interval = app.config["JWT_DENYLIST_SYNC_INTERVAL"]
+        self._app = app
+        self._front = _BloomFront()
+        app.extensions["token_denylist"] = self
+
+    def _load_bloom(self, session: Any) -> BloomFilter:
+        bloom = BloomFilter(self.bloom_capacity)
+        for jti in self.store.live_jtis(session):
+            bloom.add(jti)
+        return bloom
+
+    def _current_bloom(self, session: scoped_session) -> BloomFilter:
+        front = self._front
+        with self._lock:
+            if front.bloom is None:
+                front.bloom = self._load_bloom(session)
+                front.synced_at = time.monotonic()
+                return front.bloom
+            bloom = front.bloom
+            start = (
+                not front.refreshing
+                and time.monotonic() - front.synced_at >= self.sync_interval
+            )
+            front.refreshing = front.refreshing or start
+        if start:
+            threading.Thread(
+                target=self._refresh,
+                args=(front,),
+                name="token-denylist-refresh",
+                daemon=True,
+            ).start()
+        return bloom
+
+    @contextmanager
+    def _refresh_session(self) -> Iterator[Optional[scoped_session]]:
+        """A session for the refresh thread; the in-memory store needs none."""
+        if self._app is None:
+            yield None
+            return
+        with self._app.app_context():
+            try:
+                yield db.session
+            finally:
+                db.session.remove()
+
+    def _refresh(self, front: _BloomFront) -> None:
+        synced_at = time.monotonic()
+        bloom = None
+        try:
+            with self._refresh_session() as session:
+                bloom = self._load_bloom(session)
+        except Exception:  # pylint: disable=broad-exception-caught
+            # Keep the previous filter; retried after sync_interval.
+            logger.exception("Error refreshing the token denylist")
+        with self._lock:
+            if bloom is not None:
+                # Revocations made here while it loaded may not be in it.
+                for jti in front.pending:
+                    bloom.add(jti)
+                front.bloom = bloom
+            front.synced_at = synced_at
+            front.refreshing = False
+            front.pending = []
+
+    def revoke(self, session: scoped_session, jti: str, expires_at: float) -> bool:
+        """Revoke ``jti``; False when it already was, by this or any other
+        worker sharing the store."""
+        revoked = self.store.add(session, jti, expires_at)
+        if self.use_bloom:
+            bloom = self._current_bloom(session)
+            with self._lock:
+                # Under the lock, so a refresh swapping filters cannot lose it.
+                (self._front.bloom or bloom).add(jti)
+                if self._front.refreshing:
+                    self._front.pending.append(jti)
+        return revoked
+
+    def is_revoked(self, session: scoped_session, jti: Optional[str]) -> bool:
+        if not jti:
+            return False
+        if self.use_bloom and jti not in self._current_bloom(session):
+            return False
+        return self.store.contains(session, jti)
+
+
+DENYLIST_STORES: Dict[str, Callable[[], DenylistStore]] = {
+    "database": DatabaseDenylistStore,
+    "memory": InMemoryDenylistStore,
+}
+
+token_denylist = TokenDenylist()
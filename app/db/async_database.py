@@ -0,0 +1,59 @@
+from typing import Any, Callable, Dict, Mapping, TypeVar, cast
+
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm.scoping import scoped_session
+
+from app.db.database import engine_options
+
+T = TypeVar("T")
+
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def async_database_url(database_url: str) -> URL:
+    """``database_url`` with its driver swapped for the asyncio one."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+def async_engine_options(
+    config: Mapping[str, Any], database_url: str
+) -> Dict[str, Any]:
+    options = engine_options(config, database_url)
+    # Async engines need an asyncio-aware pool, which they pick by default;
+    # the pool size, timeout and recycle settings still apply to it.
+    options.pop("poolclass", None)
+    return options
+
+
+class AsyncDatabase:
+    """The async engine behind the ASGI app.
+
+    Repositories and services are written against the synchronous Session
+    API; ``run`` hands them a session whose IO awaits the async driver, so
+    the ASGI views reuse them unchanged instead of duplicating every query.
+    """
+
+    def __init__(self, config: Mapping[str, Any], database_url: str):
+        url = async_database_url(database_url).render_as_string(hide_password=False)
+        self.engine: AsyncEngine = create_async_engine(
+            url, **async_engine_options(config, url)
+        )
+        self.sessionmaker = async_sessionmaker(self.engine)
+
+    async def run(self, work: Callable[[scoped_session], T]) -> T:
+        """Run ``work`` with a fresh session, closed (and rolled back if
+        ``work`` did not commit) when it returns."""
+        async with self.sessionmaker() as session:
+            # The services only use the Session API that scoped_session
+            # proxies, so a plain session stands in for one.
+            return await session.run_sync(
+                lambda sync_session: work(cast(scoped_session, sync_session))
+            )
+
+    async def dispose(self) -> None:
+        await self.engine.dispose()
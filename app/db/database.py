@@ -1,9 +1,175 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Mapping
+
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import ConnectionPoolEntry, PoolProxiedConnection, QueuePool
+
+from app.core.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_LATENCY,
+    DB_POOL_OVERFLOW,
+    DB_POOL_TIMEOUTS,
+)
+from app.db.replicas import RoutingSession, replica_bind_key, replica_router
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+
+
+@dataclass
+class PoolStats:
+    checkouts_total: int = 0
+    timeouts_total: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, wait: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts_total += 1
+            else:
+                self.checkouts_total += 1
+            self.wait_seconds_total += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts_total": self.checkouts_total,
+                "timeouts_total": self.timeouts_total,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout took.
+
+    The time covers waiting for a free slot, opening a new connection when
+    the pool is below its limit and the pre-ping, i.e. everything a request
+    spends before it can send its first statement. Besides ``stats`` it
+    feeds the db_pool_* Prometheus metrics, labelled with the pool's
+    logging name (the bind it serves).
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+        self.label = self._orig_logging_name or "primary"
 
-db = SQLAlchemy()
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.record(time.perf_counter() - started, timed_out=True)
+            DB_POOL_TIMEOUTS.labels(self.label).inc()
+            raise
+        wait = time.perf_counter() - started
+        self.stats.record(wait)
+        DB_POOL_CHECKOUT_LATENCY.labels(self.label).observe(wait)
+        self._observe_usage()
+        return connection
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        super()._do_return_conn(record)
+        self._observe_usage()
+
+    def _observe_usage(self) -> None:
+        DB_POOL_CHECKED_OUT.labels(self.label).set(self.checkedout())
+        DB_POOL_OVERFLOW.labels(self.label).set(max(self.overflow(), 0))
+
+
+def engine_options(
+    config: Mapping[str, Any], database_url: str, pool_name: str = "primary"
+) -> Dict[str, Any]:
+    """SQLAlchemy ``create_engine`` options from the ``DB_*`` settings;
+    ``pool_name`` labels the pool's metrics."""
+    url = make_url(database_url)
+    options: Dict[str, Any] = {"pool_pre_ping": config["DB_POOL_PRE_PING"]}
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory SQLite lives in one shared connection; nothing to pool.
+        return options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name=pool_name,
+        pool_size=config["DB_POOL_SIZE"],
+        max_overflow=config["DB_MAX_OVERFLOW"],
+        pool_timeout=config["DB_POOL_TIMEOUT"],
+        pool_recycle=config["DB_POOL_RECYCLE"],
+        # Reuse the most recently returned connection, so under light load
+        # the rest of the pool stays idle instead of every connection being
+        # cycled through. The pool never closes idle connections itself
+        # (pool_recycle is only checked at checkout): a server-side idle
+        # timeout may drop them, and pool_pre_ping replaces those when they
+        # are next checked out.
+        pool_use_lifo=True,
+    )
+    if url.get_backend_name() != "postgresql":
+        return options
+
+    connect_args: Dict[str, Any] = {}
+    if config["DB_PGBOUNCER"]:
+        # Transaction pooling hands each transaction a different server
+        # connection, so statements prepared on one are missing on the next,
+        # and PgBouncer rejects startup options: set statement_timeout on
+        # the database role instead. psycopg2 never prepares server-side.
+        if url.get_driver_name() == "psycopg":
+            connect_args["prepare_threshold"] = None
+        elif url.get_driver_name() == "asyncpg":
+            connect_args["statement_cache_size"] = 0
+    elif config["DB_STATEMENT_TIMEOUT_MS"] and url.get_driver_name() == "asyncpg":
+        # asyncpg takes server settings instead of a libpq options string.
+        connect_args["server_settings"] = {
+            "statement_timeout": str(config["DB_STATEMENT_TIMEOUT_MS"])
+        }
+    elif config["DB_STATEMENT_TIMEOUT_MS"]:
+        connect_args["options"] = (
+            f"-c statement_timeout={config['DB_STATEMENT_TIMEOUT_MS']}"
+        )
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
+def pool_stats(engine: Engine) -> Dict[str, Any]:
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return {}
+    return dict(
+        pool.stats.as_dict(),
+        size=pool.size(),
+        checked_out=pool.checkedout(),
+        overflow=max(pool.overflow(), 0),
+    )
 
 
 def init_db(app: Flask) -> SQLAlchemy:
+    app.config.setdefault(
+        "SQLALCHEMY_ENGINE_OPTIONS",
+        engine_options(app.config, app.config["SQLALCHEMY_DATABASE_URI"]),
+    )
+    binds = app.config.setdefault("SQLALCHEMY_BINDS", {})
+    for index, url in enumerate(app.config["DATABASE_REPLICA_URLS"]):
+        key = replica_bind_key(index)
+        binds[key] = {"url": url, **engine_options(app.config, url, key)}
     db.init_app(app)
+    replica_router.init_app(app)
     return db
+
+
+def dispose_engines(app: Flask) -> None:
+    """Drop pooled connections inherited from a parent process.
+
+    ``close=False`` leaves the sockets to the parent that opened them; the
+    child simply starts with an empty pool.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
@@ -0,0 +1,160 @@
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+import sqlalchemy as sa
+from flask import Flask
+from flask_sqlalchemy.session import Session
+from sqlalchemy import exc
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.orm.scoping import scoped_session
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+REPLICA_KEY = "replica"
+WROTE_KEY = "wrote"
+
+
+def replica_bind_key(index: int) -> str:
+    return f"replica_{index}"
+
+
+class ReplicaRouter:
+    """Round-robin over the replica binds, skipping replicas that failed.
+
+    A replica that raises a connection error is taken out of rotation for
+    ``health_interval`` seconds; after that it must answer ``SELECT 1``
+    before it receives reads again.
+    """
+
+    def __init__(self) -> None:
+        self.bind_keys: List[str] = []
+        self.health_interval = 10.0
+        self._down_until: Dict[str, float] = {}
+        self._cycle: Iterator[str] = iter(())
+        self._lock = threading.Lock()
+
+    def init_app(self, app: Flask) -> None:
+        self.bind_keys = [
+            replica_bind_key(i) for i in range(len(app.config["DATABASE_REPLICA_URLS"]))
+        ]
+        self.health_interval = app.config["DB_REPLICA_HEALTH_INTERVAL"]
+        self._down_until = {}
+        self._cycle = itertools.cycle(self.bind_keys)
+        app.extensions["replica_router"] = self
+
+    def mark_down(self, bind_key: str) -> None:
+        logger.warning("Replica %s failed; reading from the primary", bind_key)
+        with self._lock:
+            self._down_until[bind_key] = time.monotonic() + self.health_interval
+
+    def _healthy(self, bind_key: str, engines: Mapping[Optional[str], Engine]) -> bool:
+        down_until = self._down_until.get(bind_key)
+        if down_until is None:
+            return True
+        if time.monotonic() < down_until:
+            return False
+        try:
+            with engines[bind_key].connect() as connection:
+                connection.execute(sa.text("SELECT 1"))
+        except exc.DBAPIError:
+            self.mark_down(bind_key)
+            return False
+        with self._lock:
+            self._down_until.pop(bind_key, None)
+        return True
+
+    def pick(self, engines: Mapping[Optional[str], Engine]) -> Optional[str]:
+        for _ in self.bind_keys:
+            with self._lock:
+                bind_key = next(self._cycle)
+            if self._healthy(bind_key, engines):
+                return bind_key
+        return None
+
+
+replica_router = ReplicaRouter()
+
+
+class RoutingSession(Session):
+    """Sends SELECTs made inside ``use_replica`` to a replica bind.
+
+    Everything else goes to the primary, and once the session has written
+    anything its reads stay on the primary too, so a request always sees
+    its own writes. ``db.session`` is scoped to the app context, which
+    makes that stickiness last exactly one request.
+    """
+
+    def get_bind(
+        self,
+        mapper: Any = None,
+        clause: Any = None,
+        bind: Optional[Union[Engine, Connection]] = None,
+        **kwargs: Any,
+    ) -> Union[Engine, Connection]:
+        if bind is None:
+            is_select = isinstance(clause, sa.Select)
+            if self._flushing or (clause is not None and not is_select):
+                self.info[WROTE_KEY] = True
+            elif (
+                is_select
+                and self.info.get(REPLICA_KEY)
+                and not self.info.get(WROTE_KEY)
+            ):
+                return self._db.engines[self.info[REPLICA_KEY]]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def pick_replica(self) -> Optional[str]:
+        return replica_router.pick(self._db.engines)
+
+    @contextmanager
+    def use_replica(self, bind_key: str) -> Iterator[None]:
+        self.info[REPLICA_KEY] = bind_key
+        try:
+            yield
+        finally:
+            self.info.pop(REPLICA_KEY, None)
+
+
+def read_from_replica(
+    session: Union[scoped_session, OrmSession], read: Callable[[], T]
+) -> T:
+    """Run ``read`` against a replica when one is configured and healthy.
+
+    Sessions other than ``RoutingSession`` (e.g. in scripts and tests) and
+    sessions that already wrote run ``read`` on the primary. A connection
+    error on the replica takes it out of rotation and retries on the primary.
+    """
+    target = session() if isinstance(session, scoped_session) else session
+    if not isinstance(target, RoutingSession) or target.info.get(WROTE_KEY):
+        return read()
+    bind_key = target.pick_replica()
+    if bind_key is None:
+        return read()
+    try:
+        with target.use_replica(bind_key):
+            return read()
+    except exc.DBAPIError as e:
+        if not e.connection_invalidated and not isinstance(e, exc.OperationalError):
+            raise
+        replica_router.mark_down(bind_key)
+        # Nothing was written yet, so dropping the failed connection's
+        # transaction loses no work.
+        target.rollback()
+        return read()
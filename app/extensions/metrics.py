@@ -0,0 +1,64 @@
+import time
+from typing import Any
+
+from flask import Flask, Response, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.metrics import DB_QUERY_LATENCY, REQUEST_LATENCY
+from app.db.database import db
+
+_QUERY_STARTED_KEY = "metrics_query_started"
+# Resolved once; labels() costs a lock and a dict lookup on every query.
+_QUERY_HISTOGRAMS = {
+    operation: DB_QUERY_LATENCY.labels(operation)
+    for operation in ("SELECT", "INSERT", "UPDATE", "DELETE", "OTHER")
+}
+
+
+def _start_request_timer() -> None:
+    g.metrics_started = time.perf_counter()
+
+
+def _observe_request(response: Response) -> Response:
+    started = g.pop("metrics_started", None)
+    if started is not None:
+        # The route template, not the path, keeps label cardinality bounded.
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        REQUEST_LATENCY.labels(
+            request.method, route, str(response.status_code)
+        ).observe(time.perf_counter() - started)
+    return response
+
+
+def _before_cursor_execute(conn: Any, *_: Any) -> None:
+    conn.info[_QUERY_STARTED_KEY] = time.perf_counter()
+
+
+def _after_cursor_execute(conn: Any, _cursor: Any, statement: str, *_: Any) -> None:
+    started = conn.info.pop(_QUERY_STARTED_KEY, None)
+    if started is None:
+        return
+    operation = statement.lstrip()[:6].upper()
+    histogram = _QUERY_HISTOGRAMS.get(operation, _QUERY_HISTOGRAMS["OTHER"])
+    histogram.observe(time.perf_counter() - started)
+
+
+def instrument_engine(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def init_metrics(app: Flask) -> None:
+    """Record request and query latency. The samples are not served by the
+    app: gunicorn's master exposes them on METRICS_PORT (gunicorn.conf.py),
+    away from the public port the ingress routes to."""
+    if not app.config["METRICS_ENABLED"]:
+        return
+    app.before_request(_start_request_timer)
+    app.after_request(_observe_request)
+    with app.app_context():
+        # The primary and every replica bind.
+        for engine in db.engines.values():
+            instrument_engine(engine)
@@ -1,14 +1,71 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
 import sentry_sdk
 from flask import Flask
 from sentry_sdk.integrations.flask import FlaskIntegration
 
 
+def parse_route_rates(value: str) -> List[Tuple[str, float]]:
+    """``"/v1/auth=0.1,/v1/users=0.05"`` -> [(prefix, rate)], longest first."""
+    rates = []
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        prefix, _, rate = item.partition("=")
+        rates.append((prefix.strip(), float(rate)))
+    return sorted(rates, key=lambda pair: len(pair[0]), reverse=True)
+
+
+class TraceSampler:
+    """``traces_sampler`` deciding per request whether to start a trace.
+
+    In order: paths under an ``ignored`` prefix are never traced; a request
+    continuing an upstream trace (``sentry-trace``/``traceparent``) follows
+    the caller's decision; otherwise the longest matching route prefix
+    picks the rate, falling back to ``default_rate``.
+
+    Errors are not subject to this: they are always reported, and carry the
+    trace id whether or not the trace itself was kept.
+    """
+
+    def __init__(
+        self,
+        default_rate: float,
+        route_rates: Sequence[Tuple[str, float]] = (),
+        ignored: Sequence[str] = (),
+    ):
+        self.default_rate = default_rate
+        self.route_rates = list(route_rates)
+        self.ignored = tuple(ignored)
+
+    def __call__(self, sampling_context: Dict[str, Any]) -> float:
+        environ = sampling_context.get("wsgi_environ") or {}
+        path = environ.get("PATH_INFO", "")
+        if self.ignored and path.startswith(self.ignored):
+            return 0.0
+        parent_sampled: Optional[bool] = sampling_context.get("parent_sampled")
+        if parent_sampled is not None:
+            return 1.0 if parent_sampled else 0.0
+        for prefix, rate in self.route_rates:
+            if path.startswith(prefix):
+                return rate
+        return self.default_rate
+
+
 def init_sentry(app: Flask) -> None:
     sentry_dsn = app.config.get("SENTRY_DSN")
     if sentry_dsn:
+        options: Dict[str, Any] = {}
+        if app.config["SENTRY_TRACING_ENABLED"]:
+            options["traces_sampler"] = TraceSampler(
+                app.config["SENTRY_TRACES_SAMPLE_RATE"],
+                parse_route_rates(app.config["SENTRY_TRACES_ROUTE_RATES"]),
+                app.config["SENTRY_TRACES_IGNORED_PATHS"],
+            )
         sentry_sdk.init(
             dsn=sentry_dsn,
             integrations=[FlaskIntegration()],
-            traces_sample_rate=1.0,
+            sample_rate=1.0,
             environment=app.config.get("ENV", "development"),
+            **options,
         )
@@ -0,0 +1,96 @@
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from flask import current_app
+from flask_jwt_extended import decode_token
+from flask_jwt_extended.exceptions import (
+    JWTExtendedException,
+    NoAuthorizationError,
+    RevokedTokenError,
+    UserLookupError,
+)
+from flask_jwt_extended.internal_utils import verify_token_type
+from jwt import ExpiredSignatureError, PyJWTError
+from sqlalchemy.orm.scoping import scoped_session
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.cache import token_state_cache
+from app.core.token_denylist import token_denylist
+from app.v1.services.token_service import TokenService
+
+Handler = Callable[[Any, Request], Awaitable[Response]]
+
+# Status codes of flask_jwt_extended's default error callbacks.
+UNAUTHORIZED_ERRORS = (
+    NoAuthorizationError,
+    RevokedTokenError,
+    UserLookupError,
+    ExpiredSignatureError,
+)
+
+
+def verify_jwt(
+    session: scoped_session,
+    authorization: Optional[str],
+    refresh: bool = False,
+    verify_type: bool = True,
+) -> Dict[str, Any]:
+    """The checks ``jwt_required`` makes, for an ``Authorization`` header
+    value. Runs in the Flask app context; returns the token's claims."""
+    scheme, _, encoded = (authorization or "").partition(" ")
+    header_type = current_app.config["JWT_HEADER_TYPE"]
+    if not encoded or scheme != header_type:
+        raise NoAuthorizationError(
+            f"Missing '{header_type}' type in 'Authorization' header. "
+            f"Expected 'Authorization: {header_type} <JWT>'"
+        )
+    claims = decode_token(encoded)
+    if verify_type:
+        verify_token_type(claims, refresh)
+    # The blocklist callback would query through db.session, not ``session``.
+    if token_denylist.is_revoked(session, claims.get("jti")):
+        raise RevokedTokenError({}, claims)
+    service = TokenService(session=session, cache=token_state_cache)
+    if service.resolve_subject(int(claims["sub"]), claims.get("ver", 0)) is None:
+        raise UserLookupError(f"Error loading the user {claims['sub']}", {}, claims)
+    return claims
+
+
+def jwt_error(e: Exception) -> Tuple[Dict[str, str], int]:
+    if isinstance(e, ExpiredSignatureError):
+        return {"msg": "Token has expired"}, 401
+    if isinstance(e, RevokedTokenError):
+        return {"msg": "Token has been revoked"}, 401
+    return {"msg": str(e)}, 401 if isinstance(e, UNAUTHORIZED_ERRORS) else 422
+
+
+def jwt_required_async(
+    refresh: bool = False, verify_type: bool = True, admin: bool = False
+) -> Callable[[Handler], Handler]:
+    """``jwt_required`` (and ``admin_required`` with ``admin``) for the
+    ASGI views; the claims are left in ``request.state.jwt``."""
+
+    def decorator(handler: Handler) -> Handler:
+        @wraps(handler)
+        async def wrapper(endpoint: Any, request: Request) -> Response:
+            authorization = request.headers.get("Authorization")
+            try:
+                claims = await endpoint.run(
+                    request,
+                    lambda session: verify_jwt(
+                        session, authorization, refresh, verify_type
+                    ),
+                )
+            except (JWTExtendedException, PyJWTError) as e:
+                return endpoint.json_response(request, *jwt_error(e))
+            if admin and not claims.get("adm"):
+                return endpoint.json_response(
+                    request, {"error": "Admin privileges required"}, 403
+                )
+            request.state.jwt = claims
+            return await handler(endpoint, request)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,36 @@
+from starlette.routing import Mount, Route
+
+from app.v1.views.async_auth_view import (
+    AsyncLoginAPI,
+    AsyncLogoutAPI,
+    AsyncRefreshAPI,
+    AsyncRegisterAPI,
+    AsyncVerifyEmailAPI,
+)
+from app.v1.views.async_user_view import (
+    AsyncPasswordAPI,
+    AsyncProfileAPI,
+    AsyncUserAccessAPI,
+    AsyncUserListAPI,
+)
+
+auth_routes_v1 = Mount(
+    "/v1/auth",
+    routes=[
+        Route("/register", AsyncRegisterAPI),
+        Route("/login", AsyncLoginAPI),
+        Route("/refresh", AsyncRefreshAPI),
+        Route("/logout", AsyncLogoutAPI),
+        Route("/verify-email", AsyncVerifyEmailAPI),
+    ],
+)
+
+# A Mount only matches paths below its prefix, not the bare "/v1/users".
+user_routes_v1 = [
+    Route("/v1/users/profile", AsyncProfileAPI),
+    Route("/v1/users/password", AsyncPasswordAPI),
+    Route("/v1/users", AsyncUserListAPI),
+    Route("/v1/users/{user_id:int}", AsyncUserAccessAPI),
+]
+
+v1_async_routes = [auth_routes_v1, *user_routes_v1]
@@ -0,0 +1,42 @@
+import hmac
+from functools import wraps
+from typing import Any, Callable
+
+from flask import current_app, jsonify, request
+from flask_jwt_extended import get_jwt, jwt_required
+
+
+def admin_required(view: Callable[..., Any]) -> Callable[..., Any]:
+    """``jwt_required`` plus the token's ``adm`` claim.
+
+    The claim is trusted as issued: demoting an admin through
+    PATCH /v1/users/<id> bumps their token version, so tokens carrying the
+    old claim stop validating.
+    """
+
+    @wraps(view)
+    @jwt_required()
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if not get_jwt().get("adm"):
+            return jsonify({"error": "Admin privileges required"}), 403
+        return view(*args, **kwargs)
+
+    return wrapper
+
+
+def service_token_required(view: Callable[..., Any]) -> Callable[..., Any]:
+    """Accept only ``Authorization: Bearer <token>`` with a token listed in
+    ``INTERNAL_SERVICE_TOKENS``; user JWTs are not valid here."""
+
+    @wraps(view)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        scheme, _, presented = request.headers.get("Authorization", "").partition(" ")
+        accepted = current_app.config["INTERNAL_SERVICE_TOKENS"]
+        if scheme.lower() != "bearer" or not any(
+            hmac.compare_digest(presented.encode(), token.encode())
+            for token in accepted
+        ):
+            return jsonify({"error": "Invalid service token"}), 401
+        return view(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,22 @@
+from typing import Any, Dict, Optional
+
+from flask_jwt_extended import JWTManager
+
+from app.core.cache import token_state_cache
+from app.core.token_denylist import token_denylist
+from app.db.database import db
+from app.v1.services.token_service import TokenService, TokenSubject
+
+
+def register_jwt_callbacks(jwt: JWTManager) -> None:
+    @jwt.user_lookup_loader
+    def load_token_subject(
+        _jwt_header: Dict[str, Any], jwt_data: Dict[str, Any]
+    ) -> Optional[TokenSubject]:
+        # Returning None makes every @jwt_required() view answer 401.
+        service = TokenService(session=db.session, cache=token_state_cache)
+        return service.resolve_subject(int(jwt_data["sub"]), jwt_data.get("ver", 0))
+
+    @jwt.token_in_blocklist_loader
+    def is_token_revoked(_jwt_header: Dict[str, Any], jwt_data: Dict[str, Any]) -> bool:
+        return token_denylist.is_revoked(db.session, jwt_data.get("jti"))
@@ -1,21 +1,52 @@
 from flask import Blueprint, Flask
 
-from app.v1.views.auth_view import LoginAPI, RegisterAPI, VerifyEmailAPI
-from app.v1.views.user_view import ProfileAPI
+from app.v1.views.auth_view import (
+    LoginAPI,
+    LogoutAPI,
+    RefreshAPI,
+    RegisterAPI,
+    VerifyEmailAPI,
+)
+from app.v1.views.user_view import (
+    PasswordAPI,
+    ProfileAPI,
+    UserAccessAPI,
+    UserBatchGetAPI,
+    UserChangesAPI,
+    UserListAPI,
+)
 
 auth_blueprint_v1 = Blueprint("auth", __name__, url_prefix="/v1/auth")
 auth_blueprint_v1.add_url_rule(
     "/register", view_func=RegisterAPI.as_view("register_api")
 )
 auth_blueprint_v1.add_url_rule("/login", view_func=LoginAPI.as_view("login_api"))
+auth_blueprint_v1.add_url_rule("/refresh", view_func=RefreshAPI.as_view("refresh_api"))
+auth_blueprint_v1.add_url_rule("/logout", view_func=LogoutAPI.as_view("logout_api"))
 auth_blueprint_v1.add_url_rule(
     "/verify-email", view_func=VerifyEmailAPI.as_view("verify_email_api")
 )
 
 user_blueprint_v1 = Blueprint("user", __name__, url_prefix="/v1/users")
 user_blueprint_v1.add_url_rule("/profile", view_func=ProfileAPI.as_view("profile_api"))
+user_blueprint_v1.add_url_rule(
+    "/password", view_func=PasswordAPI.as_view("password_api")
+)
+user_blueprint_v1.add_url_rule("", view_func=UserListAPI.as_view("user_list_api"))
+user_blueprint_v1.add_url_rule(
+    "/<int:user_id>", view_func=UserAccessAPI.as_view("user_access_api")
+)
+
+internal_blueprint_v1 = Blueprint("internal", __name__, url_prefix="/v1/internal")
+internal_blueprint_v1.add_url_rule(
+    "/users:batchGet", view_func=UserBatchGetAPI.as_view("user_batch_get_api")
+)
+internal_blueprint_v1.add_url_rule(
+    "/users/changes", view_func=UserChangesAPI.as_view("user_changes_api")
+)
 
 
 def register_v1_routes(app: Flask) -> None:
     app.register_blueprint(auth_blueprint_v1)
     app.register_blueprint(user_blueprint_v1)
+    app.register_blueprint(internal_blueprint_v1)
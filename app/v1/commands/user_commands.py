@@ -0,0 +1,141 @@
+import csv
+import json
+import logging
+import os
+import sys
+from contextlib import contextmanager
+from typing import IO, Any, Iterator, Optional
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from app.core.password_hasher import PasswordHasher
+from app.db.database import db
+from app.v1.repositories.user_repository import EXPORT_COLUMNS
+from app.v1.services.bulk_user_service import BulkUserService, ImportStats
+
+logger = logging.getLogger(__name__)
+
+users_cli = AppGroup("users", help="Bulk import and export of users.")
+
+FORMATS = click.Choice(["csv", "jsonl"])
+
+
+def detect_format(path: str, file_format: Optional[str]) -> str:
+    if file_format:
+        return file_format
+    if path.endswith(".csv"):
+        return "csv"
+    if path.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    raise click.BadParameter("cannot tell the format from the name; use --format")
+
+
+@contextmanager
+def open_path(path: str, mode: str) -> Iterator[IO[str]]:
+    if path == "-":
+        yield sys.stdin if mode == "r" else sys.stdout
+        return
+    # newline="" leaves line endings inside quoted CSV fields to the csv module.
+    with open(path, mode, encoding="utf-8", newline="") as stream:
+        yield stream
+
+
+def read_records(stream: IO[str], file_format: str) -> Iterator[Any]:
+    """The records in ``stream``; a JSONL line that does not parse comes out
+    as None, which the import counts as invalid like any non-object."""
+    if file_format == "csv":
+        yield from csv.DictReader(stream)
+        return
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            logger.warning("Line %d: invalid JSON (%s)", number, e)
+            yield None
+
+
+def build_service(hash_workers: int) -> BulkUserService:
+    config = current_app.config
+    hasher = PasswordHasher(
+        config["PASSWORD_HASH_SCHEME"], config["PASSWORD_HASH_ROUNDS"], hash_workers
+    )
+    return BulkUserService(
+        session=db.session,
+        rabbitmq_url=config["RABBITMQ_URL"],
+        frontend_base_url=config["FRONTEND_BASE_URL"],
+        email_publisher=current_app.extensions["email_publisher"],
+        hasher=hasher,
+    )
+
+
+@users_cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False, allow_dash=True))
+@click.option("--format", "file_format", type=FORMATS, help="Default: by extension.")
+@click.option("--chunk-size", default=1000, show_default=True)
+@click.option(
+    "--hash-workers",
+    default=os.cpu_count() or 1,
+    show_default=True,
+    help="Processes hashing plain-text passwords; 0 hashes in this process.",
+)
+@click.option(
+    "--verified", is_flag=True, help="Mark users verified and send no emails."
+)
+def import_users(
+    path: str,
+    file_format: Optional[str],
+    chunk_size: int,
+    hash_workers: int,
+    verified: bool,
+) -> None:
+    """Import users from a CSV or JSONL file (``-`` for stdin).
+
+    Columns: email, first_name, last_name, phone_number and either password
+    or password_hash. Emails that already exist are skipped.
+    """
+    service = build_service(hash_workers)
+
+    def report(stats: ImportStats) -> None:
+        click.echo(json.dumps(stats.as_dict()), err=True)
+
+    try:
+        with open_path(path, "r") as stream:
+            records = read_records(stream, detect_format(path, file_format))
+            stats = service.import_users(records, chunk_size, verified, report)
+    finally:
+        service.hasher.shutdown()
+    click.echo(json.dumps(stats.as_dict()))
+
+
+@users_cli.command("export")
+@click.argument("path", type=click.Path(dir_okay=False, allow_dash=True))
+@click.option("--format", "file_format", type=FORMATS, help="Default: by extension.")
+@click.option("--chunk-size", default=1000, show_default=True)
+@click.option("--include-password-hash", is_flag=True)
+def export_users(
+    path: str, file_format: Optional[str], chunk_size: int, include_password_hash: bool
+) -> None:
+    """Export every user to a CSV or JSONL file (``-`` for stdout)."""
+    file_format = detect_format(path, file_format)
+    service = build_service(hash_workers=0)
+    records = service.export_users(chunk_size, include_password_hash)
+    exported = 0
+    with open_path(path, "w") as stream:
+        if file_format == "csv":
+            fieldnames = [column.key for column in EXPORT_COLUMNS]
+            if include_password_hash:
+                fieldnames.append("password_hash")
+            writer = csv.DictWriter(stream, fieldnames=fieldnames)
+            writer.writeheader()
+            for record in records:
+                writer.writerow(record)
+                exported += 1
+        else:
+            for record in records:
+                stream.write(json.dumps(record) + "\n")
+                exported += 1
+    click.echo(json.dumps({"exported": exported}), err=True)
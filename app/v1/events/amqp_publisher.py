@@ -0,0 +1,221 @@
+import logging
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+import pika
+from pika.adapters.blocking_connection import BlockingChannel
+from pika.exceptions import AMQPError
+
+from app.core.metrics import MESSAGES_PUBLISHED, PUBLISH_LATENCY
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AmqpMessage:
+    routing_key: str
+    body: bytes
+    exchange: str = ""
+    headers: Dict[str, Any] = field(default_factory=dict)
+
+
+class _PooledChannel:
+    """One broker connection with a single channel, owned by a ChannelPool."""
+
+    def __init__(
+        self,
+        parameters: pika.URLParameters,
+        durable_queues: Sequence[str],
+        transactional: bool,
+        topic_exchanges: Sequence[str] = (),
+    ):
+        self.connection = pika.BlockingConnection(parameters)
+        self.channel: BlockingChannel = self.connection.channel()
+        for queue_name in durable_queues:
+            self.channel.queue_declare(queue=queue_name, durable=True)
+        for exchange_name in topic_exchanges:
+            self.channel.exchange_declare(
+                exchange=exchange_name, exchange_type="topic", durable=True
+            )
+        self.transactional = transactional
+        if transactional:
+            self.channel.tx_select()
+
+    @property
+    def is_open(self) -> bool:
+        return bool(self.connection.is_open and self.channel.is_open)
+
+    def publish_batch(self, messages: Sequence[AmqpMessage]) -> None:
+        # Let the connection answer heartbeats that arrived while idle.
+        self.connection.process_data_events(time_limit=0)
+        for message in messages:
+            self.channel.basic_publish(
+                exchange=message.exchange,
+                routing_key=message.routing_key,
+                body=message.body,
+                properties=pika.BasicProperties(
+                    delivery_mode=2, headers=message.headers or None
+                ),
+            )
+        if self.transactional:
+            # One tx.commit round trip confirms the whole batch.
+            self.channel.tx_commit()
+
+    def close(self) -> None:
+        try:
+            if self.connection.is_open:
+                self.connection.close()
+        except AMQPError:
+            logger.debug("Ignoring error while closing AMQP connection")
+
+
+class ChannelPool:
+    """Per-process pool of long-lived AMQP channels.
+
+    Connections are opened lazily, queues and exchanges are declared once per
+    connection and broken connections are discarded and replaced on the next
+    checkout. The pool remembers the pid that created its connections so a
+    gunicorn worker forked after the pool was used never shares a socket with
+    its parent.
+    """
+
+    def __init__(
+        self,
+        rabbitmq_url: str,
+        durable_queues: Sequence[str] = (),
+        max_size: int = 2,
+        transactional: bool = True,
+        acquire_timeout: float = 5.0,
+        topic_exchanges: Sequence[str] = (),
+    ):
+        self.rabbitmq_url = rabbitmq_url
+        self.durable_queues = tuple(durable_queues)
+        self.topic_exchanges = tuple(topic_exchanges)
+        self.max_size = max_size
+        self.transactional = transactional
+        self.acquire_timeout = acquire_timeout
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._idle: "queue.LifoQueue[_PooledChannel]" = queue.LifoQueue()
+        self._created = 0
+
+    def _check_pid(self) -> None:
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    # Inherited sockets belong to the parent; drop them unclosed.
+                    self._reset()
+
+    def _open(self) -> _PooledChannel:
+        return _PooledChannel(
+            pika.URLParameters(self.rabbitmq_url),
+            self.durable_queues,
+            self.transactional,
+            self.topic_exchanges,
+        )
+
+    def _checkout(self) -> _PooledChannel:
+        self._check_pid()
+        try:
+            pooled = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.max_size
+                if can_create:
+                    self._created += 1
+            if not can_create:
+                try:
+                    pooled = self._idle.get(timeout=self.acquire_timeout)
+                except queue.Empty as e:
+                    raise TimeoutError("Timed out waiting for an AMQP channel") from e
+            else:
+                try:
+                    return self._open()
+                except Exception:
+                    self._discard()
+                    raise
+        if not pooled.is_open:
+            pooled.close()
+            self._discard()
+            return self._checkout()
+        return pooled
+
+    def _discard(self) -> None:
+        with self._lock:
+            self._created -= 1
+
+    @contextmanager
+    def channel(self) -> Iterator[_PooledChannel]:
+        pooled = self._checkout()
+        pid = self._pid
+        try:
+            yield pooled
+        except Exception:
+            pooled.close()
+            if pid == self._pid:
+                self._discard()
+            raise
+        if pid == self._pid:
+            self._idle.put(pooled)
+
+    def close(self) -> None:
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            pooled.close()
+            self._discard()
+
+
+class AmqpPublisher:
+    def __init__(
+        self,
+        rabbitmq_url: str,
+        durable_queues: Sequence[str] = (),
+        pool_size: int = 2,
+        confirm_delivery: bool = True,
+        topic_exchanges: Sequence[str] = (),
+    ):
+        self.pool = ChannelPool(
+            rabbitmq_url,
+            durable_queues=durable_queues,
+            max_size=pool_size,
+            transactional=confirm_delivery,
+            topic_exchanges=topic_exchanges,
+        )
+
+    def publish_batch(self, messages: Sequence[AmqpMessage]) -> None:
+        if not messages:
+            return
+        with PUBLISH_LATENCY.time():
+            try:
+                with self.pool.channel() as pooled:
+                    pooled.publish_batch(messages)
+            except AMQPError as e:
+                # The broken channel has been discarded; retry once on a fresh one.
+                logger.warning("AMQP publish failed, reconnecting: %s", e)
+                with self.pool.channel() as pooled:
+                    pooled.publish_batch(messages)
+        MESSAGES_PUBLISHED.inc(len(messages))
+
+    def publish(
+        self,
+        routing_key: str,
+        body: bytes,
+        exchange: str = "",
+        headers: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.publish_batch(
+            [AmqpMessage(routing_key, body, exchange=exchange, headers=headers or {})]
+        )
+
+    def close(self) -> None:
+        self.pool.close()
@@ -1,24 +1,66 @@
 import json
+import threading
+from typing import Dict, Sequence, Tuple
 
-import pika
+from flask import Flask
 
+from app.v1.events.amqp_publisher import AmqpMessage, AmqpPublisher
 from app.v1.schemas.email_schema import EmailMessage
 
+EMAIL_QUEUE_NAME = "email_queue"
+
+_publishers: Dict[Tuple[str, str], "EmailPublisher"] = {}
+_publishers_lock = threading.Lock()
+
 
 class EmailPublisher:
-    def __init__(self, rabbitmq_url: str):
+    def __init__(
+        self,
+        rabbitmq_url: str,
+        queue_name: str = EMAIL_QUEUE_NAME,
+        pool_size: int = 2,
+        confirm_delivery: bool = True,
+    ):
         self.rabbitmq_url = rabbitmq_url
+        self.queue_name = queue_name
+        self.publisher = AmqpPublisher(
+            rabbitmq_url,
+            durable_queues=[queue_name],
+            pool_size=pool_size,
+            confirm_delivery=confirm_delivery,
+        )
 
-    def publish_email(self, message: EmailMessage) -> None:
-        connection = pika.BlockingConnection(pika.URLParameters(self.rabbitmq_url))
-        channel = connection.channel()
-        channel.queue_declare(queue="email_queue", durable=True)
-
-        channel.basic_publish(
-            exchange="",
-            routing_key="email_queue",
-            body=json.dumps(message.__dict__),
-            properties=pika.BasicProperties(delivery_mode=2),
+    def build_message(self, message: EmailMessage) -> AmqpMessage:
+        return AmqpMessage(
+            routing_key=self.queue_name, body=json.dumps(message.__dict__).encode()
         )
 
-        connection.close()
+    def publish_email(self, message: EmailMessage) -> None:
+        self.publisher.publish_batch([self.build_message(message)])
+
+    def publish_emails(self, messages: Sequence[EmailMessage]) -> None:
+        self.publisher.publish_batch([self.build_message(m) for m in messages])
+
+
+def get_email_publisher(
+    rabbitmq_url: str, queue_name: str = EMAIL_QUEUE_NAME
+) -> EmailPublisher:
+    """Return the process-wide publisher for a broker URL and queue."""
+    key = (rabbitmq_url, queue_name)
+    with _publishers_lock:
+        if key not in _publishers:
+            _publishers[key] = EmailPublisher(rabbitmq_url, queue_name=queue_name)
+        return _publishers[key]
+
+
+def init_email_publisher(app: Flask) -> EmailPublisher:
+    publisher = EmailPublisher(
+        app.config["RABBITMQ_URL"],
+        queue_name=app.config["EMAIL_QUEUE_NAME"],
+        pool_size=app.config["RABBITMQ_PUBLISHER_POOL_SIZE"],
+        confirm_delivery=app.config["RABBITMQ_PUBLISHER_CONFIRMS"],
+    )
+    with _publishers_lock:
+        _publishers[(publisher.rabbitmq_url, publisher.queue_name)] = publisher
+    app.extensions["email_publisher"] = publisher
+    return publisher
@@ -0,0 +1,60 @@
+import json
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+
+import pytz
+
+from app.v1.events.amqp_publisher import AmqpMessage
+
+# Durable topic exchange; consumers bind their own queue, e.g. to "user.#".
+USER_EVENTS_EXCHANGE = "user.events"
+USER_EVENTS_SCHEMA_VERSION = 1
+
+USER_CREATED = "user.created"
+USER_UPDATED = "user.updated"
+USER_VERIFIED = "user.verified"
+
+
+@dataclass(frozen=True)
+class UserEvent:
+    type: str
+    user_id: int
+    # The fields the event sets: the profile on create, the changed columns
+    # on update, nothing on verify.
+    data: Dict[str, Any] = field(default_factory=dict)
+
+
+def build_user_event_messages(events: Sequence[UserEvent]) -> List[AmqpMessage]:
+    """One message per event type, each carrying all of a transaction's
+    events of that type, routed by the type.
+
+    The body is compact JSON::
+
+        {"v": 1, "at": "<iso time>", "events": [{"id": 1, "data": {...}}]}
+
+    Messages are staged in the outbox after the user row is written, while
+    its lock is held, so a user's events take outbox ids in the order they
+    happened. They are not delivered in that order: relays publish batches
+    concurrently and redeliver after a crash. The relay sends the outbox id
+    as the ``outbox_id`` header, the version of every event in the message;
+    a consumer applies a user's event only when its version is above the
+    last one it applied for that user.
+    """
+    by_type: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for event in events:
+        by_type[event.type].append({"id": event.user_id, "data": event.data})
+    at = datetime.now(tz=pytz.utc).isoformat()
+    return [
+        AmqpMessage(
+            routing_key=event_type,
+            body=json.dumps(
+                {"v": USER_EVENTS_SCHEMA_VERSION, "at": at, "events": batch},
+                separators=(",", ":"),
+                default=str,
+            ).encode(),
+            exchange=USER_EVENTS_EXCHANGE,
+        )
+        for event_type, batch in by_type.items()
+    ]
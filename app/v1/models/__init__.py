@@ -1,26 +1,38 @@
 from datetime import datetime
+from typing import Any, Dict
 
-import pytz
+from sqlalchemy import FetchedValue
 from sqlalchemy.orm import Mapped, as_declarative
 
 from app.db.database import db
+from app.v1.models.timestamps import CurrentTimestamp, install_updated_at_triggers
 
 
 @as_declarative()
 class Base(object):
+    # Server defaults come back in the INSERT's RETURNING clause; updated_at
+    # is set by a trigger on UPDATE and only reloaded when it is read.
+    __mapper_args__: Dict[str, Any] = {"eager_defaults": "auto"}
+
     id: Mapped[int] = db.Column(db.Integer, primary_key=True)
 
     created_at: Mapped[datetime] = db.Column(
-        db.DateTime(timezone=True), default=datetime.now(pytz.UTC), nullable=False
+        db.DateTime(timezone=True), server_default=CurrentTimestamp(), nullable=False
     )
     updated_at: Mapped[datetime] = db.Column(
         db.DateTime(timezone=True),
-        default=datetime.now(pytz.UTC),
-        onupdate=datetime.now(pytz.UTC),
+        server_default=CurrentTimestamp(),
+        server_onupdate=FetchedValue(),
+        nullable=False,
     )
 
     def __repr__(self) -> str:
         return "<{0} id={1}>".format(type(self).__name__, self.id)
 
 
+from .idempotency_key import IdempotencyKey  # noqa
+from .outbox_message import OutboxMessage  # noqa
+from .revoked_token import RevokedToken  # noqa
 from .user import User  # noqa
+
+install_updated_at_triggers(Base.metadata)  # type: ignore[attr-defined]
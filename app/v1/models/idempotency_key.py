@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy.orm import Mapped
+
+from app.db.database import db
+from app.v1.models import Base
+
+
+class IdempotencyKey(Base):
+    """The first response to a request carrying an ``Idempotency-Key``,
+    replayed to its retries by every worker until ``expires_at``."""
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        # Scoped by endpoint: "<endpoint>:<Idempotency-Key>".
+        db.Index("ux_idempotency_keys_key", "key", unique=True),
+        db.Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    key: Mapped[str] = db.Column(db.String(320), nullable=False)
+    # A digest of the request body the key was first used with.
+    fingerprint: Mapped[str] = db.Column(db.String(64), nullable=False)
+    status: Mapped[int] = db.Column(db.Integer, nullable=False)
+    # The response body, as JSON.
+    body: Mapped[str] = db.Column(db.Text, nullable=False)
+    expires_at: Mapped[datetime] = db.Column(db.DateTime(timezone=True), nullable=False)
@@ -0,0 +1,18 @@
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Mapped
+
+from app.db.database import db
+from app.v1.models import Base
+
+
+class OutboxMessage(Base):
+    """A broker message written in the same transaction as the change it
+    announces and published later by the outbox relay."""
+
+    __tablename__ = "outbox_messages"
+
+    exchange: Mapped[str] = db.Column(db.String(255), default="", nullable=False)
+    routing_key: Mapped[str] = db.Column(db.String(255), nullable=False)
+    body: Mapped[str] = db.Column(db.Text, nullable=False)
+    headers: Mapped[Optional[Dict[str, Any]]] = db.Column(db.JSON, nullable=True)
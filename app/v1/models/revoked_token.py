@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy.orm import Mapped
+
+from app.db.database import db
+from app.v1.models import Base
+
+
+class RevokedToken(Base):
+    """A revoked JWT, by ``jti``, kept until the token would have expired
+    anyway; shared by every worker through the database."""
+
+    __tablename__ = "revoked_tokens"
+    __table_args__ = (
+        # Revoking a jti twice fails here, which is what makes refresh token
+        # rotation single-use across workers.
+        db.Index("ux_revoked_tokens_jti", "jti", unique=True),
+        db.Index("ix_revoked_tokens_expires_at", "expires_at"),
+    )
+
+    jti: Mapped[str] = db.Column(db.String(255), nullable=False)
+    expires_at: Mapped[datetime] = db.Column(db.DateTime(timezone=True), nullable=False)
@@ -0,0 +1,89 @@
+from typing import Any, List
+
+from sqlalchemy import DDL, DateTime, MetaData, Table, event
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.functions import FunctionElement
+
+SQLITE_NOW = "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+class CurrentTimestamp(FunctionElement):  # pylint: disable=too-many-ancestors
+    """The database's current time, as a column's server default.
+
+    ``now()`` on Postgres is the transaction's start time. SQLite's
+    CURRENT_TIMESTAMP only has whole seconds, so it gets milliseconds
+    through strftime instead, padded to the six fractional digits
+    SQLAlchemy writes: SQLite compares the stored text, and keyset
+    pagination needs both to sort alike.
+    """
+
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+
+@compiles(CurrentTimestamp)
+def _current_timestamp(_element: Any, _compiler: SQLCompiler, **_kw: Any) -> str:
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(CurrentTimestamp, "postgresql")
+def _current_timestamp_postgresql(
+    _element: Any, _compiler: SQLCompiler, **_kw: Any
+) -> str:
+    return "now()"
+
+
+@compiles(CurrentTimestamp, "sqlite")
+def _current_timestamp_sqlite(_element: Any, _compiler: SQLCompiler, **_kw: Any) -> str:
+    return SQLITE_NOW
+
+
+POSTGRES_SET_UPDATED_AT = """
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+BEGIN
+    IF NEW.updated_at IS NOT DISTINCT FROM OLD.updated_at THEN
+        NEW.updated_at = now();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def updated_at_trigger_ddl(table_name: str, dialect: str) -> List[str]:
+    """Statements keeping ``table_name.updated_at`` current on every UPDATE,
+    unless the UPDATE sets it itself."""
+    trigger = f"{table_name}_set_updated_at"
+    if dialect == "postgresql":
+        return [
+            POSTGRES_SET_UPDATED_AT,
+            f"CREATE TRIGGER {trigger} BEFORE UPDATE ON {table_name} "
+            "FOR EACH ROW EXECUTE FUNCTION set_updated_at()",
+        ]
+    if dialect == "sqlite":
+        # SQLite triggers cannot assign to NEW; update the row again. The
+        # WHEN clause stops the trigger from firing on its own UPDATE.
+        return [
+            f"CREATE TRIGGER {trigger} AFTER UPDATE ON {table_name} "
+            "FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at BEGIN "
+            f"UPDATE {table_name} "
+            f"SET updated_at = {SQLITE_NOW} "
+            "WHERE id = NEW.id; END"
+        ]
+    return []
+
+
+def install_updated_at_triggers(metadata: MetaData) -> None:
+    """Create the triggers along with each table in ``metadata.create_all``;
+    the migrations create them for existing databases."""
+    for table in metadata.tables.values():
+        _listen_after_create(table)
+
+
+def _listen_after_create(table: Table) -> None:
+    for dialect in ("postgresql", "sqlite"):
+        for statement in updated_at_trigger_ddl(table.name, dialect):
+            # DDL applies %-formatting to the statement.
+            ddl = DDL(statement.replace("%", "%%")).execute_if(dialect=dialect)
+            event.listen(table, "after_create", ddl)
@@ -1,17 +1,41 @@
 from datetime import datetime
 from typing import Any, Dict, Optional
 
-from passlib.hash import bcrypt
 from sqlalchemy.orm import Mapped
 
+from app.core.password_hasher import password_hasher
 from app.db.database import db
 from app.v1.models import Base
 
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Emails are stored lower-cased; the index also enforces it for any
+        # writer that bypasses UserRepository.
+        db.Index("ux_users_email_lower", db.func.lower(db.text("email")), unique=True),
+        # Keyset pagination of the admin listing.
+        db.Index("ix_users_created_at_id", "created_at", "id"),
+        # Keyset pagination of the change feed.
+        db.Index("ix_users_updated_at_id", "updated_at", "id"),
+        # Email prefix search: LIKE 'prefix%' can only use a btree index under
+        # the C collation or with pattern ops.
+        db.Index(
+            "ix_users_email_lower_pattern",
+            db.func.lower(db.text("email")).label("email_lower"),
+            postgresql_ops={"email_lower": "text_pattern_ops"},
+        ),
+        # Only unverified users hold a token, so the index stays small.
+        db.Index(
+            "ix_users_verification_token_hash",
+            "verification_token_hash",
+            unique=True,
+            postgresql_where=db.text("verification_token_hash IS NOT NULL"),
+            sqlite_where=db.text("verification_token_hash IS NOT NULL"),
+        ),
+    )
 
-    email: Mapped[str] = db.Column(db.String(255), unique=True, nullable=False)
+    email: Mapped[str] = db.Column(db.String(255), nullable=False)
     password_hash: Mapped[str] = db.Column(db.String(255), nullable=False)
 
     first_name: Mapped[str] = db.Column(db.String(100), nullable=False)
@@ -19,20 +43,27 @@ class User(Base):
     phone_number: Mapped[str] = db.Column(db.String(30), nullable=False)
     is_active: Mapped[bool] = db.Column(db.Boolean, default=True, nullable=False)
     is_admin: Mapped[bool] = db.Column(db.Boolean, default=False, nullable=False)
+    # Bumped to invalidate every token issued before; carried as the "ver" claim.
+    token_version: Mapped[int] = db.Column(
+        db.Integer, default=0, server_default="0", nullable=False
+    )
 
     is_email_verified: Mapped[bool] = db.Column(
         db.Boolean, default=False, nullable=False
     )
-    verification_token: Mapped[Optional[str]] = db.Column(db.String(128), nullable=True)
+    # SHA-256 of the emailed token; the token itself is never stored.
+    verification_token_hash: Mapped[Optional[str]] = db.Column(
+        db.String(128), nullable=True
+    )
     verification_token_expiry: Mapped[Optional[datetime]] = db.Column(
         db.DateTime(timezone=True), nullable=True
     )
 
     def set_password(self, password: str) -> None:
-        self.password_hash = bcrypt.hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password: str) -> bool:
-        return bcrypt.verify(password, self.password_hash)
+        return password_hasher.verify(password, self.password_hash)
 
     @property
     def full_name(self) -> str:
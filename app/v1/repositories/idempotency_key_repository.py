@@ -0,0 +1,78 @@
+from datetime import datetime
+from typing import List, Optional
+
+import pytz
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.scoping import scoped_session
+
+from app.v1.models.idempotency_key import IdempotencyKey
+
+
+class IdempotencyKeyRepository:
+    def __init__(self, session: scoped_session):
+        self.session = session
+
+    def get(self, key: str) -> Optional[IdempotencyKey]:
+        """The unexpired response stored for ``key``, if any."""
+        statement = select(IdempotencyKey).where(
+            IdempotencyKey.key == key,
+            IdempotencyKey.expires_at > datetime.now(tz=pytz.utc),
+        )
+        return self.session.scalars(statement).first()
+
+    def stage(self, record: IdempotencyKey) -> None:
+        """Add ``record`` to the session without committing, so it is stored
+        in the same transaction as the writes that produced the response."""
+        self.session.add(record)
+
+    def save(self, record: IdempotencyKey) -> bool:
+        """Store ``record`` in a transaction of its own. Returns False,
+        inserting nothing, when another worker stored its key first."""
+        dialect = self.session.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        statement = (
+            insert(IdempotencyKey)
+            .values(
+                key=record.key,
+                fingerprint=record.fingerprint,
+                status=record.status,
+                body=record.body,
+                expires_at=record.expires_at,
+            )
+            .on_conflict_do_nothing(index_elements=["key"])
+            .returning(IdempotencyKey.id)
+        )
+        try:
+            saved = self.session.execute(statement).first() is not None
+            self.session.commit()
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            raise Exception(f"Error saving idempotency key: {str(e)}")
+        return saved
+
+    def purge_expired(self, batch_size: int = 1000) -> int:
+        """Delete expired keys, committing every ``batch_size`` rows.
+        Returns the number deleted."""
+        now = datetime.now(tz=pytz.utc)
+        purged = 0
+        try:
+            while True:
+                ids: List[int] = list(
+                    self.session.scalars(
+                        select(IdempotencyKey.id)
+                        .where(IdempotencyKey.expires_at <= now)
+                        .limit(batch_size)
+                    )
+                )
+                if not ids:
+                    return purged
+                self.session.query(IdempotencyKey).filter(
+                    IdempotencyKey.id.in_(ids)
+                ).delete(synchronize_session=False)
+                self.session.commit()
+                purged += len(ids)
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            raise Exception(f"Error purging idempotency keys: {str(e)}")
@@ -0,0 +1,56 @@
+from typing import List, Sequence
+
+from sqlalchemy import insert
+from sqlalchemy.orm.scoping import scoped_session
+
+from app.v1.events.amqp_publisher import AmqpMessage
+from app.v1.models.outbox_message import OutboxMessage
+
+
+class OutboxRepository:
+    def __init__(self, session: scoped_session):
+        self.session = session
+
+    def add(self, message: AmqpMessage) -> OutboxMessage:
+        """Stage a message in the current transaction without committing."""
+        outbox_message = OutboxMessage()
+        outbox_message.exchange = message.exchange
+        outbox_message.routing_key = message.routing_key
+        outbox_message.body = message.body.decode()
+        outbox_message.headers = message.headers or None
+        self.session.add(outbox_message)
+        return outbox_message
+
+    def add_many(self, messages: Sequence[AmqpMessage]) -> None:
+        """Stage many messages as one multi-row INSERT, without committing."""
+        if not messages:
+            return
+        self.session.execute(
+            insert(OutboxMessage),
+            [
+                {
+                    "exchange": message.exchange,
+                    "routing_key": message.routing_key,
+                    "body": message.body.decode(),
+                    "headers": message.headers or None,
+                }
+                for message in messages
+            ],
+        )
+
+    def claim_batch(self, limit: int) -> List[OutboxMessage]:
+        """Lock up to ``limit`` of the oldest messages, skipping rows another
+        relay already holds, until the surrounding transaction ends."""
+        return (
+            self.session.query(OutboxMessage)
+            .order_by(OutboxMessage.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+    def delete(self, messages: Sequence[OutboxMessage]) -> None:
+        ids = [message.id for message in messages]
+        self.session.query(OutboxMessage).filter(OutboxMessage.id.in_(ids)).delete(
+            synchronize_session=False
+        )
@@ -0,0 +1,76 @@
+from datetime import datetime
+from typing import List
+
+import pytz
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.scoping import scoped_session
+
+from app.v1.models.revoked_token import RevokedToken
+
+
+class RevokedTokenRepository:
+    def __init__(self, session: scoped_session):
+        self.session = session
+
+    def revoke(self, jti: str, expires_at: float) -> bool:
+        """Record ``jti`` as revoked until ``expires_at`` (a Unix time).
+        Returns False, inserting nothing, when it already was: of two
+        concurrent revocations of the same jti exactly one succeeds."""
+        dialect = self.session.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        statement = (
+            insert(RevokedToken)
+            .values(
+                jti=jti,
+                expires_at=datetime.fromtimestamp(expires_at, tz=pytz.utc),
+            )
+            .on_conflict_do_nothing(index_elements=["jti"])
+            .returning(RevokedToken.id)
+        )
+        try:
+            revoked = self.session.execute(statement).first() is not None
+            self.session.commit()
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            raise Exception(f"Error revoking token: {str(e)}")
+        return revoked
+
+    def is_revoked(self, jti: str) -> bool:
+        statement = select(RevokedToken.id).where(
+            RevokedToken.jti == jti,
+            RevokedToken.expires_at > datetime.now(tz=pytz.utc),
+        )
+        return self.session.execute(statement).first() is not None
+
+    def live_jtis(self) -> List[str]:
+        statement = select(RevokedToken.jti).where(
+            RevokedToken.expires_at > datetime.now(tz=pytz.utc)
+        )
+        return list(self.session.scalars(statement))
+
+    def purge_expired(self, batch_size: int = 1000) -> int:
+        """Delete revocations of tokens that have expired anyway, committing
+        every ``batch_size`` rows. Returns the number deleted."""
+        now = datetime.now(tz=pytz.utc)
+        purged = 0
+        try:
+            while True:
+                ids: List[int] = list(
+                    self.session.scalars(
+                        select(RevokedToken.id)
+                        .where(RevokedToken.expires_at <= now)
+                        .limit(batch_size)
+                    )
+                )
+                if not ids:
+                    return purged
+                self.session.query(RevokedToken).filter(
+                    RevokedToken.id.in_(ids)
+                ).delete(synchronize_session=False)
+                self.session.commit()
+                purged += len(ids)
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            raise Exception(f"Error purging revoked tokens: {str(e)}")
@@ -1,77 +1,521 @@
+import hashlib
 from datetime import datetime, timedelta
-from typing import Any, Mapping, Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
 import pytz
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import (
+    Integer,
+    Row,
+    any_,
+    bindparam,
+    func,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm.scoping import scoped_session
 
+from app.core.cache import CacheBackend
 from app.core.error_handlers import NotFoundException, ValidationException
+from app.db.replicas import read_from_replica
+from app.v1.events.user_events import (
+    USER_CREATED,
+    USER_UPDATED,
+    USER_VERIFIED,
+    UserEvent,
+    build_user_event_messages,
+)
 from app.v1.models.user import User
+from app.v1.repositories.outbox_repository import OutboxRepository
 from app.v1.schemas.auth_schema import RegisterRequest
+from app.v1.schemas.user_schema import UserListQuery
+
+T = TypeVar("T")
+
+# The unique index behind "User already exists".
+EMAIL_UNIQUE_INDEX = "ux_users_email_lower"
+
+
+def violates_unique_index(error: IntegrityError, index_name: str) -> bool:
+    """Whether ``error`` is a unique violation of ``index_name``.
+
+    Postgres reports SQLSTATE 23505 with the constraint name (on ``diag``
+    with psycopg2, on the asyncpg exception behind the adapter); SQLite
+    only names the index in its message.
+    """
+    orig = error.orig
+    constraint_name = getattr(getattr(orig, "diag", None), "constraint_name", None)
+    constraint_name = constraint_name or getattr(
+        getattr(orig, "__cause__", None), "constraint_name", None
+    )
+    if constraint_name is not None:
+        return (
+            getattr(orig, "pgcode", None) == "23505" and constraint_name == index_name
+        )
+    return f"index '{index_name}'" in str(orig)
+
+
+def profile_cache_key(user_id: int) -> str:
+    return f"user:profile:{int(user_id)}"
+
+
+# Columns written by ``users export``; the hash only on request.
+EXPORT_COLUMNS = (
+    User.id,
+    User.email,
+    User.first_name,
+    User.last_name,
+    User.phone_number,
+    User.is_active,
+    User.is_email_verified,
+    User.created_at,
+)
+
+
+LISTING_COLUMNS = (
+    User.id,
+    User.email,
+    User.first_name,
+    User.last_name,
+    User.phone_number,
+    User.is_active,
+    User.is_admin,
+    User.is_email_verified,
+    User.created_at,
+)
+LISTING_FLAGS = ("is_active", "is_admin", "is_email_verified")
+
+# The profile as served by GET/PUT /v1/users/profile (User.to_dict()).
+PROFILE_COLUMNS = (
+    User.id,
+    User.email,
+    User.first_name,
+    User.last_name,
+    User.phone_number,
+)
+# Columns whose change revokes every token issued before it.
+CREDENTIAL_FIELDS = ("password_hash", "is_active", "is_admin")
+# Columns a user may change through PUT /v1/users/profile.
+PROFILE_UPDATE_FIELDS = ("first_name", "last_name", "phone_number")
+# What a user.created event carries.
+CREATED_EVENT_FIELDS = (
+    "email",
+    "first_name",
+    "last_name",
+    "phone_number",
+    "is_email_verified",
+)
+# The change feed: the current state of every user changed since a cursor.
+CHANGE_COLUMNS = (
+    User.id,
+    User.email,
+    User.first_name,
+    User.last_name,
+    User.phone_number,
+    User.is_active,
+    User.is_email_verified,
+    User.updated_at,
+)
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+def verification_token_digest(verification_token: str) -> str:
+    return hashlib.sha256(verification_token.encode()).hexdigest()
 
 
 class UserRepository:
-    def __init__(self, session: scoped_session):
+    def __init__(self, session: scoped_session, cache: Optional[CacheBackend] = None):
         self.session = session
+        self.cache = cache
+        self.outbox_repo = OutboxRepository(session)
+
+    def _invalidate_profile(self, user_id: int) -> None:
+        if self.cache is not None:
+            self.cache.delete(profile_cache_key(user_id))
+
+    def _read_profiles(self, read: Callable[[], T]) -> T:
+        # What is read here gets cached: from a lagging replica, a profile
+        # could be cached just after a write invalidated it and then be
+        # served stale for the whole TTL. Cache fills read the primary.
+        if self.cache is not None:
+            return read()
+        return read_from_replica(self.session, read)
+
+    def _stage_events(self, events: Sequence[UserEvent]) -> None:
+        # Staged after the user row is written: a concurrent change to the
+        # same user waits on its row lock until this transaction commits, so
+        # a user's events take outbox ids in the order they happened.
+        self.outbox_repo.add_many(build_user_event_messages(events))
 
     def create_user(self, req_data: RegisterRequest, verification_token: str) -> User:
         try:
             new_user = User()
-            new_user.email = req_data.email
+            new_user.email = normalize_email(req_data.email)
             new_user.password_hash = req_data.password
             new_user.first_name = req_data.first_name
             new_user.last_name = req_data.last_name
             new_user.phone_number = req_data.phone_number
             new_user.is_email_verified = False
-            new_user.verification_token = verification_token
+            new_user.verification_token_hash = verification_token_digest(
+                verification_token
+            )
             new_user.verification_token_expiry = datetime.now(tz=pytz.utc) + timedelta(
                 hours=1
             )  # Expires in 1 hour
             self.session.add(new_user)
+            # The INSERT assigns the id the event needs; it commits below.
+            self.session.flush()
+            self._stage_events(
+                [
+                    UserEvent(
+                        USER_CREATED,
+                        new_user.id,
+                        {
+                            name: getattr(new_user, name)
+                            for name in CREATED_EVENT_FIELDS
+                        },
+                    )
+                ]
+            )
             self.session.commit()
             return new_user
+        except IntegrityError as e:
+            self.session.rollback()
+            # Other unique keys, such as the verification token digest, are
+            # not the caller's doing and must not read as a taken email.
+            if violates_unique_index(e, EMAIL_UNIQUE_INDEX):
+                raise ValidationException("User already exists")
+            raise Exception(f"Error creating user: {str(e)}")
         except SQLAlchemyError as e:
             self.session.rollback()
             raise Exception(f"Error creating user: {str(e)}")
 
+    def bulk_create_users(
+        self, rows: Sequence[Dict[str, Any]]
+    ) -> List[Tuple[int, str]]:
+        """Insert ``rows`` (column name -> value) without committing, staging
+        one user.created message for them.
+
+        Rows whose email already exists are skipped by the database rather
+        than raising. Returns ``(id, email)`` for the rows actually inserted.
+        """
+        dialect = self.session.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        statement = insert(User).on_conflict_do_nothing().returning(User.id, User.email)
+        result = self.session.connection().execute(statement, list(rows))
+        inserted = [(row.id, row.email) for row in result]
+        by_email = {row["email"]: row for row in rows}
+        self._stage_events(
+            [
+                UserEvent(
+                    USER_CREATED,
+                    user_id,
+                    {name: by_email[email][name] for name in CREATED_EVENT_FIELDS},
+                )
+                for user_id, email in inserted
+            ]
+        )
+        return inserted
+
+    def iter_users(
+        self, batch_size: int = 1000, include_password_hash: bool = False
+    ) -> Iterator[Row]:
+        """Every user in id order as plain rows, fetched ``batch_size`` at a
+        time (through a server-side cursor on Postgres), so memory stays flat
+        however large the table is."""
+        columns = list(EXPORT_COLUMNS)
+        if include_password_hash:
+            columns.append(User.password_hash)
+        statement = (
+            select(*columns).order_by(User.id).execution_options(yield_per=batch_size)
+        )
+        yield from self.session.execute(statement)
+
+    def list_users(
+        self,
+        query: UserListQuery,
+        after: Optional[Tuple[datetime, int]],
+        limit: int,
+    ) -> Iterator[Row]:
+        """Users matching ``query``, newest first, starting after the
+        ``(created_at, id)`` keyset ``after``.
+
+        Seeking past the previous page through ix_users_created_at_id costs
+        the same on every page, unlike OFFSET, which reads and discards all
+        the rows before it.
+        """
+        statement = select(*LISTING_COLUMNS)
+        for flag in LISTING_FLAGS:
+            value = getattr(query, flag)
+            if value is not None:
+                statement = statement.where(getattr(User, flag) == value)
+        if query.email_prefix:
+            pattern = escape_like(normalize_email(query.email_prefix)) + "%"
+            statement = statement.where(
+                func.lower(User.email).like(pattern, escape="\\")
+            )
+        if after is not None:
+            statement = statement.where(tuple_(User.created_at, User.id) < after)
+        statement = (
+            statement.order_by(User.created_at.desc(), User.id.desc())
+            .limit(limit)
+            .execution_options(yield_per=500)
+        )
+        yield from read_from_replica(
+            self.session, lambda: self.session.execute(statement)
+        )
+
+    def list_changes(
+        self, after: Optional[Tuple[datetime, int]], until: datetime, limit: int
+    ) -> List[Row]:
+        """Users changed after the ``(updated_at, id)`` keyset ``after`` and
+        no later than ``until``, oldest change first, through
+        ix_users_updated_at_id.
+
+        Read from the primary: a replica lagging past ``until`` would hand
+        out a cursor beyond rows it has not received yet.
+        """
+        statement = select(*CHANGE_COLUMNS).where(User.updated_at <= until)
+        if after is not None:
+            statement = statement.where(tuple_(User.updated_at, User.id) > after)
+        statement = statement.order_by(User.updated_at, User.id).limit(limit)
+        return list(self.session.execute(statement))
+
     def get_user_by_email(self, email: str) -> Optional[User]:
-        return self.session.query(User).filter_by(email=email).first()
+        # Matches the unique index on lower(email).
+        return read_from_replica(
+            self.session,
+            lambda: self.session.query(User)
+            .filter(func.lower(User.email) == normalize_email(email))
+            .first(),
+        )
 
     def get_user_by_id(self, user_id: int) -> Optional[User]:
-        return self.session.query(User).filter_by(id=user_id).first()
+        return read_from_replica(
+            self.session,
+            lambda: self.session.query(User).filter_by(id=user_id).first(),
+        )
+
+    def get_user_profile(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Serialized profile, read through the profile cache when set."""
+        if self.cache is not None:
+            profile = self.cache.get(profile_cache_key(user_id))
+            if profile is not None:
+                return profile
+
+        user = self._read_profiles(
+            lambda: self.session.query(User).filter_by(id=user_id).first()
+        )
+        if not user:
+            return None
+        profile = user.to_dict()
+        if self.cache is not None:
+            self.cache.set(profile_cache_key(user_id), profile)
+        return profile
+
+    def get_user_profiles(self, user_ids: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+        """Serialized profiles of the ``user_ids`` that exist, by id.
+
+        Cached profiles are served from the profile cache; the rest are read
+        with a single query and cached.
+        """
+        profiles: Dict[int, Dict[str, Any]] = {}
+        uncached: List[int] = []
+        for user_id in user_ids:
+            profile = (
+                self.cache.get(profile_cache_key(user_id))
+                if self.cache is not None
+                else None
+            )
+            if profile is not None:
+                profiles[user_id] = profile
+            else:
+                uncached.append(user_id)
+        if not uncached:
+            return profiles
+
+        if self.session.get_bind().dialect.name == "postgresql":
+            # One array parameter: the statement text, and so its plan and its
+            # pg_stat_statements entry, is the same whatever the batch size.
+            matches_ids = User.id == any_(
+                bindparam("user_ids", uncached, type_=postgresql.ARRAY(Integer))
+            )
+        else:
+            matches_ids = User.id.in_(uncached)
+        users = self._read_profiles(
+            lambda: self.session.query(User).filter(matches_ids).all()
+        )
+        for user in users:
+            profile = user.to_dict()
+            profiles[user.id] = profile
+            if self.cache is not None:
+                self.cache.set(profile_cache_key(user.id), profile)
+        return profiles
 
     def verify_email(self, verification_token: str) -> None:
-        try:
-            user: Optional[User] = (
-                self.session.query(User)
-                .filter_by(verification_token=verification_token)
-                .first()
+        """Mark the holder of a live ``verification_token`` verified, with a
+        single UPDATE conditional on the token digest and its expiry."""
+        statement = (
+            update(User)
+            .where(
+                User.verification_token_hash
+                == verification_token_digest(verification_token),
+                or_(
+                    User.verification_token_expiry.is_(None),
+                    User.verification_token_expiry >= datetime.now(tz=pytz.utc),
+                ),
+            )
+            .values(
+                is_email_verified=True,
+                verification_token_hash=None,
+                verification_token_expiry=None,
             )
-            if not user:
-                raise NotFoundException("Invalid or expired token")
-
-            if (
-                user.verification_token_expiry
-                and user.verification_token_expiry < datetime.now(tz=pytz.utc)
-            ):
-                raise ValidationException("Token has expired")
-
-            user.is_email_verified = True
-            user.verification_token = None
-            user.verification_token_expiry = None
+            .returning(User.id)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            user_id = self.session.execute(statement).scalar()
+            if user_id is not None:
+                self._stage_events([UserEvent(USER_VERIFIED, user_id)])
             self.session.commit()
         except SQLAlchemyError as e:
             self.session.rollback()
             raise Exception(f"Error verifying email: {str(e)}")
+        if user_id is None:
+            # Unknown and expired tokens are not told apart: that would take
+            # a second query and tells a guesser which tokens once existed.
+            raise NotFoundException("Invalid or expired token")
+        self._invalidate_profile(user_id)
 
-    def update_user(self, user_id: int, **kwargs: Mapping[str, Any]) -> Optional[User]:
-        user: Optional[User] = (
-            self.session.query(User).filter(User.id == user_id).first()
+    def purge_expired_verification_tokens(self, batch_size: int = 1000) -> int:
+        """Clear verification tokens past their expiry, committing every
+        ``batch_size`` rows so no single transaction holds many row locks.
+        Returns the number of tokens cleared."""
+        now = datetime.now(tz=pytz.utc)
+        purged = 0
+        try:
+            while True:
+                ids: List[int] = [
+                    row.id
+                    for row in self.session.query(User.id)
+                    .filter(
+                        User.verification_token_hash.isnot(None),
+                        User.verification_token_expiry < now,
+                    )
+                    .limit(batch_size)
+                ]
+                if not ids:
+                    return purged
+                self.session.query(User).filter(User.id.in_(ids)).update(
+                    {
+                        User.verification_token_hash: None,
+                        User.verification_token_expiry: None,
+                    },
+                    synchronize_session=False,
+                )
+                self.session.commit()
+                purged += len(ids)
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            raise Exception(f"Error purging verification tokens: {str(e)}")
+
+    def get_token_state(self, user_id: int) -> Optional[Tuple[int, bool]]:
+        row = (
+            self.session.query(User.token_version, User.is_active)
+            .filter(User.id == user_id)
+            .first()
         )
-        if not user:
+        return (row.token_version, row.is_active) if row else None
+
+    def get_password_hash(self, user_id: int) -> Optional[str]:
+        # From the primary: it is checked right before being replaced.
+        return self.session.scalar(select(User.password_hash).where(User.id == user_id))
+
+    def revoke_tokens(
+        self, user_id: int, deactivate: bool = False, **changes: Any
+    ) -> bool:
+        """Invalidate every token issued so far, optionally deactivating, in
+        the same UPDATE that applies ``changes`` to the ``CREDENTIAL_FIELDS``;
+        returns whether the user exists."""
+        unknown = set(changes) - set(CREDENTIAL_FIELDS)
+        if unknown:
+            raise ValidationException(f"Cannot update {', '.join(sorted(unknown))}")
+        if deactivate:
+            changes["is_active"] = False
+        statement = (
+            update(User)
+            .where(User.id == user_id)
+            .values(token_version=User.token_version + 1, **changes)
+            .returning(User.id)
+            .execution_options(synchronize_session=False)
+        )
+        flags = {name: changes[name] for name in LISTING_FLAGS if name in changes}
+        try:
+            found = self.session.execute(statement).first() is not None
+            if found and flags:
+                self._stage_events([UserEvent(USER_UPDATED, user_id, flags)])
+            self.session.commit()
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            raise Exception(f"Error revoking tokens: {str(e)}")
+        return found
+
+    def update_password_hash(self, user_id: int, password_hash: str) -> None:
+        try:
+            self.session.query(User).filter(User.id == user_id).update(
+                {User.password_hash: password_hash}, synchronize_session=False
+            )
+            self.session.commit()
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            raise Exception(f"Error updating password: {str(e)}")
+
+    def update_user(self, user_id: int, **values: Any) -> Optional[Dict[str, Any]]:
+        """Set the ``PROFILE_UPDATE_FIELDS`` in ``values`` with one
+        ``UPDATE ... RETURNING``; returns the updated profile, or None when
+        there is no such user."""
+        unknown = set(values) - set(PROFILE_UPDATE_FIELDS)
+        if unknown:
+            raise ValidationException(f"Cannot update {', '.join(sorted(unknown))}")
+        if not values:
+            return self.get_user_profile(user_id)
+
+        statement = (
+            update(User)
+            .where(User.id == user_id)
+            .values(values)
+            .returning(*PROFILE_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            row = self.session.execute(statement).first()
+            if row is not None:
+                self._stage_events([UserEvent(USER_UPDATED, user_id, values)])
+            self.session.commit()
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            raise Exception(f"Error updating user: {str(e)}")
+        if row is None:
             return None
-        for key, value in kwargs.items():
-            setattr(user, key, value)
-        self.session.commit()
-        self.session.refresh(user)
-        return user
+        self._invalidate_profile(user_id)
+        return row._asdict()
@@ -19,6 +19,7 @@ class LoginRequest:
 @dataclass
 class AuthResponse:
     access_token: str
+    refresh_token: str
     token_type: str = "bearer"
 
 
@@ -0,0 +1,94 @@
+import dataclasses
+import typing
+from typing import Any, Dict, Generic, List, Optional, Tuple, Type, TypeVar
+
+import desert
+from marshmallow import EXCLUDE
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+@dataclasses.dataclass(frozen=True)
+class _FieldCheck:
+    name: str
+    kind: type
+    required: bool
+    nullable: bool
+    item_kind: Optional[type] = None
+
+    def accepts(self, value: Any) -> bool:
+        if value is None:
+            return self.nullable
+        # Exact type checks: bool is not an int, and anything marshmallow
+        # would coerce (e.g. "1" for an int) takes the schema path.
+        if type(value) is not self.kind:
+            return False
+        return self.item_kind is None or all(
+            type(item) is self.item_kind for item in typing.cast(List[Any], value)
+        )
+
+
+def _field_check(field: "dataclasses.Field[Any]", hint: Any) -> Optional[_FieldCheck]:
+    nullable = False
+    if typing.get_origin(hint) is typing.Union:
+        args = [arg for arg in typing.get_args(hint) if arg is not type(None)]
+        if len(args) != 1:
+            return None
+        hint, nullable = args[0], True
+    required = (
+        field.default is dataclasses.MISSING
+        and field.default_factory is dataclasses.MISSING
+    )
+    if hint in (str, int, float, bool):
+        return _FieldCheck(field.name, hint, required, nullable)
+    if typing.get_origin(hint) in (list, List):
+        (item,) = typing.get_args(hint)
+        if item in (str, int, float, bool):
+            return _FieldCheck(field.name, list, required, nullable, item)
+    return None
+
+
+class RequestLoader(Generic[T]):
+    """Loads a request dataclass from decoded JSON.
+
+    The desert schema is built once. Payloads whose fields already have
+    exactly the declared types are turned into the dataclass directly; any
+    other payload goes through the schema, which converts what it can and
+    raises the usual ``ValidationError`` with per-field messages. Unknown
+    keys are ignored either way.
+    """
+
+    def __init__(self, cls: Type[T]):
+        self.cls = cls
+        self.schema = desert.schema(cls, meta={"unknown": EXCLUDE})
+        hints = typing.get_type_hints(cls)
+        checks = [
+            _field_check(field, hints[field.name])
+            for field in dataclasses.fields(typing.cast(Any, cls))
+        ]
+        self._checks: Optional[Tuple[_FieldCheck, ...]] = None
+        if all(check is not None for check in checks):
+            self._checks = tuple(check for check in checks if check is not None)
+
+    def _fast_kwargs(self, data: Any) -> Optional[Dict[str, Any]]:
+        if self._checks is None or type(data) is not dict:
+            return None
+        kwargs = {}
+        for check in self._checks:
+            value = data.get(check.name, _MISSING)
+            if value is _MISSING:
+                if check.required:
+                    return None
+                continue
+            if not check.accepts(value):
+                return None
+            kwargs[check.name] = value
+        return kwargs
+
+    def load(self, data: Any) -> T:
+        kwargs = self._fast_kwargs(data)
+        if kwargs is not None:
+            return self.cls(**kwargs)
+        return typing.cast(T, self.schema.load(data))
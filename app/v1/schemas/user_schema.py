@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
 
 
 @dataclass
@@ -7,3 +7,36 @@ class UserUpdateRequest:
     first_name: Optional[str] = None
     last_name: Optional[str] = None
     phone_number: Optional[str] = None
+
+
+@dataclass
+class UserListQuery:
+    limit: int = 50
+    cursor: Optional[str] = None
+    is_active: Optional[bool] = None
+    is_admin: Optional[bool] = None
+    is_email_verified: Optional[bool] = None
+    email_prefix: Optional[str] = None
+
+
+@dataclass
+class UserChangesQuery:
+    limit: int = 100
+    cursor: Optional[str] = None
+
+
+@dataclass
+class BatchGetUsersRequest:
+    ids: List[int]
+
+
+@dataclass
+class PasswordChangeRequest:
+    current_password: str
+    new_password: str
+
+
+@dataclass
+class UserAccessRequest:
+    is_active: Optional[bool] = None
+    is_admin: Optional[bool] = None
@@ -1,16 +1,19 @@
 import secrets
 from typing import Optional
 
-from flask_jwt_extended import create_access_token
+from flask_jwt_extended import create_access_token, create_refresh_token
 from sqlalchemy.orm.scoping import scoped_session
-from werkzeug.security import check_password_hash, generate_password_hash
 
+from app.core.cache import CacheBackend
 from app.core.error_handlers import (
     ErrorVerifyingEmailException,
     ValidationException,
 )
-from app.v1.events.email_publisher import EmailPublisher
+from app.core.password_hasher import password_hasher
+from app.core.token_denylist import token_denylist
+from app.v1.events.email_publisher import EmailPublisher, get_email_publisher
 from app.v1.models import User
+from app.v1.repositories.outbox_repository import OutboxRepository
 from app.v1.repositories.user_repository import UserRepository
 from app.v1.schemas.auth_schema import (
     AuthResponse,
@@ -22,49 +25,111 @@ from app.v1.schemas.email_schema import EmailMessage
 
 class AuthService:
     def __init__(
-        self, session: scoped_session, rabbitmq_url: str, frontend_base_url: str
+        self,
+        session: scoped_session,
+        rabbitmq_url: str,
+        frontend_base_url: str,
+        email_publisher: Optional[EmailPublisher] = None,
+        profile_cache: Optional[CacheBackend] = None,
     ):
-        self.user_repo = UserRepository(session)
+        self.session = session
+        self.user_repo = UserRepository(session, cache=profile_cache)
+        self.outbox_repo = OutboxRepository(session)
         self.rabbitmq_url = rabbitmq_url
         self.frontend_base_url = frontend_base_url
+        self.email_publisher = email_publisher or get_email_publisher(rabbitmq_url)
 
     def register_user(self, req_data: RegisterRequest) -> None:
-        existing_user = self.user_repo.get_user_by_email(req_data.email)
-        if existing_user:
-            raise ValidationException("User already exists")
-
         # Hash the password before storing it
-        hashed_password = generate_password_hash(req_data.password)
+        self.create_registration(req_data, password_hasher.hash(req_data.password))
+
+    def create_registration(
+        self, req_data: RegisterRequest, hashed_password: str
+    ) -> None:
+        """The database half of ``register_user``, for callers that run the
+        KDF elsewhere (the ASGI app hashes in a worker thread)."""
+        # No existence check: create_user maps the unique-email violation to
+        # ValidationException, which saves a round trip on every signup.
         verification_token = secrets.token_urlsafe(32)
         try:
             req_data.password = hashed_password
+            # Staged in the session so create_user commits it with the user row;
+            # the outbox relay publishes it to the broker afterwards.
+            self.enqueue_verification_email(
+                email=req_data.email,
+                full_name=f"{req_data.first_name} {req_data.last_name}".strip(),
+                token=verification_token,
+            )
             user: Optional[User] = self.user_repo.create_user(
                 req_data, verification_token
             )
             if not user:
                 raise ValueError("Something went wrong")
 
-            self.send_verification_email(
-                email=user.email, full_name=user.full_name, token=verification_token
-            )
-
+        except ValidationException:
+            raise
         except Exception as e:
             raise Exception(f"Error registering user: {str(e)}")
 
     def authenticate_user(self, req_data: LoginRequest) -> AuthResponse:
-        user: Optional[User] = self.user_repo.get_user_by_email(req_data.email)
-        if (
-            not user
-            or not check_password_hash(user.password_hash, req_data.password)
-            or (user and not user.is_email_verified)
-        ):
+        user = self.find_login_user(req_data.email)
+        verified, new_hash = password_hasher.verify_and_update(
+            req_data.password, user.password_hash
+        )
+        return self.complete_login(user, verified, new_hash)
+
+    def find_login_user(self, email: str) -> User:
+        user: Optional[User] = self.user_repo.get_user_by_email(email)
+        if not user:
+            raise ValueError("Invalid credentials")
+        return user
+
+    def complete_login(
+        self, user: User, verified: bool, new_hash: Optional[str]
+    ) -> AuthResponse:
+        """Issue tokens once the password has been checked against ``user``."""
+        if not verified or not user.is_email_verified or not user.is_active:
             raise ValueError("Invalid credentials")
 
-        # Generate JWT token
-        token = create_access_token(
-            identity=str(user.id), additional_claims={"email": user.email}
+        if new_hash:
+            # Stored with an outdated scheme or cost; upgrade it transparently.
+            self.user_repo.update_password_hash(user.id, new_hash)
+
+        return self.issue_tokens(user)
+
+    def issue_tokens(self, user: User) -> AuthResponse:
+        claims = {
+            "email": user.email,
+            "ver": user.token_version,
+            "adm": user.is_admin,
+        }
+        return AuthResponse(
+            access_token=create_access_token(
+                identity=str(user.id), additional_claims=claims
+            ),
+            refresh_token=create_refresh_token(
+                identity=str(user.id), additional_claims=claims
+            ),
         )
-        return AuthResponse(access_token=token)
+
+    def refresh_tokens(
+        self, user_id: int, refresh_jti: str, expires_at: float
+    ) -> AuthResponse:
+        """Rotate a refresh token: the presented one is revoked and a new
+        access/refresh pair is issued with the user's current claims.
+
+        Revoking is an INSERT keyed by the jti, so when the same refresh
+        token is presented twice at once only one request gets new tokens.
+        """
+        user: Optional[User] = self.user_repo.get_user_by_id(user_id)
+        if not user or not user.is_active:
+            raise ValueError("Invalid credentials")
+        if not token_denylist.revoke(self.session, refresh_jti, expires_at):
+            raise ValueError("Token has been revoked")
+        return self.issue_tokens(user)
+
+    def revoke_token(self, jti: str, expires_at: float) -> None:
+        token_denylist.revoke(self.session, jti, expires_at)
 
     def verify_email(self, token: str) -> None:
         try:
@@ -72,13 +137,18 @@ class AuthService:
         except Exception as e:
             raise ErrorVerifyingEmailException(f"Error verifying email: {str(e)}")
 
-    def send_verification_email(self, email: str, full_name: str, token: str) -> None:
+    def build_verification_email(
+        self, email: str, full_name: str, token: str
+    ) -> EmailMessage:
         link = f"{self.frontend_base_url}/v1/users/verify-email?token={token}"
         subject = "Verify your account"
         body = f"Click the link to verify: {link}"
-        publisher = EmailPublisher(self.rabbitmq_url)
-        publisher.publish_email(
-            EmailMessage(
-                to_email=email, full_name=full_name, subject=subject, body=body
-            )
+        return EmailMessage(
+            to_email=email, full_name=full_name, subject=subject, body=body
         )
+
+    def enqueue_verification_email(
+        self, email: str, full_name: str, token: str
+    ) -> None:
+        message = self.build_verification_email(email, full_name, token)
+        self.outbox_repo.add(self.email_publisher.build_message(message))
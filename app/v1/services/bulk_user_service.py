@@ -0,0 +1,209 @@
+import itertools
+import logging
+import secrets
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+import pytz
+from sqlalchemy import Row
+from sqlalchemy.orm.scoping import scoped_session
+
+from app.core.password_hasher import PasswordHasher
+from app.v1.events.email_publisher import EmailPublisher
+from app.v1.repositories.outbox_repository import OutboxRepository
+from app.v1.repositories.user_repository import (
+    UserRepository,
+    normalize_email,
+    verification_token_digest,
+)
+from app.v1.services.auth_service import AuthService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ImportStats:
+    read: int = 0
+    inserted: int = 0
+    skipped: int = 0
+    invalid: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def rows_per_second(self) -> float:
+        elapsed = time.monotonic() - self.started_at
+        return self.read / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "read": self.read,
+            "inserted": self.inserted,
+            "skipped": self.skipped,
+            "invalid": self.invalid,
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+def chunked(records: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(records)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+class BulkUserService:
+    """Imports users in chunks of one multi-row INSERT and one commit each,
+    and exports them as a stream of rows.
+
+    Input records need an ``email`` and either a ``password`` (hashed here,
+    across ``hasher``'s process pool) or a ``password_hash`` in a scheme
+    PasswordHasher can verify, which is stored as is and upgraded on the
+    user's next login. Anything else, including records that are not
+    mappings, is logged and counted as invalid.
+    """
+
+    def __init__(
+        self,
+        session: scoped_session,
+        rabbitmq_url: str,
+        frontend_base_url: str,
+        email_publisher: EmailPublisher,
+        hasher: PasswordHasher,
+    ):
+        self.session = session
+        self.user_repo = UserRepository(session)
+        self.outbox_repo = OutboxRepository(session)
+        self.auth_service = AuthService(
+            session, rabbitmq_url, frontend_base_url, email_publisher
+        )
+        self.email_publisher = email_publisher
+        self.hasher = hasher
+
+    def import_users(
+        self,
+        records: Iterable[Any],
+        chunk_size: int = 1000,
+        verified: bool = False,
+        on_chunk: Optional[Callable[[ImportStats], None]] = None,
+    ) -> ImportStats:
+        """Insert ``records``; existing emails are skipped, not updated.
+
+        Unless ``verified``, each inserted user gets a verification token and
+        an email staged in the outbox within the same commit.
+        """
+        stats = ImportStats()
+        for chunk in chunked(records, chunk_size):
+            stats.read += len(chunk)
+            rows, pending, duplicates = self._build_rows(
+                chunk, stats.read - len(chunk), verified
+            )
+            stats.invalid += len(chunk) - len(rows) - duplicates
+            stats.skipped += duplicates
+            if rows:
+                inserted = self.user_repo.bulk_create_users(rows)
+                stats.inserted += len(inserted)
+                stats.skipped += len(rows) - len(inserted)
+                if not verified:
+                    self._enqueue_verification_emails(inserted, pending)
+                self.session.commit()
+            if on_chunk is not None:
+                on_chunk(stats)
+        return stats
+
+    def _build_rows(
+        self, chunk: List[Any], offset: int, verified: bool
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Tuple[str, str]], int]:
+        now = datetime.now(tz=pytz.utc)
+        seen = set()
+        duplicates = 0
+        rows: List[Dict[str, Any]] = []
+        to_hash: List[Tuple[Dict[str, Any], str]] = []
+        # email -> (full name, verification token) for the emails to send.
+        pending: Dict[str, Tuple[str, str]] = {}
+        for number, record in enumerate(chunk, start=offset + 1):
+            if not isinstance(record, Mapping):
+                logger.warning("Record %d: not an object, skipped", number)
+                continue
+            email = normalize_email(str(record.get("email") or ""))
+            password = record.get("password")
+            password_hash = record.get("password_hash")
+            if "@" not in email or not (password or password_hash):
+                logger.warning("Record %d: missing email or password, skipped", number)
+                continue
+            # Stored as is, so it must be a hash login can verify: anything
+            # else would lock the user out, or be a plain-text password.
+            if password_hash and not (
+                isinstance(password_hash, str)
+                and self.hasher.is_known_hash(password_hash)
+            ):
+                logger.warning(
+                    "Record %d: unknown password hash format, skipped", number
+                )
+                continue
+            if email in seen:
+                duplicates += 1
+                continue
+            seen.add(email)
+            row: Dict[str, Any] = {
+                "email": email,
+                "password_hash": password_hash,
+                "first_name": record.get("first_name") or "",
+                "last_name": record.get("last_name") or "",
+                "phone_number": record.get("phone_number") or "",
+                "is_active": True,
+                "is_admin": False,
+                "token_version": 0,
+                "is_email_verified": verified,
+                "verification_token_hash": None,
+                "verification_token_expiry": None,
+            }
+            if not verified:
+                token = secrets.token_urlsafe(32)
+                row["verification_token_hash"] = verification_token_digest(token)
+                row["verification_token_expiry"] = now + timedelta(hours=1)
+                full_name = f"{row['first_name']} {row['last_name']}".strip()
+                pending[email] = (full_name, token)
+            if not password_hash:
+                to_hash.append((row, str(password)))
+            rows.append(row)
+
+        hashes = self.hasher.hash_many([password for _, password in to_hash])
+        for (row, _), hashed in zip(to_hash, hashes):
+            row["password_hash"] = hashed
+        return rows, pending, duplicates
+
+    def _enqueue_verification_emails(
+        self, inserted: List[Tuple[int, str]], pending: Dict[str, Tuple[str, str]]
+    ) -> None:
+        messages = []
+        for _, email in inserted:
+            full_name, token = pending[email]
+            message = self.auth_service.build_verification_email(
+                email, full_name, token
+            )
+            messages.append(self.email_publisher.build_message(message))
+        self.outbox_repo.add_many(messages)
+
+    def export_users(
+        self, batch_size: int = 1000, include_password_hash: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        for row in self.user_repo.iter_users(batch_size, include_password_hash):
+            yield self._export_record(row)
+
+    @staticmethod
+    def _export_record(row: Row) -> Dict[str, Any]:
+        record = row._asdict()
+        if record.get("created_at") is not None:
+            record["created_at"] = record["created_at"].isoformat()
+        return record
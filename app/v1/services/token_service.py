@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+from sqlalchemy.orm.scoping import scoped_session
+
+from app.core.cache import CacheBackend
+from app.v1.repositories.user_repository import UserRepository
+
+
+@dataclass(frozen=True)
+class TokenSubject:
+    id: int
+    token_version: int
+
+
+def token_state_cache_key(user_id: int) -> str:
+    return f"user:token-state:{int(user_id)}"
+
+
+class TokenService:
+    """Decides whether a token's version claim is still current.
+
+    The user's ``(token_version, is_active)`` pair is cached for a short TTL,
+    so most requests are authorised from the claims without a query. The
+    database is consulted only when nothing is cached or the token claims a
+    newer version than the cache knows about.
+    """
+
+    def __init__(self, session: scoped_session, cache: CacheBackend):
+        self.user_repo = UserRepository(session)
+        self.cache = cache
+
+    def _load_state(self, user_id: int) -> Optional[Tuple[int, bool]]:
+        state = self.user_repo.get_token_state(user_id)
+        if state is not None:
+            self.cache.set(token_state_cache_key(user_id), state)
+        return state
+
+    def resolve_subject(self, user_id: int, version: int) -> Optional[TokenSubject]:
+        state: Optional[Tuple[int, bool]] = self.cache.get(
+            token_state_cache_key(user_id)
+        )
+        if state is None or version > state[0]:
+            state = self._load_state(user_id)
+        if state is None:
+            return None
+
+        current_version, is_active = state
+        if version != current_version or not is_active:
+            return None
+        return TokenSubject(id=int(user_id), token_version=current_version)
+
+    def revoke_user_tokens(
+        self, user_id: int, deactivate: bool = False, **changes: Any
+    ) -> bool:
+        """Invalidate every token issued to the user so far, applying
+        ``changes`` to their password hash or flags in the same UPDATE;
+        returns whether the user exists. This worker stops accepting the old
+        tokens at once, others once their cached state expires."""
+        found = self.user_repo.revoke_tokens(user_id, deactivate=deactivate, **changes)
+        self.cache.delete(token_state_cache_key(user_id))
+        return found
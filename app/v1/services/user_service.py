@@ -1,28 +1,169 @@
-from typing import Optional
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
+import pytz
 from sqlalchemy.orm.scoping import scoped_session
 
-from app.core.error_handlers import ErrorCreatingUserException, UserNotFoundException
-from app.v1.models import User
+from app.core.cache import CacheBackend, token_state_cache
+from app.core.error_handlers import (
+    ErrorCreatingUserException,
+    UserNotFoundException,
+    ValidationException,
+)
+from app.core.password_hasher import password_hasher
 from app.v1.repositories.user_repository import UserRepository
-from app.v1.schemas.user_schema import UserUpdateRequest
+from app.v1.schemas.user_schema import (
+    PasswordChangeRequest,
+    UserAccessRequest,
+    UserChangesQuery,
+    UserListQuery,
+    UserUpdateRequest,
+)
+from app.v1.services.token_service import TokenService
+
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(timestamp: datetime, user_id: int) -> str:
+    payload = json.dumps([timestamp.isoformat(), user_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, user_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(timestamp), int(user_id)
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise ValidationException("Invalid cursor") from e
+
+
+@dataclass
+class UserPage:
+    """One page of the admin listing, read lazily so it can be streamed.
+
+    ``next_cursor`` is only known once ``records`` has been exhausted.
+    """
+
+    records: Iterator[Dict[str, Any]]
+    next_cursor: Optional[str] = None
 
 
 class UserService:
-    def __init__(self, session: scoped_session):
-        self.user_repo = UserRepository(session)
+    def __init__(
+        self, session: scoped_session, profile_cache: Optional[CacheBackend] = None
+    ):
+        self.user_repo = UserRepository(session, cache=profile_cache)
+        self.token_service = TokenService(session, token_state_cache)
 
-    def get_user_profile(self, user_id: int) -> User:
+    def get_user_profile(self, user_id: int) -> Dict[str, Any]:
         try:
-            user: Optional[User] = self.user_repo.get_user_by_id(user_id)
-            if not user:
+            profile = self.user_repo.get_user_profile(user_id)
+            if not profile:
                 raise UserNotFoundException()
 
-            return user
+            return profile
         except Exception as e:
             raise ErrorCreatingUserException(f"Error registering user: {str(e)}")
 
-    def update_user(self, user_id: int, data: UserUpdateRequest) -> Optional[User]:
+    def get_user_profiles(
+        self, user_ids: Sequence[int], max_ids: int
+    ) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """Profiles in request order, and the requested ids with no user."""
+        if not user_ids:
+            raise ValidationException("ids must not be empty")
+        if len(user_ids) > max_ids:
+            raise ValidationException(f"At most {max_ids} ids per request")
+        unique_ids = list(dict.fromkeys(user_ids))
+        found = self.user_repo.get_user_profiles(unique_ids)
+        profiles = [found[user_id] for user_id in unique_ids if user_id in found]
+        missing = [user_id for user_id in unique_ids if user_id not in found]
+        return profiles, missing
+
+    def list_users(self, query: UserListQuery) -> UserPage:
+        limit = min(max(query.limit, 1), MAX_PAGE_SIZE)
+        after = decode_cursor(query.cursor) if query.cursor else None
+        page = UserPage(records=iter(()))
+
+        def records() -> Iterator[Dict[str, Any]]:
+            # One extra row tells whether another page follows.
+            last_key: Optional[Tuple[datetime, int]] = None
+            rows = self.user_repo.list_users(query, after, limit + 1)
+            for count, row in enumerate(rows, start=1):
+                if count > limit and last_key is not None:
+                    page.next_cursor = encode_cursor(*last_key)
+                    break
+                last_key = (row.created_at, row.id)
+                record = row._asdict()
+                record["created_at"] = row.created_at.isoformat()
+                yield record
+
+        page.records = records()
+        return page
+
+    def list_changes(
+        self, query: UserChangesQuery, settle_seconds: float
+    ) -> Dict[str, Any]:
+        """Users changed since ``query.cursor``, oldest change first, with
+        the cursor to resume from; it stays put while nothing has changed.
+
+        Changes younger than ``settle_seconds`` wait for a later call:
+        updated_at is stamped when a transaction starts, so one committing
+        late could otherwise land behind a cursor already handed out.
+        """
+        limit = min(max(query.limit, 1), MAX_PAGE_SIZE)
+        after = decode_cursor(query.cursor) if query.cursor else None
+        until = datetime.now(tz=pytz.utc) - timedelta(seconds=settle_seconds)
+        rows = self.user_repo.list_changes(after, until, limit)
+        users = []
+        for row in rows:
+            record = row._asdict()
+            record["updated_at"] = row.updated_at.isoformat()
+            users.append(record)
+        next_cursor = (
+            encode_cursor(rows[-1].updated_at, rows[-1].id) if rows else query.cursor
+        )
+        return {"users": users, "next_cursor": next_cursor}
+
+    def update_user(
+        self, user_id: int, data: UserUpdateRequest
+    ) -> Optional[Dict[str, Any]]:
+        """The updated profile, or None when there is no such user."""
         update_data = data.__dict__
         update_data = {k: v for k, v in update_data.items() if v is not None}
         return self.user_repo.update_user(user_id, **update_data)
+
+    def change_password(self, user_id: int, data: PasswordChangeRequest) -> None:
+        """Replace the password after checking the current one; every token
+        issued before, including the caller's, stops validating."""
+        password_hash = self.get_password_hash(user_id)
+        if not password_hasher.verify(data.current_password, password_hash):
+            raise ValidationException("Current password is incorrect")
+        self.set_password_hash(user_id, password_hasher.hash(data.new_password))
+
+    def get_password_hash(self, user_id: int) -> str:
+        password_hash = self.user_repo.get_password_hash(user_id)
+        if password_hash is None:
+            raise UserNotFoundException()
+        return password_hash
+
+    def set_password_hash(self, user_id: int, password_hash: str) -> None:
+        """The database half of ``change_password``, for callers that run the
+        KDF elsewhere (the ASGI app hashes in a worker thread)."""
+        if not self.token_service.revoke_user_tokens(
+            user_id, password_hash=password_hash
+        ):
+            raise UserNotFoundException()
+
+    def update_access(self, user_id: int, data: UserAccessRequest) -> None:
+        """Activate, deactivate, promote or demote a user, revoking their
+        tokens so none keeps a stale ``adm`` claim or outlives deactivation."""
+        changes = {k: v for k, v in data.__dict__.items() if v is not None}
+        if not changes:
+            raise ValidationException("Nothing to update")
+        if not self.token_service.revoke_user_tokens(user_id, **changes):
+            raise UserNotFoundException()
@@ -0,0 +1,45 @@
+from typing import Any, Callable, TypeVar
+
+from flask import Flask
+from sqlalchemy.orm.scoping import scoped_session
+from starlette.endpoints import HTTPEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+
+T = TypeVar("T")
+
+
+class AsyncAPI(HTTPEndpoint):
+    """Base of the ASGI views, the counterpart of ``MethodView``.
+
+    ``run`` calls the synchronous services on the async database inside
+    the Flask app context they expect (config, JWT, publisher); responses
+    are encoded with the Flask app's JSON provider, as ``jsonify`` does.
+    """
+
+    @staticmethod
+    def flask_app(request: Request) -> Flask:
+        return request.app.state.flask_app
+
+    async def run(self, request: Request, work: Callable[[scoped_session], T]) -> T:
+        flask_app = self.flask_app(request)
+
+        def in_app_context(session: scoped_session) -> T:
+            with flask_app.app_context():
+                return work(session)
+
+        return await request.app.state.db.run(in_app_context)
+
+    async def get_json(self, request: Request) -> Any:
+        """The JSON body, or ``{}`` when it is missing or malformed."""
+        try:
+            return self.flask_app(request).json.loads(await request.body()) or {}
+        except ValueError:
+            return {}
+
+    def json_response(self, request: Request, data: Any, status: int = 200) -> Response:
+        return Response(
+            self.flask_app(request).json.dumps(data),
+            status_code=status,
+            media_type="application/json",
+        )
@@ -0,0 +1,217 @@
+import asyncio
+import logging
+from typing import Any
+
+from flask import current_app
+from marshmallow.exceptions import ValidationError
+from sqlalchemy.orm.scoping import scoped_session
+from starlette.requests import Request
+from starlette.responses import Response
+from werkzeug.exceptions import BadRequest
+
+from app.core.cache import profile_cache
+from app.core.error_handlers import ValidationException
+from app.core.idempotency import (
+    IDEMPOTENCY_KEY_HEADER,
+    IN_FLIGHT_ERROR,
+    KEY_MISMATCH_ERROR,
+    REPLAYED_HEADER,
+    IdempotencyInFlight,
+    IdempotencyKeyMismatch,
+    IdempotentRequest,
+    IdempotentResponse,
+    idempotency_key,
+    idempotency_store,
+)
+from app.core.password_hasher import password_hasher
+from app.core.rate_limiter import login_rate_limiter
+from app.v1.api.async_decorators import jwt_required_async
+from app.v1.services.auth_service import AuthService
+from app.v1.views.async_api import AsyncAPI
+from app.v1.views.auth_view import (
+    REGISTER_SAVED_WORK,
+    REGISTERED_MESSAGE,
+    login_loader,
+    register_loader,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def auth_service(session: scoped_session) -> AuthService:
+    return AuthService(
+        session=session,
+        rabbitmq_url=current_app.config["RABBITMQ_URL"],
+        frontend_base_url=current_app.config["FRONTEND_BASE_URL"],
+        email_publisher=current_app.extensions["email_publisher"],
+        profile_cache=profile_cache,
+    )
+
+
+class AsyncRegisterAPI(AsyncAPI):
+    async def post(self, request: Request) -> Response:
+        """
+        Register a user; a retry carrying the same ``Idempotency-Key`` gets
+        the first response back instead of registering again
+        """
+        post_data = await self.get_json(request)
+        try:
+            key = idempotency_key(request.headers.get(IDEMPOTENCY_KEY_HEADER))
+            idempotent = IdempotentRequest(
+                "register", key, idempotency_store.fingerprint(post_data)
+            )
+            result = await idempotency_store.execute_async(
+                idempotent,
+                lambda: self.register(request, idempotent, post_data),
+                lambda work: self.run(request, work),
+                saved_work=REGISTER_SAVED_WORK,
+            )
+        except ValidationException as e:
+            return self.json_response(request, {"error": str(e)}, 400)
+        except IdempotencyKeyMismatch:
+            return self.json_response(request, {"error": KEY_MISMATCH_ERROR}, 422)
+        except IdempotencyInFlight:
+            return self.json_response(request, {"error": IN_FLIGHT_ERROR}, 409)
+        response = self.json_response(request, result.body, result.status)
+        if result.replayed:
+            response.headers[REPLAYED_HEADER] = "true"
+        return response
+
+    async def register(
+        self, request: Request, idempotent: IdempotentRequest, post_data: Any
+    ) -> IdempotentResponse:
+        try:
+            data = register_loader.load(post_data)
+            # The KDF holds no lock on the event loop: it runs in a thread
+            # (bcrypt releases the GIL), or in the hasher's process pool.
+            hashed_password = await asyncio.to_thread(
+                password_hasher.hash, data.password
+            )
+
+            def create(session: scoped_session) -> IdempotentResponse:
+                # Committed along with the user row, or not at all.
+                registered = idempotency_store.stage(
+                    session, idempotent, IdempotentResponse(REGISTERED_MESSAGE, 201)
+                )
+                auth_service(session).create_registration(data, hashed_password)
+                return registered
+
+            return await self.run(request, create)
+        except ValidationError as e:
+            return IdempotentResponse({"error": e.messages}, 400)
+        except ValidationException as e:
+            # A client error, such as a taken email: replayed to retries.
+            return IdempotentResponse({"error": str(e)}, 400)
+        except Exception as e:
+            logger.error("Error registering user: %s", e)
+            return IdempotentResponse({"error": str(e)}, 500)
+
+
+class AsyncLoginAPI(AsyncAPI):
+    async def post(self, request: Request) -> Response:
+        try:
+            data = login_loader.load(await self.get_json(request))
+
+            # Throttle before the user lookup and password hash are paid for.
+            retry_after = login_rate_limiter.check(
+                {
+                    "ip": request.client.host if request.client else "",
+                    "email": data.email.strip().lower(),
+                }
+            )
+            if retry_after:
+                response = self.json_response(
+                    request,
+                    {"error": "Too many login attempts. Please try again later."},
+                    429,
+                )
+                response.headers["Retry-After"] = str(retry_after)
+                return response
+
+            user = await self.run(
+                request,
+                lambda session: auth_service(session).find_login_user(data.email),
+            )
+            verified, new_hash = await asyncio.to_thread(
+                password_hasher.verify_and_update, data.password, user.password_hash
+            )
+            res_data = await self.run(
+                request,
+                lambda session: auth_service(session).complete_login(
+                    user, verified, new_hash
+                ),
+            )
+            return self.json_response(
+                request,
+                {
+                    "message": "User registered successfully",
+                    "access_token": res_data.access_token,
+                    "refresh_token": res_data.refresh_token,
+                    "token_type": res_data.token_type,
+                },
+            )
+        except ValidationError as e:
+            return self.json_response(request, {"error": e.messages}, 400)
+        except Exception as e:
+            return self.json_response(request, {"error": str(e)}, 500)
+
+
+class AsyncVerifyEmailAPI(AsyncAPI):
+    async def get(self, request: Request) -> Response:
+        """Verify user email from token"""
+        try:
+            token = request.query_params.get("token")
+            if not token:
+                raise BadRequest("Missing token")
+
+            await self.run(
+                request, lambda session: auth_service(session).verify_email(token)
+            )
+            return self.json_response(
+                request, {"message": "Email verified successfully"}
+            )
+
+        except ValidationError as e:
+            return self.json_response(request, {"error": e.messages}, 400)
+        except Exception as e:
+            return self.json_response(request, {"error": str(e)}, 500)
+
+
+class AsyncRefreshAPI(AsyncAPI):
+    @jwt_required_async(refresh=True)
+    async def post(self, request: Request) -> Response:
+        """Exchange a refresh token for a new access/refresh pair"""
+        claims = request.state.jwt
+        try:
+            res_data = await self.run(
+                request,
+                lambda session: auth_service(session).refresh_tokens(
+                    int(claims["sub"]), claims["jti"], claims["exp"]
+                ),
+            )
+            return self.json_response(
+                request,
+                {
+                    "access_token": res_data.access_token,
+                    "refresh_token": res_data.refresh_token,
+                    "token_type": res_data.token_type,
+                },
+            )
+        except ValueError as e:
+            return self.json_response(request, {"error": str(e)}, 401)
+        except Exception as e:
+            return self.json_response(request, {"error": str(e)}, 500)
+
+
+class AsyncLogoutAPI(AsyncAPI):
+    @jwt_required_async(verify_type=False)
+    async def post(self, request: Request) -> Response:
+        """Revoke the presented access or refresh token"""
+        claims = request.state.jwt
+        await self.run(
+            request,
+            lambda session: auth_service(session).revoke_token(
+                claims["jti"], claims["exp"]
+            ),
+        )
+        return self.json_response(request, {"message": "Token revoked"})
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+from typing import Any, Dict
+
+from marshmallow.exceptions import ValidationError
+from sqlalchemy.orm.scoping import scoped_session
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.cache import profile_cache
+from app.core.error_handlers import UserNotFoundException, ValidationException
+from app.core.password_hasher import password_hasher
+from app.v1.api.async_decorators import jwt_required_async
+from app.v1.schemas.user_schema import UserListQuery
+from app.v1.services.user_service import UserService
+from app.v1.views.async_api import AsyncAPI
+from app.v1.views.user_view import (
+    access_loader,
+    list_query_loader,
+    password_change_loader,
+    update_loader,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def list_users_page(session: scoped_session, query: UserListQuery) -> Dict[str, Any]:
+    # The records are read lazily through the session, so the page is
+    # collected before the session closes; it holds at most MAX_PAGE_SIZE.
+    page = UserService(session=session).list_users(query)
+    users = list(page.records)
+    return {"users": users, "next_cursor": page.next_cursor}
+
+
+class AsyncProfileAPI(AsyncAPI):
+    @jwt_required_async()
+    async def get(self, request: Request) -> Response:
+        """
+        Get the current user's profile based on JWT authentication
+        """
+        user_id = int(request.state.jwt["sub"])
+        try:
+            profile = await self.run(
+                request,
+                lambda session: UserService(
+                    session=session, profile_cache=profile_cache
+                ).get_user_profile(user_id=user_id),
+            )
+            return self.json_response(request, profile)
+        except UserNotFoundException:
+            return self.json_response(request, {"error": "User not found"}, 404)
+
+    @jwt_required_async()
+    async def put(self, request: Request) -> Response:
+        user_id = int(request.state.jwt["sub"])
+        try:
+            update_data = update_loader.load(await self.get_json(request))
+            user = await self.run(
+                request,
+                lambda session: UserService(
+                    session=session, profile_cache=profile_cache
+                ).update_user(user_id, update_data),
+            )
+            if not user:
+                return self.json_response(request, {"message": "User not found"}, 404)
+            return self.json_response(
+                request, {"message": "User updated successfully", "user": user}
+            )
+        except Exception as e:
+            logger.error(f"Error updating user: {e}")
+            return self.json_response(request, {"message": "Error updating user"}, 500)
+
+
+class AsyncUserListAPI(AsyncAPI):
+    @jwt_required_async(admin=True)
+    async def get(self, request: Request) -> Response:
+        """
+        List users newest first; pass ``next_cursor`` back as ``cursor``
+        for the following page
+        """
+        try:
+            query = list_query_loader.load(dict(request.query_params))
+            page = await self.run(
+                request, lambda session: list_users_page(session, query)
+            )
+        except ValidationError as e:
+            return self.json_response(request, {"error": e.messages}, 400)
+        except ValidationException as e:
+            return self.json_response(request, {"error": str(e)}, 400)
+        return self.json_response(request, page)
+
+
+class AsyncPasswordAPI(AsyncAPI):
+    @jwt_required_async()
+    async def put(self, request: Request) -> Response:
+        """
+        Change the current user's password; every token issued so far,
+        this one included, is revoked, so the user signs in again
+        """
+        user_id = int(request.state.jwt["sub"])
+        try:
+            data = password_change_loader.load(await self.get_json(request))
+            password_hash = await self.run(
+                request,
+                lambda session: UserService(session=session).get_password_hash(user_id),
+            )
+            # Both KDF calls run off the event loop, as in register and login.
+            if not await asyncio.to_thread(
+                password_hasher.verify, data.current_password, password_hash
+            ):
+                raise ValidationException("Current password is incorrect")
+            new_hash = await asyncio.to_thread(password_hasher.hash, data.new_password)
+            await self.run(
+                request,
+                lambda session: UserService(session=session).set_password_hash(
+                    user_id, new_hash
+                ),
+            )
+        except ValidationError as e:
+            return self.json_response(request, {"error": e.messages}, 400)
+        except ValidationException as e:
+            return self.json_response(request, {"error": str(e)}, 400)
+        except UserNotFoundException:
+            return self.json_response(request, {"error": "User not found"}, 404)
+        return self.json_response(request, {"message": "Password changed successfully"})
+
+
+class AsyncUserAccessAPI(AsyncAPI):
+    @jwt_required_async(admin=True)
+    async def patch(self, request: Request) -> Response:
+        """
+        Set a user's ``is_active`` and ``is_admin`` flags; the user's tokens
+        are revoked so they sign in again with the new claims
+        """
+        user_id = request.path_params["user_id"]
+        try:
+            data = access_loader.load(await self.get_json(request))
+            await self.run(
+                request,
+                lambda session: UserService(session=session).update_access(
+                    user_id, data
+                ),
+            )
+        except ValidationError as e:
+            return self.json_response(request, {"error": e.messages}, 400)
+        except ValidationException as e:
+            return self.json_response(request, {"error": str(e)}, 400)
+        except UserNotFoundException:
+            return self.json_response(request, {"error": "User not found"}, 404)
+        return self.json_response(request, {"message": "User updated successfully"})
@@ -1,14 +1,44 @@
-import desert
+import logging
+from typing import Any
+
 from flask import Response, current_app, jsonify, request
 from flask.views import MethodView
-from marshmallow import EXCLUDE
+from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
 from marshmallow.exceptions import ValidationError
 from werkzeug.exceptions import BadRequest
 
+from app.core.cache import profile_cache
+from app.core.error_handlers import ValidationException
+from app.core.idempotency import (
+    IDEMPOTENCY_KEY_HEADER,
+    IN_FLIGHT_ERROR,
+    KEY_MISMATCH_ERROR,
+    REPLAYED_HEADER,
+    IdempotencyInFlight,
+    IdempotencyKeyMismatch,
+    IdempotentRequest,
+    IdempotentResponse,
+    idempotency_key,
+    idempotency_store,
+)
+from app.core.rate_limiter import login_rate_limiter
 from app.db.database import db
 from app.v1.schemas.auth_schema import LoginRequest, RegisterRequest
+from app.v1.schemas.loader import RequestLoader
 from app.v1.services.auth_service import AuthService
 
+logger = logging.getLogger(__name__)
+
+register_loader = RequestLoader(RegisterRequest)
+login_loader = RequestLoader(LoginRequest)
+
+# What a replayed or coalesced registration does not redo.
+REGISTER_SAVED_WORK = ("password_hash", "verification_email")
+REGISTERED_MESSAGE = {
+    "message": "Your email has been successfully registered. "
+    "Please check your email to verify email",
+}
+
 
 class RegisterAPI(MethodView):
     def __init__(self) -> None:
@@ -16,28 +46,57 @@ class RegisterAPI(MethodView):
             session=db.session,
             rabbitmq_url=current_app.config["RABBITMQ_URL"],
             frontend_base_url=current_app.config["FRONTEND_BASE_URL"],
+            email_publisher=current_app.extensions["email_publisher"],
+            profile_cache=profile_cache,
         )
 
     def post(self) -> tuple[Response, int]:
+        """
+        Register a user; a retry carrying the same ``Idempotency-Key`` gets
+        the first response back instead of registering again
+        """
+        post_data = request.get_json(silent=True) or {}
         try:
-            post_data = request.get_json(silent=True) or {}
-            schema = desert.schema(RegisterRequest, meta={"unknown": EXCLUDE})
-            data = schema.load(post_data)
-            self.service.register_user(data)
-            return (
-                jsonify(
-                    {
-                        "message": "Your email has been successfully registered. "
-                        "Please check your email to verify email",
-                    }
-                ),
-                201,
+            key = idempotency_key(request.headers.get(IDEMPOTENCY_KEY_HEADER))
+            idempotent = IdempotentRequest(
+                "register", key, idempotency_store.fingerprint(post_data)
             )
+            result = idempotency_store.execute(
+                idempotent,
+                lambda: self.register(idempotent, post_data),
+                db.session,
+                saved_work=REGISTER_SAVED_WORK,
+            )
+        except ValidationException as e:
+            return jsonify({"error": str(e)}), 400
+        except IdempotencyKeyMismatch:
+            return jsonify({"error": KEY_MISMATCH_ERROR}), 422
+        except IdempotencyInFlight:
+            return jsonify({"error": IN_FLIGHT_ERROR}), 409
+        response = jsonify(result.body)
+        if result.replayed:
+            response.headers[REPLAYED_HEADER] = "true"
+        return response, result.status
+
+    def register(
+        self, idempotent: IdempotentRequest, post_data: Any
+    ) -> IdempotentResponse:
+        try:
+            data = register_loader.load(post_data)
+            # Committed along with the user row by register_user, or not at all.
+            registered = idempotency_store.stage(
+                db.session, idempotent, IdempotentResponse(REGISTERED_MESSAGE, 201)
+            )
+            self.service.register_user(data)
+            return registered
         except ValidationError as e:
-            return jsonify({"error": e.messages}), 400
+            return IdempotentResponse({"error": e.messages}, 400)
+        except ValidationException as e:
+            # A client error, such as a taken email: replayed to retries.
+            return IdempotentResponse({"error": str(e)}, 400)
         except Exception as e:
-            print("error", str(e))
-            return jsonify({"error": str(e)}), 500
+            logger.error("Error registering user: %s", e)
+            return IdempotentResponse({"error": str(e)}, 500)
 
 
 class LoginAPI(MethodView):
@@ -46,13 +105,25 @@ class LoginAPI(MethodView):
             session=db.session,
             rabbitmq_url=current_app.config["RABBITMQ_URL"],
             frontend_base_url=current_app.config["FRONTEND_BASE_URL"],
+            email_publisher=current_app.extensions["email_publisher"],
+            profile_cache=profile_cache,
         )
 
     def post(self) -> tuple[Response, int]:
         try:
             post_data = request.get_json(silent=True) or {}
-            schema = desert.schema(LoginRequest, meta={"unknown": EXCLUDE})
-            data = schema.load(post_data)
+            data = login_loader.load(post_data)
+
+            # Throttle before the user lookup and password hash are paid for.
+            retry_after = login_rate_limiter.check(
+                {"ip": request.remote_addr or "", "email": data.email.strip().lower()}
+            )
+            if retry_after:
+                response = jsonify(
+                    {"error": "Too many login attempts. Please try again later."}
+                )
+                response.headers["Retry-After"] = str(retry_after)
+                return response, 429
 
             res_data = self.service.authenticate_user(data)
             return (
@@ -60,6 +131,7 @@ class LoginAPI(MethodView):
                     {
                         "message": "User registered successfully",
                         "access_token": res_data.access_token,
+                        "refresh_token": res_data.refresh_token,
                         "token_type": res_data.token_type,
                     }
                 ),
@@ -77,6 +149,8 @@ class VerifyEmailAPI(MethodView):
             session=db.session,
             rabbitmq_url=current_app.config["RABBITMQ_URL"],
             frontend_base_url=current_app.config["FRONTEND_BASE_URL"],
+            email_publisher=current_app.extensions["email_publisher"],
+            profile_cache=profile_cache,
         )
 
     def get(self) -> tuple[Response, int]:
@@ -93,3 +167,55 @@ class VerifyEmailAPI(MethodView):
             return jsonify({"error": e.messages}), 400
         except Exception as e:
             return jsonify({"error": str(e)}), 500
+
+
+class RefreshAPI(MethodView):
+    def __init__(self) -> None:
+        self.service = AuthService(
+            session=db.session,
+            rabbitmq_url=current_app.config["RABBITMQ_URL"],
+            frontend_base_url=current_app.config["FRONTEND_BASE_URL"],
+            email_publisher=current_app.extensions["email_publisher"],
+            profile_cache=profile_cache,
+        )
+
+    @jwt_required(refresh=True)
+    def post(self) -> tuple[Response, int]:
+        """Exchange a refresh token for a new access/refresh pair"""
+        try:
+            claims = get_jwt()
+            res_data = self.service.refresh_tokens(
+                int(get_jwt_identity()), claims["jti"], claims["exp"]
+            )
+            return (
+                jsonify(
+                    {
+                        "access_token": res_data.access_token,
+                        "refresh_token": res_data.refresh_token,
+                        "token_type": res_data.token_type,
+                    }
+                ),
+                200,
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 401
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+
+class LogoutAPI(MethodView):
+    def __init__(self) -> None:
+        self.service = AuthService(
+            session=db.session,
+            rabbitmq_url=current_app.config["RABBITMQ_URL"],
+            frontend_base_url=current_app.config["FRONTEND_BASE_URL"],
+            email_publisher=current_app.extensions["email_publisher"],
+            profile_cache=profile_cache,
+        )
+
+    @jwt_required(verify_type=False)
+    def post(self) -> tuple[Response, int]:
+        """Revoke the presented access or refresh token"""
+        claims = get_jwt()
+        self.service.revoke_token(claims["jti"], claims["exp"])
+        return jsonify({"message": "Token revoked"}), 200
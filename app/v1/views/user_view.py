@@ -1,22 +1,40 @@
 import logging
+import time
+from typing import Iterator
 
-import desert
-from flask import Response, jsonify, request
+from flask import Response, current_app, jsonify, request, stream_with_context
 from flask.views import MethodView
 from flask_jwt_extended import get_jwt_identity, jwt_required
-from marshmallow import EXCLUDE
+from marshmallow.exceptions import ValidationError
 
-from app.core.error_handlers import UserNotFoundException
+from app.core.cache import profile_cache
+from app.core.error_handlers import UserNotFoundException, ValidationException
 from app.db.database import db
-from app.v1.schemas.user_schema import UserUpdateRequest
-from app.v1.services.user_service import UserService
+from app.v1.api.decorators import admin_required, service_token_required
+from app.v1.schemas.loader import RequestLoader
+from app.v1.schemas.user_schema import (
+    BatchGetUsersRequest,
+    PasswordChangeRequest,
+    UserAccessRequest,
+    UserChangesQuery,
+    UserListQuery,
+    UserUpdateRequest,
+)
+from app.v1.services.user_service import UserPage, UserService
 
 logger = logging.getLogger(__name__)
 
+update_loader = RequestLoader(UserUpdateRequest)
+list_query_loader = RequestLoader(UserListQuery)
+batch_get_loader = RequestLoader(BatchGetUsersRequest)
+changes_query_loader = RequestLoader(UserChangesQuery)
+password_change_loader = RequestLoader(PasswordChangeRequest)
+access_loader = RequestLoader(UserAccessRequest)
+
 
 class ProfileAPI(MethodView):
     def __init__(self) -> None:
-        self.user_service = UserService(session=db.session)
+        self.user_service = UserService(session=db.session, profile_cache=profile_cache)
 
     @jwt_required()
     def get(self) -> tuple[Response, int] | Response:
@@ -25,8 +43,8 @@ class ProfileAPI(MethodView):
         """
         try:
             user_id = get_jwt_identity()
-            user = self.user_service.get_user_profile(user_id=user_id)
-            return jsonify(user.to_dict())
+            profile = self.user_service.get_user_profile(user_id=user_id)
+            return jsonify(profile)
         except UserNotFoundException:
             return jsonify({"error": "User not found"}), 404
 
@@ -35,14 +53,141 @@ class ProfileAPI(MethodView):
         try:
             user_id = get_jwt_identity()
             post_data = request.get_json(silent=True) or {}
-            schema = desert.schema(UserUpdateRequest, meta={"unknown": EXCLUDE})
-            update_data = schema.load(post_data)
+            update_data = update_loader.load(post_data)
             user = self.user_service.update_user(user_id, update_data)
             if not user:
                 return jsonify({"message": "User not found"}), 404
-            return jsonify(
-                {"message": "User updated successfully", "user": user.to_dict()}
-            )
+            return jsonify({"message": "User updated successfully", "user": user})
         except Exception as e:
             logger.error(f"Error updating user: {e}")
             return jsonify({"message": "Error updating user"}), 500
+
+
+class PasswordAPI(MethodView):
+    def __init__(self) -> None:
+        self.user_service = UserService(session=db.session)
+
+    @jwt_required()
+    def put(self) -> tuple[Response, int] | Response:
+        """
+        Change the current user's password; every token issued so far,
+        this one included, is revoked, so the user signs in again
+        """
+        try:
+            data = password_change_loader.load(request.get_json(silent=True) or {})
+            self.user_service.change_password(get_jwt_identity(), data)
+        except ValidationError as e:
+            return jsonify({"error": e.messages}), 400
+        except ValidationException as e:
+            return jsonify({"error": str(e)}), 400
+        except UserNotFoundException:
+            return jsonify({"error": "User not found"}), 404
+        return jsonify({"message": "Password changed successfully"})
+
+
+class UserAccessAPI(MethodView):
+    def __init__(self) -> None:
+        self.user_service = UserService(session=db.session)
+
+    @admin_required
+    def patch(self, user_id: int) -> tuple[Response, int] | Response:
+        """
+        Set a user's ``is_active`` and ``is_admin`` flags; the user's tokens
+        are revoked so they sign in again with the new claims
+        """
+        try:
+            data = access_loader.load(request.get_json(silent=True) or {})
+            self.user_service.update_access(user_id, data)
+        except ValidationError as e:
+            return jsonify({"error": e.messages}), 400
+        except ValidationException as e:
+            return jsonify({"error": str(e)}), 400
+        except UserNotFoundException:
+            return jsonify({"error": "User not found"}), 404
+        return jsonify({"message": "User updated successfully"})
+
+
+def stream_user_page(page: UserPage) -> Iterator[str]:
+    dumps = current_app.json.dumps
+    yield '{"users":['
+    for index, record in enumerate(page.records):
+        yield ("," if index else "") + dumps(record)
+    yield '],"next_cursor":' + dumps(page.next_cursor) + "}"
+
+
+class UserListAPI(MethodView):
+    def __init__(self) -> None:
+        self.user_service = UserService(session=db.session)
+
+    @admin_required
+    def get(self) -> tuple[Response, int] | Response:
+        """
+        List users newest first; pass ``next_cursor`` back as ``cursor``
+        for the following page
+        """
+        try:
+            query = list_query_loader.load(request.args)
+            page = self.user_service.list_users(query)
+        except ValidationError as e:
+            return jsonify({"error": e.messages}), 400
+        except ValidationException as e:
+            return jsonify({"error": str(e)}), 400
+        # Rows are written as they are read, so a large page never has to
+        # fit in memory as one document.
+        return Response(
+            stream_with_context(stream_user_page(page)), mimetype="application/json"
+        )
+
+
+class UserBatchGetAPI(MethodView):
+    def __init__(self) -> None:
+        self.user_service = UserService(session=db.session, profile_cache=profile_cache)
+
+    @service_token_required
+    def post(self) -> tuple[Response, int] | Response:
+        """
+        Profiles for up to INTERNAL_BATCH_MAX_IDS user ids, for other services
+        """
+        started = time.perf_counter()
+        try:
+            batch = batch_get_loader.load(request.get_json(silent=True) or {})
+            profiles, missing = self.user_service.get_user_profiles(
+                batch.ids, current_app.config["INTERNAL_BATCH_MAX_IDS"]
+            )
+        except ValidationError as e:
+            return jsonify({"error": e.messages}), 400
+        except ValidationException as e:
+            return jsonify({"error": str(e)}), 400
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(
+            "Batch profile lookup: %d ids, %d found in %.1f ms",
+            len(batch.ids),
+            len(profiles),
+            elapsed_ms,
+        )
+        response = jsonify({"users": profiles, "missing_ids": missing})
+        response.headers["Server-Timing"] = f"lookup;dur={elapsed_ms:.1f}"
+        return response
+
+
+class UserChangesAPI(MethodView):
+    def __init__(self) -> None:
+        self.user_service = UserService(session=db.session)
+
+    @service_token_required
+    def get(self) -> tuple[Response, int] | Response:
+        """
+        Users changed since ``cursor``, oldest change first, for services
+        catching up on the user events; pass ``next_cursor`` back as
+        ``cursor`` until ``users`` comes back empty
+        """
+        try:
+            query = changes_query_loader.load(request.args)
+            changes = self.user_service.list_changes(
+                query, current_app.config["USER_CHANGES_SETTLE_SECONDS"]
+            )
+        except ValidationError as e:
+            return jsonify({"error": e.messages}), 400
+        except ValidationException as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify(changes)
@@ -0,0 +1,213 @@
+"""Sync (wsgi:app) vs async (asgi:app) serving, side by side.
+
+Seeds ``--users`` verified users into one database (a temporary SQLite file,
+or ``--db-url``), then serves it with each mode in turn under gunicorn, with
+the same number of worker processes, and drives two scenarios at every
+``--concurrency``:
+
+- login: POST /v1/auth/login, a DB lookup plus the password KDF;
+- profile: GET /v1/users/profile, JWT checks plus a cached profile read.
+
+Sync workers are gthread with ``--threads`` threads, i.e. that many
+requests in flight per process; async workers are uvicorn's, serving any
+number on the event loop and handing the KDF to a thread. (``uvicorn
+--workers`` is not used: its supervisor adds ~40 ms to every keep-alive
+request.) The client is one asyncio loop (httpx), so it does not itself cap
+concurrency. Hashing uses ``--hash-rounds`` (bcrypt cost 4 by default) and
+the login rate limiter is off.
+
+Against SQLite a query costs microseconds, so the modes differ mostly in
+per-request overhead; point ``--db-url`` at a networked Postgres to see
+how each one copes with waiting on the database.
+
+    python -m benchmarks.bench_asgi --concurrency 1 16 64 --requests 2000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+import httpx
+
+from app.core.password_hasher import password_hasher
+from benchmarks.harness import (
+    BENCH_JWT_SECRET,
+    auth_headers,
+    create_bench_app,
+    create_verified_user,
+    percentiles,
+)
+
+PASSWORD = "password123"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def server_command(mode: str, port: int, args: argparse.Namespace) -> List[str]:
+    command = [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        "--bind",
+        f"127.0.0.1:{port}",
+        "--workers",
+        str(args.workers),
+        "--log-level",
+        "warning",
+    ]
+    if mode == "sync":
+        return command + [
+            "--worker-class",
+            "gthread",
+            "--threads",
+            str(args.threads),
+            "wsgi:app",
+        ]
+    return command + ["--worker-class", "uvicorn.workers.UvicornWorker", "asgi:app"]
+
+
+@contextmanager
+def serve(mode: str, db_url: str, args: argparse.Namespace) -> Iterator[str]:
+    port = free_port()
+    env = dict(
+        os.environ,
+        DATABASE_URL=db_url,
+        JWT_SECRET_KEY=BENCH_JWT_SECRET,
+        PASSWORD_HASH_ROUNDS=str(args.hash_rounds),
+        RATE_LIMIT_ENABLED="false",
+        SENTRY_DSN="",
+        # Enough connections for every in-flight request of either mode.
+        DB_POOL_SIZE=str(max(args.threads, 10)),
+    )
+    process = subprocess.Popen(
+        server_command(mode, port, args), env=env, stdout=subprocess.DEVNULL
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                httpx.get(f"{base_url}/v1/users/profile", timeout=1)
+                break
+            except httpx.TransportError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"The {mode} server did not start")
+                time.sleep(0.2)
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait()
+
+
+async def drive(
+    base_url: str,
+    requests: List[Tuple[str, str, Dict[str, Any]]],
+    concurrency: int,
+) -> Dict[str, Any]:
+    limits = httpx.Limits(max_connections=concurrency)
+    samples: List[float] = []
+    errors = 0
+    queue = iter(requests)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as c:
+
+        async def client() -> None:
+            nonlocal errors
+            for method, path, kwargs in queue:
+                started = time.perf_counter()
+                try:
+                    response = await c.request(method, path, **kwargs)
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    samples.append(time.perf_counter() - started)
+                else:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    result: Dict[str, Any] = {
+        "requests": len(requests),
+        "errors": errors,
+        "throughput_rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+    }
+    if len(samples) > 1:
+        result.update(percentiles(samples))
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--hash-rounds", type=int, default=4)
+    parser.add_argument("--db-url", default=None)
+    args = parser.parse_args()
+
+    app = create_bench_app(args.db_url)
+    app.config["PASSWORD_HASH_ROUNDS"] = args.hash_rounds
+    password_hasher.init_app(app)
+    db_url = app.config["SQLALCHEMY_DATABASE_URI"]
+    users = [
+        (email, create_verified_user(app, email, PASSWORD))
+        for email in (f"asgi-bench-{i}@example.com" for i in range(args.users))
+    ]
+    rng = random.Random(0)
+    picks = [rng.choice(users) for _ in range(args.requests)]
+    scenarios = {
+        "login": [
+            ("POST", "/v1/auth/login", {"json": {"email": email, "password": PASSWORD}})
+            for email, _ in picks
+        ],
+        "profile": [
+            ("GET", "/v1/users/profile", {"headers": auth_headers(app, user_id)})
+            for _, user_id in picks
+        ],
+    }
+
+    results: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for mode in ("sync", "async"):
+        with serve(mode, db_url, args) as base_url:
+            for scenario, requests in scenarios.items():
+                # Warm the pools and caches of every worker first.
+                asyncio.run(drive(base_url, requests[:200], 8))
+                results.setdefault(scenario, {})[mode] = {
+                    f"c{concurrency}": asyncio.run(
+                        drive(base_url, requests, concurrency)
+                    )
+                    for concurrency in args.concurrency
+                }
+
+    print(
+        json.dumps(
+            {
+                "workers": args.workers,
+                "threads": args.threads,
+                "hash_rounds": args.hash_rounds,
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
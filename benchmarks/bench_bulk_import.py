@@ -0,0 +1,86 @@
+"""Rows/sec and peak traced memory of ``flask users import``/``export``.
+
+Each size writes a JSONL file of pre-hashed users (``--plain`` for
+plain-text passwords, hashed over ``--hash-workers`` processes), imports it
+and exports the table again. Peak memory should not grow with the size.
+
+    python -m benchmarks.bench_bulk_import --sizes 10000 50000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Dict
+
+from app.core.password_hasher import PasswordHasher
+from app.v1.commands.user_commands import build_service, open_path, read_records
+from benchmarks.harness import create_bench_app
+
+
+def write_input(path: str, size: int, plain: bool) -> None:
+    password_hash = PasswordHasher(rounds=4).hash("password123")
+    with open(path, "w", encoding="utf-8") as stream:
+        for i in range(size):
+            record = {
+                "email": f"import-{i}@bench.example.com",
+                "first_name": "Bulk",
+                "last_name": f"User {i}",
+                "phone_number": "+8412345678",
+            }
+            if plain:
+                record["password"] = f"password-{i}"
+            else:
+                record["password_hash"] = password_hash
+            stream.write(json.dumps(record) + "\n")
+
+
+def run(size: int, chunk_size: int, hash_workers: int, plain: bool) -> Dict:
+    app = create_bench_app()
+    app.config["PASSWORD_HASH_ROUNDS"] = 4
+    path = tempfile.mktemp(suffix=".jsonl")
+    write_input(path, size, plain)
+    result: Dict = {"rows": size}
+    with app.app_context():
+        service = build_service(hash_workers)
+        tracemalloc.start()
+        started = time.perf_counter()
+        with open_path(path, "r") as stream:
+            stats = service.import_users(
+                read_records(stream, "jsonl"), chunk_size, verified=False
+            )
+        elapsed = time.perf_counter() - started
+        result["import_rows_per_second"] = round(size / elapsed)
+        result["import_peak_kib"] = tracemalloc.get_traced_memory()[1] // 1024
+        result["inserted"] = stats.inserted
+        service.hasher.shutdown()
+
+        tracemalloc.reset_peak()
+        started = time.perf_counter()
+        exported = sum(1 for _ in service.export_users(chunk_size))
+        elapsed = time.perf_counter() - started
+        result["export_rows_per_second"] = round(exported / elapsed)
+        result["export_peak_kib"] = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+    os.unlink(path)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--hash-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--plain", action="store_true")
+    args = parser.parse_args()
+
+    results = [
+        run(size, args.chunk_size, args.hash_workers, args.plain) for size in args.sizes
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Pool wait under concurrency for several pool sizes.
+
+``--threads`` clients each send ``--requests`` GET /v1/users/profile calls
+with the profile cache off, so every request checks out a connection. For
+each ``size+overflow`` setting the report gives throughput, request
+latency and the pool's checkout wait and timeout counts.
+
+    python -m benchmarks.bench_db_pool --threads 32 --pools 2+0 5+5 16+16
+    python -m benchmarks.bench_db_pool --db-url postgresql+psycopg2://...
+"""
+
+import argparse
+import json
+import threading
+import time
+from typing import Dict, List
+from unittest.mock import patch
+
+from app.core.cache import profile_cache
+from app.db.database import db, pool_stats
+from benchmarks.harness import (
+    auth_headers,
+    create_bench_app,
+    create_verified_user,
+    percentiles,
+)
+from config import DevelopmentConfig
+
+
+def run(db_url: str, pool: str, threads: int, requests: int, timeout: float) -> Dict:
+    size, overflow = (int(part) for part in pool.split("+"))
+    with patch.multiple(
+        DevelopmentConfig,
+        DB_POOL_SIZE=size,
+        DB_MAX_OVERFLOW=overflow,
+        DB_POOL_TIMEOUT=timeout,
+    ):
+        app = create_bench_app(db_url)
+    profile_cache.max_size = 0
+    email = f"pool-{size}-{overflow}@bench.example.com"
+    headers = auth_headers(app, create_verified_user(app, email))
+    client = app.test_client()
+
+    samples: List[float] = []
+    errors: List[int] = []
+    lock = threading.Lock()
+
+    def worker() -> None:
+        local, failed = [], 0
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = client.get("/v1/users/profile", headers=headers)
+            local.append(time.perf_counter() - started)
+            failed += response.status_code != 200
+        with lock:
+            samples.extend(local)
+            errors.append(failed)
+
+    with app.app_context():
+        engine = db.engine
+        engine.dispose()
+        started = time.perf_counter()
+        clients = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in clients:
+            thread.start()
+        for thread in clients:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        stats = pool_stats(engine)
+
+    checkouts = stats["checkouts_total"] + stats["timeouts_total"]
+    return {
+        "pool": pool,
+        "requests_per_second": round(len(samples) / elapsed),
+        "errors": sum(errors),
+        **percentiles(samples),
+        "pool_wait_avg_ms": round(stats["wait_seconds_total"] / checkouts * 1000, 3),
+        "pool_wait_max_ms": round(stats["wait_seconds_max"] * 1000, 3),
+        "pool_timeouts": stats["timeouts_total"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--pools", nargs="+", default=["2+0", "5+5", "16+16"])
+    parser.add_argument("--pool-timeout", type=float, default=5.0)
+    parser.add_argument("--db-url", default=None)
+    args = parser.parse_args()
+
+    results = [
+        run(args.db_url, pool, args.threads, args.requests, args.pool_timeout)
+        for pool in args.pools
+    ]
+    print(json.dumps({"threads": args.threads, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Load-test the email worker against a local fake Mailtrap server.
+
+"legacy" sends one message at a time with a fresh HTTP connection per send,
+like the original worker. The other rows run ConcurrentConsumer at increasing
+concurrency with a keep-alive session; prefetch is twice the concurrency.
+
+    python -m benchmarks.bench_email_worker --messages 400 --latency 0.02
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import time
+from types import SimpleNamespace
+from typing import Dict, List
+from unittest.mock import patch
+
+import requests
+
+import email_worker
+from benchmarks.fakes import CountingChannel, FakeMailtrapServer, LoopbackConnection
+
+BODY = json.dumps(
+    {
+        "to_email": "bench@example.com",
+        "full_name": "Bench User",
+        "subject": "Verify your account",
+        "body": "Click the link to verify",
+    }
+).encode()
+
+
+def run_legacy(messages: int) -> float:
+    started = time.perf_counter()
+    for _ in range(messages):
+        email_worker.process_message(BODY, requests.Session())
+    return time.perf_counter() - started
+
+
+def run_concurrent(messages: int, concurrency: int, prefetch: int) -> float:
+    connection = LoopbackConnection()
+    channel = CountingChannel()
+    consumer = email_worker.ConcurrentConsumer(connection, concurrency)
+    delivered = settled = 0
+    started = time.perf_counter()
+    while settled < messages:
+        if delivered < messages and delivered - settled < prefetch:
+            delivered += 1
+            consumer.on_message(
+                channel, SimpleNamespace(delivery_tag=delivered), None, BODY
+            )
+            continue
+        connection.callbacks.get()()
+        settled += 1
+    elapsed = time.perf_counter() - started
+    consumer.shutdown()
+    assert channel.acked == messages
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 32])
+    args = parser.parse_args()
+
+    results: List[Dict] = []
+    with FakeMailtrapServer(latency=args.latency) as server, patch.object(
+        email_worker.config_class, "MAILTRAP_API_URL", server.url
+    ), contextlib.redirect_stdout(io.StringIO()):
+        rows = [("legacy", 1)] + [("concurrent", c) for c in args.concurrency]
+        for mode, concurrency in rows:
+            connections_before = server.connections
+            if mode == "legacy":
+                elapsed = run_legacy(args.messages)
+            else:
+                elapsed = run_concurrent(args.messages, concurrency, concurrency * 2)
+            results.append(
+                {
+                    "mode": mode,
+                    "concurrency": concurrency,
+                    "messages": args.messages,
+                    "seconds": round(elapsed, 3),
+                    "messages_per_sec": round(args.messages / elapsed, 1),
+                    "http_connections": server.connections - connections_before,
+                }
+            )
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
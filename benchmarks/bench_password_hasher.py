@@ -0,0 +1,75 @@
+"""Measure password hashing throughput per core for each scheme and cost.
+
+"inline" hashes on the calling thread; "pool" runs the same work through the
+PasswordHasher process pool with one worker per core. hashes_per_sec_per_core
+is the number to compare against the login rate a single worker must absorb.
+
+    python -m benchmarks.bench_password_hasher --seconds 2
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from app.core.password_hasher import PasswordHasher
+
+SETTINGS = [
+    ("bcrypt", 10),
+    ("bcrypt", 12),
+    ("bcrypt", 13),
+    ("pbkdf2_sha256", 29000),
+    ("pbkdf2_sha256", 600000),
+]
+
+
+def measure(hasher: PasswordHasher, seconds: float, threads: int) -> int:
+    deadline = time.perf_counter() + seconds
+
+    def loop() -> int:
+        count = 0
+        while time.perf_counter() < deadline:
+            hasher.hash("correct horse battery staple")
+            count += 1
+        return count
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return sum(executor.map(lambda _: loop(), range(threads)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--cores", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    results: List[Dict] = []
+    for scheme, rounds in SETTINGS:
+        for mode in ("inline", "pool"):
+            pool_size = args.cores if mode == "pool" else 0
+            hasher = PasswordHasher(scheme, rounds, pool_size=pool_size)
+            threads = args.cores if mode == "pool" else 1
+            # Start every pool worker before timing.
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                list(executor.map(hasher.hash, ["warm up"] * threads))
+            count = measure(hasher, args.seconds, threads)
+            hasher.shutdown()
+            cores = args.cores if mode == "pool" else 1
+            results.append(
+                {
+                    "scheme": scheme,
+                    "rounds": rounds,
+                    "mode": mode,
+                    "hashes_per_sec": round(count / args.seconds, 1),
+                    "hashes_per_sec_per_core": round(count / args.seconds / cores, 1),
+                    "ms_per_hash": round(1000 * args.seconds * threads / count, 2),
+                }
+            )
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
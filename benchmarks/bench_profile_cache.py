@@ -0,0 +1,50 @@
+"""Latency of GET /v1/users/profile with a cold and a warm profile cache.
+
+"cold" clears the cache before every request, so each one runs the ORM query
+and hydrates a User; "warm" serves the cached to_dict() payload.
+
+    python -m benchmarks.bench_profile_cache --requests 2000
+"""
+
+import argparse
+import json
+
+from app.core.cache import profile_cache
+from benchmarks.harness import (
+    auth_headers,
+    create_bench_app,
+    create_verified_user,
+    percentiles,
+    time_calls,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--db-url", default=None)
+    args = parser.parse_args()
+
+    app = create_bench_app(args.db_url)
+    user_id = create_verified_user(app, "profile-bench@example.com")
+    client = app.test_client()
+    headers = auth_headers(app, user_id)
+
+    def get_profile() -> None:
+        response = client.get("/v1/users/profile", headers=headers)
+        assert response.status_code == 200, response.data
+
+    def get_profile_cold() -> None:
+        profile_cache.clear()
+        get_profile()
+
+    get_profile()
+    results = {}
+    for name, call in (("cold", get_profile_cold), ("warm", get_profile)):
+        results[name] = percentiles(time_calls(call, args.requests))
+    results["cache"] = profile_cache.stats()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""CPU time per request spent decoding, validating and encoding JSON.
+
+Runs the payloads of POST /v1/auth/register, POST /v1/auth/login and
+PUT /v1/users/profile through the request/response (de)serialization path
+only (no database, no password hashing), comparing:
+
+- "before": ``desert.schema(...)`` built on every request, stdlib json;
+- "after": the ``RequestLoader`` built once, orjson-backed ``app.json``.
+
+    python -m benchmarks.bench_serialization --iterations 20000
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, Tuple, Type
+
+import desert
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from marshmallow import EXCLUDE
+
+from app.core.json_provider import OrjsonProvider
+from app.v1.schemas.auth_schema import LoginRequest, RegisterRequest
+from app.v1.schemas.loader import RequestLoader
+from app.v1.schemas.user_schema import UserUpdateRequest
+
+PAYLOADS: Dict[str, Tuple[Type[Any], Dict[str, Any], Dict[str, Any]]] = {
+    "register": (
+        RegisterRequest,
+        {
+            "email": "bench@example.com",
+            "password": "password123",
+            "first_name": "Bench",
+            "last_name": "User",
+            "phone_number": "+8412345678",
+        },
+        {
+            "message": "Your email has been successfully registered. "
+            "Please check your email to verify email"
+        },
+    ),
+    "login": (
+        LoginRequest,
+        {"email": "bench@example.com", "password": "password123"},
+        {
+            "message": "User registered successfully",
+            "access_token": "a" * 300,
+            "refresh_token": "r" * 300,
+            "token_type": "bearer",
+        },
+    ),
+    "profile_put": (
+        UserUpdateRequest,
+        {"first_name": "Bench", "last_name": "Updated"},
+        {
+            "message": "User updated successfully",
+            "user": {
+                "id": 1,
+                "email": "bench@example.com",
+                "first_name": "Bench",
+                "last_name": "Updated",
+                "phone_number": "+8412345678",
+            },
+        },
+    ),
+}
+
+
+def cpu_us_per_call(call: Callable[[], None], iterations: int) -> float:
+    call()
+    started = time.process_time()
+    for _ in range(iterations):
+        call()
+    return round((time.process_time() - started) / iterations * 1e6, 2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    before_app, after_app = Flask("before"), Flask("after")
+    before_app.json = DefaultJSONProvider(before_app)
+    after_app.json = OrjsonProvider(after_app)
+
+    results = {}
+    for name, (cls, payload, reply) in PAYLOADS.items():
+        body = json.dumps(payload).encode()
+        loader = RequestLoader(cls)
+
+        def before() -> None:
+            data = before_app.json.loads(body)
+            desert.schema(cls, meta={"unknown": EXCLUDE}).load(data)
+            before_app.json.response(reply).get_data()
+
+        def after() -> None:
+            loader.load(after_app.json.loads(body))
+            after_app.json.response(reply).get_data()
+
+        with before_app.app_context():
+            before_us = cpu_us_per_call(before, args.iterations)
+        with after_app.app_context():
+            after_us = cpu_us_per_call(after, args.iterations)
+        results[name] = {
+            "before_cpu_us": before_us,
+            "after_cpu_us": after_us,
+            "speedup": round(before_us / after_us, 1),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
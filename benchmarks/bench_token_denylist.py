@@ -0,0 +1,101 @@
+"""Cost of the per-request revocation check and memory held by the denylist.
+
+- lookup: ns per is_revoked() for a live (not revoked) jti at several store
+  sizes, against the in-process store and against a stand-in for the
+  database store that charges a round trip, with and without the Bloom front.
+- memory: bytes held after revoking N tokens, and after they all expire.
+
+    python -m benchmarks.bench_token_denylist --sizes 1000 100000 1000000
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+import uuid
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+from app.core.token_denylist import InMemoryDenylistStore, TokenDenylist
+
+
+class RemoteStoreStandIn(InMemoryDenylistStore):
+    def __init__(self, rtt: float):
+        super().__init__()
+        self.rtt = rtt
+
+    def contains(self, session: Any, jti: str) -> bool:
+        time.sleep(self.rtt)
+        return super().contains(session, jti)
+
+
+def ns_per_lookup(denylist: TokenDenylist, lookups: int) -> float:
+    jtis = [str(uuid.uuid4()) for _ in range(lookups)]
+    started = time.perf_counter_ns()
+    for jti in jtis:
+        denylist.is_revoked(None, jti)
+    return (time.perf_counter_ns() - started) / lookups
+
+
+def fill(denylist: TokenDenylist, size: int, expires_at: float) -> None:
+    for _ in range(size):
+        denylist.store.add(None, str(uuid.uuid4()), expires_at)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--rtt", type=float, default=0.0005)
+    args = parser.parse_args()
+
+    expires_at = time.time() + 3600
+    lookups: List[Dict] = []
+    for size in args.sizes:
+        for store_name in ("in-process", "remote"):
+            for use_bloom in (False, True):
+                store = (
+                    InMemoryDenylistStore()
+                    if store_name == "in-process"
+                    else RemoteStoreStandIn(args.rtt)
+                )
+                denylist = TokenDenylist(store)
+                fill(denylist, size, expires_at)
+                denylist.use_bloom = use_bloom
+                denylist.bloom_capacity = max(size, 1000)
+                denylist.sync_interval = 3600
+                denylist.is_revoked(None, "warm-up")
+                lookups.append(
+                    {
+                        "revoked_tokens": size,
+                        "store": store_name,
+                        "bloom": use_bloom,
+                        "ns_per_lookup": round(ns_per_lookup(denylist, args.lookups)),
+                    }
+                )
+
+    memory: List[Dict] = []
+    for size in args.sizes:
+        tracemalloc.start()
+        store = InMemoryDenylistStore()
+        fill(TokenDenylist(store), size, expires_at)
+        held = tracemalloc.get_traced_memory()[0]
+        with patch("app.core.token_denylist.time.time", return_value=expires_at + 1):
+            store.add(None, "after-expiry", expires_at + 3600)
+        after_expiry = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        memory.append(
+            {
+                "revoked_tokens": size,
+                "bytes_live": held,
+                "bytes_per_token": round(held / size),
+                "bytes_after_expiry": after_expiry,
+                "entries_after_expiry": len(store),
+            }
+        )
+
+    print(json.dumps({"lookup": lookups, "memory": memory}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Per-request cost of Sentry tracing at different sample rates.
+
+Times GET /v1/users/profile (warm profile cache) with tracing disabled and
+at SENTRY_TRACES_SAMPLE_RATE 0, 0.01 and 1.0. Events go to a transport that
+drops them, so the numbers cover building spans and envelopes but not the
+network. Each mode runs in a fresh process because sentry_sdk.init is
+process-global.
+
+    python -m benchmarks.bench_trace_sampling --requests 3000
+"""
+
+import argparse
+import functools
+import json
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict
+from unittest.mock import patch
+
+import sentry_sdk
+from sentry_sdk.transport import Transport
+
+from benchmarks.harness import (
+    auth_headers,
+    create_bench_app,
+    create_verified_user,
+    percentiles,
+    time_calls,
+)
+from config import BaseConfig
+
+MODES = {"disabled": None, "rate_0": 0.0, "rate_0.01": 0.01, "rate_1.0": 1.0}
+
+
+class NullTransport(Transport):
+    def __init__(self, options: Any = None):
+        super().__init__(options)
+        self.envelopes = 0
+
+    def capture_envelope(self, envelope: Any) -> None:
+        self.envelopes += 1
+
+
+def run_mode(mode: str, requests: int) -> Dict[str, Any]:
+    rate = MODES[mode]
+    transport = NullTransport()
+    with patch.multiple(
+        BaseConfig,
+        SENTRY_DSN="https://public@sentry.example.invalid/1",
+        SENTRY_TRACING_ENABLED=rate is not None,
+        SENTRY_TRACES_SAMPLE_RATE=rate or 0.0,
+    ), patch.object(
+        sentry_sdk, "init", functools.partial(sentry_sdk.init, transport=transport)
+    ):
+        app = create_bench_app()
+    user_id = create_verified_user(app, "trace-bench@example.com")
+    client = app.test_client()
+    headers = auth_headers(app, user_id)
+
+    def get_profile() -> None:
+        assert client.get("/v1/users/profile", headers=headers).status_code == 200
+
+    time_calls(get_profile, 200)
+    samples = time_calls(get_profile, requests)
+    return {
+        "mean_us": round(statistics.fmean(samples) * 1e6, 1),
+        **percentiles(samples),
+        "envelopes": transport.envelopes,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--mode", choices=list(MODES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.requests)))
+        return
+
+    results = {}
+    for mode in MODES:
+        output = subprocess.run(
+            [sys.executable, "-m", __spec__.name, "--mode", mode]
+            + ["--requests", str(args.requests)],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        results[mode] = json.loads(output.splitlines()[-1])
+    baseline = results["disabled"]["mean_us"]
+    for result in results.values():
+        result["overhead_us"] = round(result["mean_us"] - baseline, 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
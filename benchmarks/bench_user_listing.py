@@ -0,0 +1,113 @@
+"""Latency of GET /v1/users at increasing page depth, against OFFSET.
+
+Seeds ``--users`` rows, then for each page number measures the endpoint
+with the keyset cursor for that page and the equivalent OFFSET query.
+Keyset latency should stay flat while OFFSET grows with the page number.
+
+    python -m benchmarks.bench_user_listing --users 200000 --pages 1 100 1000 3000
+"""
+
+import argparse
+import json
+from datetime import datetime, timedelta
+
+import pytz
+from flask_jwt_extended import create_access_token
+from sqlalchemy import select, text
+
+from app.db.database import db
+from app.v1.models import User
+from app.v1.repositories.user_repository import LISTING_COLUMNS
+from app.v1.services.user_service import encode_cursor
+from benchmarks.harness import create_bench_app, percentiles, time_calls
+
+
+def seed(users: int, chunk_size: int = 10_000) -> None:
+    start = datetime(2024, 1, 1, tzinfo=pytz.utc)
+    for offset in range(0, users, chunk_size):
+        rows = [
+            {
+                "email": f"list-{i}@bench.example.com",
+                "password_hash": "x",
+                "first_name": "Bench",
+                "last_name": "User",
+                "phone_number": "+8412345678",
+                "is_active": True,
+                "is_admin": i == 0,
+                "is_email_verified": i % 3 != 0,
+                "token_version": 0,
+                "created_at": start + timedelta(seconds=i),
+            }
+            for i in range(offset, min(offset + chunk_size, users))
+        ]
+        db.session.execute(User.__table__.insert(), rows)
+        db.session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=200_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 100, 1000, 3000])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--db-url", default=None)
+    args = parser.parse_args()
+
+    app = create_bench_app(args.db_url)
+    client = app.test_client()
+    newest_first = (User.created_at.desc(), User.id.desc())
+    with app.app_context():
+        seed(args.users)
+        db.session.execute(text("ANALYZE"))
+        db.session.commit()
+        admin_id = db.session.scalar(select(User.id).where(User.is_admin))
+        token = create_access_token(
+            identity=str(admin_id), additional_claims={"ver": 0, "adm": True}
+        )
+    headers = {"Authorization": f"Bearer {token}"}
+
+    results = []
+    for page in args.pages:
+        skip = (page - 1) * args.page_size
+        with app.app_context():
+            cursor = None
+            if skip:
+                row = db.session.execute(
+                    select(User.created_at, User.id)
+                    .order_by(*newest_first)
+                    .offset(skip - 1)
+                    .limit(1)
+                ).one()
+                cursor = encode_cursor(row.created_at, row.id)
+
+            def offset_query() -> None:
+                db.session.execute(
+                    select(*LISTING_COLUMNS)
+                    .order_by(*newest_first)
+                    .offset(skip)
+                    .limit(args.page_size)
+                ).all()
+
+            offset_latency = percentiles(time_calls(offset_query, args.requests))
+
+        params = {"limit": args.page_size, **({"cursor": cursor} if cursor else {})}
+
+        def keyset_request() -> None:
+            response = client.get("/v1/users", query_string=params, headers=headers)
+            assert response.status_code == 200, response.data
+            assert len(response.json["users"]) == args.page_size
+
+        results.append(
+            {
+                "page": page,
+                "keyset_endpoint": percentiles(
+                    time_calls(keyset_request, args.requests)
+                ),
+                "offset_query_only": offset_latency,
+            }
+        )
+    print(json.dumps({"users": args.users, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Plan and latency of the email-verification lookup with and without the
+partial index on ``users.verification_token_hash``.
+
+Seeds ``--users`` rows, of which ``--unverified-ratio`` hold a live token,
+then looks up random tokens with the index in place and after dropping it.
+
+    python -m benchmarks.bench_verification_lookup --users 200000
+    python -m benchmarks.bench_verification_lookup --db-url postgresql://...
+"""
+
+import argparse
+import json
+import random
+import secrets
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import pytz
+from sqlalchemy import text
+
+from app.db.database import db
+from app.v1.models import User
+from app.v1.repositories.user_repository import verification_token_digest
+from benchmarks.harness import create_bench_app, percentiles, time_calls
+
+INDEX_NAME = "ix_users_verification_token_hash"
+
+
+def seed(users: int, unverified_ratio: float, chunk_size: int = 10_000) -> List[str]:
+    expiry = datetime.now(tz=pytz.utc) + timedelta(hours=1)
+    tokens = []
+    for start in range(0, users, chunk_size):
+        rows = []
+        for i in range(start, min(start + chunk_size, users)):
+            token_hash = None
+            if random.random() < unverified_ratio:
+                token = secrets.token_urlsafe(32)
+                tokens.append(token)
+                token_hash = verification_token_digest(token)
+            rows.append(
+                {
+                    "email": f"user-{i}@bench.example.com",
+                    "password_hash": "x",
+                    "first_name": "Bench",
+                    "last_name": "User",
+                    "phone_number": "+8412345678",
+                    "is_email_verified": token_hash is None,
+                    "verification_token_hash": token_hash,
+                    "verification_token_expiry": expiry if token_hash else None,
+                }
+            )
+        db.session.execute(User.__table__.insert(), rows)
+        db.session.commit()
+    return tokens
+
+
+def explain(token: str) -> List[str]:
+    statement = (
+        db.session.query(User)
+        .filter_by(verification_token_hash=verification_token_digest(token))
+        .statement.compile(db.engine, compile_kwargs={"literal_binds": True})
+    )
+    if db.engine.dialect.name == "postgresql":
+        return list(db.session.execute(text(f"EXPLAIN {statement}")).scalars())
+    return [
+        row[-1] for row in db.session.execute(text(f"EXPLAIN QUERY PLAN {statement}"))
+    ]
+
+
+def measure(tokens: List[str], lookups: int) -> Dict:
+    def lookup() -> None:
+        token = random.choice(tokens)
+        user = (
+            db.session.query(User)
+            .filter_by(verification_token_hash=verification_token_digest(token))
+            .first()
+        )
+        assert user is not None
+
+    return {
+        "plan": explain(random.choice(tokens)),
+        **percentiles(time_calls(lookup, lookups)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=200_000)
+    parser.add_argument("--unverified-ratio", type=float, default=0.05)
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--db-url", default=None)
+    args = parser.parse_args()
+
+    app = create_bench_app(args.db_url)
+    with app.app_context():
+        tokens = seed(args.users, args.unverified_ratio)
+        db.session.execute(text("ANALYZE users"))
+        db.session.commit()
+        results = {"users": args.users, "live_tokens": len(tokens)}
+        results["indexed"] = measure(tokens, args.lookups)
+
+        db.session.execute(text(f"DROP INDEX {INDEX_NAME}"))
+        db.session.commit()
+        results["unindexed"] = measure(tokens, args.lookups)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Compare two ``benchmarks.load_test`` reports and fail on regressions.
+
+An endpoint regresses when its latency percentile (``--metric``, p95 by
+default) grows, or its throughput drops, by more than ``--threshold``
+relative to the baseline, or when it has more errors than the baseline.
+An endpoint measured in the baseline but missing from the current report,
+or without the metric there, counts as regressed: it failed or was not run.
+Exits with status 1 if any endpoint regressed.
+
+    python -m benchmarks.compare_results base.json head.json --threshold 0.15
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float,
+    metric: str = "p95_ms",
+) -> List[Dict[str, Any]]:
+    rows = []
+    for endpoint, base in baseline["endpoints"].items():
+        if metric not in base:
+            continue
+        head = current["endpoints"].get(endpoint)
+        if head is None or metric not in head:
+            rows.append(
+                {
+                    "endpoint": endpoint,
+                    f"baseline_{metric}": base[metric],
+                    f"current_{metric}": None,
+                    "latency_change": None,
+                    "throughput_change": None,
+                    "regressed": True,
+                }
+            )
+            continue
+        latency_change = head[metric] / base[metric] - 1 if base[metric] else 0.0
+        throughput_change = (
+            head["throughput_rps"] / base["throughput_rps"] - 1
+            if base["throughput_rps"]
+            else 0.0
+        )
+        rows.append(
+            {
+                "endpoint": endpoint,
+                f"baseline_{metric}": base[metric],
+                f"current_{metric}": head[metric],
+                "latency_change": round(latency_change, 3),
+                "throughput_change": round(throughput_change, 3),
+                "regressed": latency_change > threshold
+                or throughput_change < -threshold
+                or head["errors"] > base["errors"],
+            }
+        )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.15)
+    parser.add_argument(
+        "--metric", choices=["p50_ms", "p95_ms", "p99_ms"], default="p95_ms"
+    )
+    args = parser.parse_args()
+
+    rows = compare(
+        load_report(args.baseline),
+        load_report(args.current),
+        args.threshold,
+        args.metric,
+    )
+    print(json.dumps(rows, indent=2))
+    if any(row["regressed"] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Local stand-ins for external dependencies used by the benchmarks."""
+
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class FakeBroker:
+    """Records published messages and simulates network round trips."""
+
+    def __init__(self, rtt: float = 0.001):
+        self.rtt = rtt
+        self.published: List[Tuple[str, str, bytes]] = []
+        self.connections_opened = 0
+        self.round_trips = 0
+
+    def round_trip(self, count: int = 1) -> None:
+        self.round_trips += count
+        if self.rtt:
+            time.sleep(self.rtt * count)
+
+    def connection_factory(self) -> Any:
+        broker = self
+
+        class _Connection(FakeBlockingConnection):
+            def __init__(self, parameters: Any = None):
+                super().__init__(broker, parameters)
+
+        return _Connection
+
+
+class FakeChannel:
+    def __init__(self, broker: FakeBroker):
+        self.broker = broker
+        self.is_open = True
+        self._pending: List[Tuple[str, str, bytes]] = []
+        self._transactional = False
+
+    def queue_declare(self, queue: str, **kwargs: Any) -> None:
+        self.broker.round_trip()
+
+    def tx_select(self) -> None:
+        self._transactional = True
+        self.broker.round_trip()
+
+    def tx_commit(self) -> None:
+        self.broker.published.extend(self._pending)
+        self._pending = []
+        self.broker.round_trip()
+
+    def basic_publish(
+        self, exchange: str, routing_key: str, body: bytes, properties: Any = None
+    ) -> None:
+        message = (exchange, routing_key, body)
+        if self._transactional:
+            self._pending.append(message)
+        else:
+            self.broker.published.append(message)
+
+    def close(self) -> None:
+        self.is_open = False
+
+
+class FakeBlockingConnection:
+    """Mimics the parts of pika.BlockingConnection the service uses."""
+
+    # TCP connect plus connection.start/tune/open exchanges.
+    HANDSHAKE_ROUND_TRIPS = 4
+
+    def __init__(self, broker: FakeBroker, parameters: Any = None):
+        self.broker = broker
+        self.is_open = True
+        self._channel: Optional[FakeChannel] = None
+        broker.connections_opened += 1
+        broker.round_trip(self.HANDSHAKE_ROUND_TRIPS)
+
+    def channel(self) -> FakeChannel:
+        self.broker.round_trip()
+        self._channel = FakeChannel(self.broker)
+        return self._channel
+
+    def process_data_events(self, time_limit: float = 0) -> None:
+        pass
+
+    def close(self) -> None:
+        if self._channel:
+            self._channel.close()
+        self.is_open = False
+        self.broker.round_trip()
+
+
+class FakeMailtrapServer:
+    """Threaded HTTP/1.1 server answering like the Mailtrap send API."""
+
+    def __init__(self, latency: float = 0.02, status: int = 200):
+        self.latency = latency
+        self.status = status
+        self.requests = 0
+        self.connections = 0
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; without this, delayed
+            # ACKs stall every keep-alive response by ~40ms.
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                super().setup()
+                server.connections += 1
+
+            def do_POST(self) -> None:  # noqa: N802
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                payload = b'{"success": true}'
+                self.send_response(server.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host!s}:{port}/api/send"
+
+    def __enter__(self) -> "FakeMailtrapServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class LoopbackConnection:
+    """Collects callbacks scheduled with add_callback_threadsafe so a
+    benchmark loop can run them on its own thread, like pika's ioloop."""
+
+    def __init__(self) -> None:
+        self.callbacks: "queue.Queue[Callable[[], None]]" = queue.Queue()
+
+    def add_callback_threadsafe(self, callback: Callable[[], None]) -> None:
+        self.callbacks.put(callback)
+
+
+class CountingChannel:
+    def __init__(self) -> None:
+        self.acked = 0
+        self.nacked = 0
+
+    def basic_ack(self, delivery_tag: int) -> None:
+        self.acked += 1
+
+    def basic_nack(self, delivery_tag: int, requeue: bool = True) -> None:
+        self.nacked += 1
@@ -0,0 +1,69 @@
+"""Boot the real application against a throwaway SQLite database."""
+
+import os
+import statistics
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+from flask import Flask
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from app.core.password_hasher import password_hasher
+from app.db.database import db
+from app.v1.models import Base, User
+
+BENCH_JWT_SECRET = "benchmark-jwt-secret-0123456789abcdef"
+
+
+def create_bench_app(db_url: Optional[str] = None) -> Flask:
+    if db_url is None:
+        handle, path = tempfile.mkstemp(prefix="user-service-bench-", suffix=".db")
+        os.close(handle)
+        db_url = f"sqlite:///{path}"
+    app = create_app(db_url, testing=True)
+    app.config["JWT_SECRET_KEY"] = BENCH_JWT_SECRET
+    with app.app_context():
+        Base.metadata.create_all(db.engine)
+    return app
+
+
+def create_verified_user(app: Flask, email: str, password: str = "password123") -> int:
+    with app.app_context():
+        user = User()
+        user.email = email
+        user.first_name = "Bench"
+        user.last_name = "User"
+        user.phone_number = "+8412345678"
+        user.is_email_verified = True
+        user.password_hash = password_hasher.hash(password)
+        db.session.add(user)
+        db.session.commit()
+        return user.id
+
+
+def auth_headers(app: Flask, user_id: int) -> Dict[str, str]:
+    with app.app_context():
+        token = create_access_token(identity=str(user_id))
+    return {"Authorization": f"Bearer {token}"}
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/p99 in milliseconds."""
+    ordered = sorted(samples)
+    cuts = statistics.quantiles(ordered, n=100, method="inclusive")
+    return {
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p95_ms": round(cuts[94] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+    }
+
+
+def time_calls(call: Callable[[], None], iterations: int) -> List[float]:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - started)
+    return samples
@@ -9,11 +9,94 @@ class BaseConfig:
 
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "")
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
     JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
     JWT_EXPIRATION_DELTA = timedelta(days=180)
+    # Where revoked tokens are kept: "database" (revoked_tokens, shared by
+    # every worker) or "memory" (this process only, for a single worker).
+    JWT_DENYLIST_STORE = os.getenv("JWT_DENYLIST_STORE", "database")
+    # A Bloom filter in front of the revoked-token store, so tokens that were
+    # never revoked need no query; it is refreshed in the background, and
+    # other workers' revocations take up to JWT_DENYLIST_SYNC_INTERVAL
+    # seconds to be enforced. "false" checks the store on every request.
+    JWT_DENYLIST_BLOOM = os.getenv("JWT_DENYLIST_BLOOM", "true").lower() == "true"
+    JWT_DENYLIST_BLOOM_CAPACITY = int(
+        os.getenv("JWT_DENYLIST_BLOOM_CAPACITY", "100000")
+    )
+    JWT_DENYLIST_SYNC_INTERVAL = float(os.getenv("JWT_DENYLIST_SYNC_INTERVAL", "5"))
+
+    # passlib scheme and cost; existing hashes are upgraded on next login.
+    # The cost is per scheme (bcrypt's log2 rounds, PBKDF2's iterations):
+    # unset, passlib's default for the scheme applies.
+    PASSWORD_HASH_SCHEME = os.getenv("PASSWORD_HASH_SCHEME", "bcrypt")
+    PASSWORD_HASH_ROUNDS = (
+        int(os.environ["PASSWORD_HASH_ROUNDS"])
+        if os.getenv("PASSWORD_HASH_ROUNDS")
+        else None
+    )
+    # Size of the process pool running the KDF; 0 hashes on the request thread.
+    PASSWORD_HASH_POOL_SIZE = int(os.getenv("PASSWORD_HASH_POOL_SIZE", "0"))
+
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    # "<attempts>/<seconds>" over a sliding window.
+    LOGIN_RATE_LIMIT_PER_IP = os.getenv("LOGIN_RATE_LIMIT_PER_IP", "50/60")
+    LOGIN_RATE_LIMIT_PER_EMAIL = os.getenv("LOGIN_RATE_LIMIT_PER_EMAIL", "10/300")
+    # Reverse proxies (e.g. the ALB) in front of the app whose X-Forwarded-For
+    # entries are trusted when resolving the client IP.
+    TRUSTED_PROXY_COUNT = int(os.getenv("TRUSTED_PROXY_COUNT", "0"))
+
+    # Comma-separated bearer tokens accepted on /v1/internal; none disables it.
+    INTERNAL_SERVICE_TOKENS = [
+        token for token in os.getenv("INTERNAL_SERVICE_TOKENS", "").split(",") if token
+    ]
+    INTERNAL_BATCH_MAX_IDS = int(os.getenv("INTERNAL_BATCH_MAX_IDS", "500"))
+    # The change feed leaves out changes younger than this: a transaction that
+    # commits late can carry an updated_at older than rows already served.
+    # Keep it above the longest write transaction.
+    USER_CHANGES_SETTLE_SECONDS = float(os.getenv("USER_CHANGES_SETTLE_SECONDS", "10"))
+
+    # "orjson" (when installed) or "default" for Flask's stdlib json provider.
+    JSON_PROVIDER = os.getenv("JSON_PROVIDER", "orjson")
+
+    PROFILE_CACHE_MAX_SIZE = int(os.getenv("PROFILE_CACHE_MAX_SIZE", "10000"))
+    PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL", "60"))
+
+    # Short: a token revoked in one worker stays valid in the others until then.
+    TOKEN_STATE_CACHE_MAX_SIZE = int(os.getenv("TOKEN_STATE_CACHE_MAX_SIZE", "50000"))
+    TOKEN_STATE_CACHE_TTL = float(os.getenv("TOKEN_STATE_CACHE_TTL", "30"))
+
+    # How long the first response to a request carrying an Idempotency-Key is
+    # replayed to retries with the same key; purge_expired_rows.py
+    # deletes the expired ones.
+    IDEMPOTENCY_KEY_TTL = float(os.getenv("IDEMPOTENCY_KEY_TTL", "86400"))
+    # How long a duplicate waits for the request it joined before a 409.
+    IDEMPOTENCY_WAIT_TIMEOUT = float(os.getenv("IDEMPOTENCY_WAIT_TIMEOUT", "30"))
 
     DATABASE_URL = os.getenv("DATABASE_URL", "")
     TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "")
+    # Comma-separated read replicas for UserRepository's lookups by id/email;
+    # reads that fill the profile cache always go to the primary.
+    DATABASE_REPLICA_URLS = [
+        url for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url
+    ]
+    # Seconds a failed replica is left out before it is health-checked again.
+    DB_REPLICA_HEALTH_INTERVAL = float(os.getenv("DB_REPLICA_HEALTH_INTERVAL", "10"))
+    # Per process, and at least GUNICORN_THREADS. Peak connections to the
+    # database are pods x workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW); keep it
+    # under the server's max_connections (or PgBouncer's pool) with headroom.
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+    # Seconds a request waits for a free connection before failing.
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+    # Connections older than this are replaced when next checked out; keep it
+    # below RDS/PgBouncer connection lifetimes.
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    # 0 disables the server-side limit.
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "5000"))
+    # Connecting through PgBouncer in transaction mode: no startup options
+    # and no server-side prepared statements.
+    DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
 
     MAILTRAP_API_TOKEN = os.getenv("MAILTRAP_API_TOKEN", "")
     MAILTRAP_SENDER_EMAIL = os.getenv("MAILTRAP_SENDER_EMAIL", "no-reply@example.com")
@@ -21,11 +104,51 @@ class BaseConfig:
     MAILTRAP_API_URL = os.getenv(
         "MAILTRAP_API_URL", "https://send.api.mailtrap.io/api/send"
     )
+    MAILTRAP_TIMEOUT = float(os.getenv("MAILTRAP_TIMEOUT", "10"))
 
     RABBITMQ_URL = os.getenv("RABBITMQ_URL", "")
     EMAIL_QUEUE_NAME = os.getenv("EMAIL_QUEUE_NAME", "email_queue")
+    EMAIL_WORKER_CONCURRENCY = int(os.getenv("EMAIL_WORKER_CONCURRENCY", "8"))
+    EMAIL_WORKER_PREFETCH = int(os.getenv("EMAIL_WORKER_PREFETCH", "32"))
+    EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "5"))
+    # Seconds spent in each delay queue, one queue per backoff step.
+    EMAIL_RETRY_DELAYS = [
+        int(delay)
+        for delay in os.getenv("EMAIL_RETRY_DELAYS", "5,25,125,625").split(",")
+    ]
+    RABBITMQ_PUBLISHER_POOL_SIZE = int(os.getenv("RABBITMQ_PUBLISHER_POOL_SIZE", "2"))
+    RABBITMQ_PUBLISHER_CONFIRMS = (
+        os.getenv("RABBITMQ_PUBLISHER_CONFIRMS", "true").lower() == "true"
+    )
+
+    OUTBOX_RELAY_BATCH_SIZE = int(os.getenv("OUTBOX_RELAY_BATCH_SIZE", "100"))
+    OUTBOX_RELAY_IDLE_INTERVAL = float(os.getenv("OUTBOX_RELAY_IDLE_INTERVAL", "1.0"))
+    OUTBOX_RELAY_STATS_INTERVAL = float(
+        os.getenv("OUTBOX_RELAY_STATS_INTERVAL", "60.0")
+    )
+
+    EXPIRED_ROWS_PURGE_BATCH_SIZE = int(
+        os.getenv("EXPIRED_ROWS_PURGE_BATCH_SIZE", "1000")
+    )
 
     SENTRY_DSN = os.getenv("SENTRY_DSN", "")
+    # False turns performance tracing off entirely; errors are still reported.
+    SENTRY_TRACING_ENABLED = (
+        os.getenv("SENTRY_TRACING_ENABLED", "true").lower() == "true"
+    )
+    SENTRY_TRACES_SAMPLE_RATE = float(os.getenv("SENTRY_TRACES_SAMPLE_RATE", "0.01"))
+    # Per-route overrides, "<path prefix>=<rate>,...", e.g. "/v1/auth/login=0.1".
+    SENTRY_TRACES_ROUTE_RATES = os.getenv("SENTRY_TRACES_ROUTE_RATES", "")
+    SENTRY_TRACES_IGNORED_PATHS = [
+        path
+        for path in os.getenv("SENTRY_TRACES_IGNORED_PATHS", "/metrics").split(",")
+        if path
+    ]
+
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    # Port of the /metrics server started by gunicorn's master for the API,
+    # and by the email worker and the relay; never routed by the ingress.
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "9100"))
 
 
 class DevelopmentConfig(BaseConfig):
@@ -1,9 +1,20 @@
+import functools
 import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional, Sequence, Tuple
 
 import pika
 import requests
+from pika.adapters.blocking_connection import BlockingChannel
+from pika.exceptions import NackError, UnroutableError
+from prometheus_client import start_http_server
+from requests.adapters import HTTPAdapter
 
+from app.core.metrics import EMAIL_SEND_LATENCY, EMAILS_PROCESSED
 from config import DevelopmentConfig, ProductionConfig
 
 config_class = (
@@ -11,13 +22,107 @@ config_class = (
 )
 
 
+ATTEMPT_HEADER = "x-attempt"
+
+
+class MailtrapError(Exception):
+    def __init__(
+        self, message: str, retryable: bool, retry_after: Optional[float] = None
+    ):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class PoisonMessageError(Exception):
+    """A message that can never be delivered, however often it is retried."""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_queue_name(queue_name: str, delay: int) -> str:
+    return f"{queue_name}.retry.{delay}s"
+
+
+def dead_letter_queue_name(queue_name: str) -> str:
+    return f"{queue_name}.dead"
+
+
+def declare_topology(
+    channel: BlockingChannel, queue_name: str, retry_delays: Sequence[int]
+) -> None:
+    """Declare the work queue, one delay queue per backoff step and the final
+    dead-letter queue.
+
+    Delay queues have no consumers: a message waits there for the queue's TTL
+    and is then dead-lettered back onto the work queue through the default
+    exchange.
+    """
+    channel.queue_declare(queue=queue_name, durable=True)
+    for delay in retry_delays:
+        channel.queue_declare(
+            queue=retry_queue_name(queue_name, delay),
+            durable=True,
+            arguments={
+                "x-message-ttl": delay * 1000,
+                "x-dead-letter-exchange": "",
+                "x-dead-letter-routing-key": queue_name,
+            },
+        )
+    channel.queue_declare(queue=dead_letter_queue_name(queue_name), durable=True)
+
+
+def choose_retry_delay(
+    attempt: int, retry_after: Optional[float], retry_delays: Sequence[int]
+) -> int:
+    """Pick the delay queue for the next attempt: exponential steps by attempt
+    number, moved up to the first step that satisfies ``Retry-After``."""
+    delay = retry_delays[min(attempt - 1, len(retry_delays) - 1)]
+    if retry_after is not None and retry_after > delay:
+        delay = next((d for d in retry_delays if d >= retry_after), retry_delays[-1])
+    return delay
+
+
+def create_http_session(pool_size: int) -> requests.Session:
+    """A keep-alive session sized so every sender thread can hold a connection."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(
+        {
+            "Authorization": f"Bearer {config_class.MAILTRAP_API_TOKEN}",
+            "Content-Type": "application/json",
+        }
+    )
+    return session
+
+
+@functools.lru_cache(maxsize=None)
+def default_http_session() -> requests.Session:
+    """The process-wide session for callers that do not bring their own, so
+    they still reuse its pooled connections."""
+    return create_http_session(pool_size=config_class.EMAIL_WORKER_CONCURRENCY)
+
+
 def send_email_via_mailtrap(
-    to_email: str, full_name: str, subject: str, body: str
+    to_email: str,
+    full_name: str,
+    subject: str,
+    body: str,
+    http_session: Optional[requests.Session] = None,
 ) -> None:
-    headers = {
-        "Authorization": f"Bearer {config_class.MAILTRAP_API_TOKEN}",
-        "Content-Type": "application/json",
-    }
     payload = {
         "from": {
             "email": config_class.MAILTRAP_SENDER_EMAIL,
@@ -29,48 +134,197 @@ def send_email_via_mailtrap(
         "text": body,
     }
 
-    response = requests.post(
-        config_class.MAILTRAP_API_URL, headers=headers, json=payload
+    http_session = http_session or default_http_session()
+    response = http_session.post(
+        config_class.MAILTRAP_API_URL,
+        json=payload,
+        timeout=config_class.MAILTRAP_TIMEOUT,
     )
 
-    if response.status_code != 200:
-        print(f"[MAILTRAP ERROR] {response.status_code}: {response.text}")
-    else:
+    if response.status_code == 200:
         print(f"[MAILTRAP SUCCESS] Email sent to {to_email}")
+        return
+
+    print(f"[MAILTRAP ERROR] {response.status_code}: {response.text}")
+    retryable = response.status_code == 429 or response.status_code >= 500
+    raise MailtrapError(
+        f"Mailtrap responded {response.status_code}",
+        retryable=retryable,
+        retry_after=parse_retry_after(response.headers.get("Retry-After")),
+    )
 
 
-def callback(ch, method, properties, body: bytes) -> None:
+def process_message(body: bytes, http_session: requests.Session) -> None:
     try:
         message = json.loads(body)
-        print(f"[WORKER] Received message: {message}")
+    except ValueError as e:
+        raise PoisonMessageError(f"Invalid JSON: {e}") from e
+    print(f"[WORKER] Received message: {message}")
+
+    to_email = message.get("to_email")
+    full_name = message.get("full_name")
+    subject = message.get("subject", "Notification")
+    html = message.get("body", "")
+
+    if not to_email:
+        raise PoisonMessageError("'to_email' missing in message")
+    with EMAIL_SEND_LATENCY.time():
+        send_email_via_mailtrap(to_email, full_name, subject, html, http_session)
 
-        to_email = message.get("to_email")
-        full_name = message.get("full_name")
-        subject = message.get("subject", "Notification")
-        body = message.get("body", "")
 
-        if to_email:
-            send_email_via_mailtrap(to_email, full_name, subject, body)
-        else:
-            print("[WORKER ERROR] 'to_email' missing in message")
+class ConcurrentConsumer:
+    """Hands deliveries to a bounded thread pool and settles them on the
+    connection thread.
 
-        ch.basic_ack(delivery_tag=method.delivery_tag)
+    pika connections are not thread-safe, so sender threads never touch the
+    channel; they schedule the settlement with ``add_callback_threadsafe`` and
+    the consumer loop runs it. The broker-side prefetch bounds how many
+    messages can be queued in front of the pool.
 
-    except Exception as e:
-        print(f"[WORKER ERROR] Failed to process message: {e}")
-        ch.basic_nack(delivery_tag=method.delivery_tag)
+    A failed delivery is never requeued in place. Retryable failures are
+    republished to a delay queue with an incremented attempt header, and
+    poison messages or exhausted retries go to the dead-letter queue.
+    """
+
+    def __init__(
+        self,
+        connection: Any,
+        concurrency: int,
+        queue_name: str = config_class.EMAIL_QUEUE_NAME,
+        retry_delays: Sequence[int] = config_class.EMAIL_RETRY_DELAYS,
+        max_attempts: int = config_class.EMAIL_MAX_ATTEMPTS,
+    ):
+        self.connection = connection
+        self.queue_name = queue_name
+        self.retry_delays = retry_delays
+        self.max_attempts = max_attempts
+        self.executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="email-sender"
+        )
+        self.http_session = create_http_session(pool_size=concurrency)
+        self.processed = 0
+        self.retried = 0
+        self.dead_lettered = 0
+        self._lock = threading.Lock()
+
+    def on_message(
+        self,
+        ch: BlockingChannel,
+        method: Any,
+        properties: pika.BasicProperties,
+        body: bytes,
+    ) -> None:
+        self.executor.submit(self._handle, ch, method.delivery_tag, properties, body)
+
+    def _outcome(self, attempt: int, error: Exception) -> Tuple[str, Optional[int]]:
+        retryable = isinstance(error, requests.RequestException) or (
+            isinstance(error, MailtrapError) and error.retryable
+        )
+        if not retryable or attempt >= self.max_attempts:
+            return dead_letter_queue_name(self.queue_name), None
+        retry_after = error.retry_after if isinstance(error, MailtrapError) else None
+        delay = choose_retry_delay(attempt, retry_after, self.retry_delays)
+        return retry_queue_name(self.queue_name, delay), delay
+
+    def _handle(
+        self,
+        ch: BlockingChannel,
+        delivery_tag: int,
+        properties: Optional[pika.BasicProperties],
+        body: bytes,
+    ) -> None:
+        headers: Dict[str, Any] = dict((properties and properties.headers) or {})
+        attempt = int(headers.get(ATTEMPT_HEADER, 1))
+        try:
+            process_message(body, self.http_session)
+            settle = functools.partial(ch.basic_ack, delivery_tag=delivery_tag)
+            with self._lock:
+                self.processed += 1
+            EMAILS_PROCESSED.labels("sent").inc()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            routing_key, delay = self._outcome(attempt, e)
+            if delay is None:
+                print(f"[WORKER ERROR] Dead-lettering after attempt {attempt}: {e}")
+                headers["x-error"] = str(e)[:255]
+            else:
+                print(
+                    f"[WORKER ERROR] Attempt {attempt} failed, retry in {delay}s: {e}"
+                )
+                headers[ATTEMPT_HEADER] = attempt + 1
+            settle = functools.partial(
+                self._republish, ch, delivery_tag, routing_key, headers, body
+            )
+            with self._lock:
+                if delay is None:
+                    self.dead_lettered += 1
+                else:
+                    self.retried += 1
+            EMAILS_PROCESSED.labels(
+                "dead_lettered" if delay is None else "retried"
+            ).inc()
+        self.connection.add_callback_threadsafe(settle)
+
+    @staticmethod
+    def _republish(
+        ch: BlockingChannel,
+        delivery_tag: int,
+        routing_key: str,
+        headers: Dict[str, Any],
+        body: bytes,
+    ) -> None:
+        # Publish before acking: a crash in between duplicates, never loses.
+        # mandatory makes a missing retry or dead-letter queue raise
+        # UnroutableError instead of the broker silently dropping the message.
+        try:
+            ch.basic_publish(
+                exchange="",
+                routing_key=routing_key,
+                body=body,
+                properties=pika.BasicProperties(delivery_mode=2, headers=headers),
+                mandatory=True,
+            )
+        except (NackError, UnroutableError) as e:
+            # Raised here, this would escape process_data_events and stop the
+            # consumer; hand the delivery back to the broker instead.
+            print(f"[WORKER ERROR] Republish to {routing_key} failed: {e!r}")
+            ch.basic_nack(delivery_tag=delivery_tag, requeue=True)
+            return
+        ch.basic_ack(delivery_tag=delivery_tag)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True)
+        self.http_session.close()
 
 
 def main() -> None:
+    if config_class.METRICS_PORT:
+        start_http_server(config_class.METRICS_PORT)
     connection = pika.BlockingConnection(pika.URLParameters(config_class.RABBITMQ_URL))
     channel = connection.channel()
-    channel.queue_declare(queue=config_class.EMAIL_QUEUE_NAME, durable=True)
-    print("[WORKER] Waiting for messages. To exit press CTRL+C")
+    declare_topology(
+        channel, config_class.EMAIL_QUEUE_NAME, config_class.EMAIL_RETRY_DELAYS
+    )
+    channel.confirm_delivery()
+    channel.basic_qos(prefetch_count=config_class.EMAIL_WORKER_PREFETCH)
+
+    consumer = ConcurrentConsumer(connection, config_class.EMAIL_WORKER_CONCURRENCY)
+    print(
+        f"[WORKER] Waiting for messages with "
+        f"{config_class.EMAIL_WORKER_CONCURRENCY} senders. To exit press CTRL+C"
+    )
 
     channel.basic_consume(
-        queue=config_class.EMAIL_QUEUE_NAME, on_message_callback=callback
+        queue=config_class.EMAIL_QUEUE_NAME, on_message_callback=consumer.on_message
     )
-    channel.start_consuming()
+    try:
+        channel.start_consuming()
+    except KeyboardInterrupt:
+        channel.stop_consuming()
+    finally:
+        consumer.shutdown()
+        # Run the acks scheduled by senders that finished during shutdown.
+        connection.process_data_events(time_limit=0)
+        connection.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,56 @@
+"""Gunicorn settings; read automatically from the working directory."""
+
+import os
+from typing import Any
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+threads = int(os.getenv("GUNICORN_THREADS", "1"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+preload_app = os.getenv("GUNICORN_PRELOAD", "false").lower() == "true"
+
+
+def post_fork(server: Any, worker: Any) -> None:
+    # With preload_app the application, and any connection it opened while
+    # loading, is inherited from the master. Sharing a socket between
+    # processes corrupts the protocol stream, so each worker starts with an
+    # empty pool.
+    if server.cfg.preload_app:
+        from app.db.database import dispose_engines
+        from wsgi import app
+
+        dispose_engines(app)
+
+
+def on_starting(server: Any) -> None:
+    # Samples left by a previous master would be aggregated as if current.
+    directory = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+
+
+def when_ready(server: Any) -> None:
+    # The API's /metrics is served here rather than by the app, so it is not
+    # on the port the ingress exposes; the master aggregates the samples
+    # every worker writes to PROMETHEUS_MULTIPROC_DIR.
+    port = int(os.getenv("METRICS_PORT", "9100"))
+    if port and os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import (
+            CollectorRegistry,
+            multiprocess,
+            start_http_server,
+        )
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        start_http_server(port, registry=registry)
+        server.log.info("Serving metrics on port %d", port)
+
+
+def child_exit(server: Any, worker: Any) -> None:
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,28 @@
+"""Add token_version to users
+
+Revision ID: 7d1f3b6c2a90
+Revises: 4c2e9a1d7b3f
+Create Date: 2026-10-18 11:02:37.104512
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7d1f3b6c2a90"
+down_revision = "4c2e9a1d7b3f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A constant server default keeps this a metadata-only change on Postgres 11+.
+    op.add_column(
+        "users",
+        sa.Column("token_version", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "token_version")
@@ -0,0 +1,83 @@
+"""Hash and index verification tokens
+
+Revision ID: 9a4e6c1f2b85
+Revises: 7d1f3b6c2a90
+Create Date: 2026-10-18 13:41:09.220871
+
+"""
+
+import hashlib
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9a4e6c1f2b85"
+down_revision = "7d1f3b6c2a90"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_users_verification_token_hash"
+INDEX_PREDICATE = sa.text("verification_token_hash IS NOT NULL")
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "users", "verification_token", new_column_name="verification_token_hash"
+    )
+
+    # Tokens already emailed keep working: replace each with its digest.
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            "UPDATE users SET verification_token_hash = "
+            "encode(sha256(convert_to(verification_token_hash, 'UTF8')), 'hex') "
+            "WHERE verification_token_hash IS NOT NULL"
+        )
+    else:
+        users = sa.table("users", sa.column("id"), sa.column("verification_token_hash"))
+        rows = bind.execute(
+            sa.select(users.c.id, users.c.verification_token_hash).where(
+                users.c.verification_token_hash.isnot(None)
+            )
+        ).all()
+        for user_id, token in rows:
+            bind.execute(
+                users.update()
+                .where(users.c.id == user_id)
+                .values(
+                    verification_token_hash=hashlib.sha256(token.encode()).hexdigest()
+                )
+            )
+
+    if bind.dialect.name == "postgresql":
+        # CONCURRENTLY cannot run inside the migration transaction.
+        with op.get_context().autocommit_block():
+            op.create_index(
+                INDEX_NAME,
+                "users",
+                ["verification_token_hash"],
+                unique=True,
+                postgresql_where=INDEX_PREDICATE,
+                postgresql_concurrently=True,
+            )
+    else:
+        op.create_index(
+            INDEX_NAME,
+            "users",
+            ["verification_token_hash"],
+            unique=True,
+            sqlite_where=INDEX_PREDICATE,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name="users")
+    # Digests cannot be turned back into tokens; outstanding ones are dropped.
+    op.execute(
+        "UPDATE users SET verification_token_hash = NULL, "
+        "verification_token_expiry = NULL"
+    )
+    op.alter_column(
+        "users", "verification_token_hash", new_column_name="verification_token"
+    )
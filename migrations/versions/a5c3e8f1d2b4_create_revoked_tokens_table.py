@@ -0,0 +1,62 @@
+"""Create revoked_tokens table
+
+Revision ID: a5c3e8f1d2b4
+Revises: f2b8d6a1c3e7
+Create Date: 2026-10-18 22:41:09.372615
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a5c3e8f1d2b4"
+down_revision = "f2b8d6a1c3e7"
+branch_labels = None
+depends_on = None
+
+POSTGRES_NOW = "now()"
+SQLITE_NOW = "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+def upgrade() -> None:
+    postgres = op.get_bind().dialect.name == "postgresql"
+    now = POSTGRES_NOW if postgres else SQLITE_NOW
+    op.create_table(
+        "revoked_tokens",
+        sa.Column("jti", sa.String(length=255), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text(f"({now})"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text(f"({now})"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ux_revoked_tokens_jti", "revoked_tokens", ["jti"], unique=True)
+    op.create_index("ix_revoked_tokens_expires_at", "revoked_tokens", ["expires_at"])
+    if postgres:
+        # set_updated_at() was created along with the users trigger.
+        op.execute(
+            "CREATE TRIGGER revoked_tokens_set_updated_at BEFORE UPDATE ON "
+            "revoked_tokens FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+        )
+    else:
+        op.execute(
+            "CREATE TRIGGER revoked_tokens_set_updated_at AFTER UPDATE ON "
+            "revoked_tokens FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at "
+            f"BEGIN UPDATE revoked_tokens SET updated_at = {SQLITE_NOW} "
+            "WHERE id = NEW.id; END"
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("revoked_tokens")
@@ -0,0 +1,102 @@
+"""Case-insensitive unique email
+
+Revision ID: b3f58d2e61c4
+Revises: 9a4e6c1f2b85
+Create Date: 2026-10-18 15:06:52.771340
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b3f58d2e61c4"
+down_revision = "9a4e6c1f2b85"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+LOOKUP_INDEX = "ix_users_email_lower_tmp"
+UNIQUE_INDEX = "ux_users_email_lower"
+
+users = sa.table("users", sa.column("id", sa.Integer), sa.column("email", sa.String))
+
+
+def lower_email_backfill(bind: sa.engine.Connection) -> None:
+    """Lower-case stored emails in id order, ``BATCH_SIZE`` rows at a time.
+
+    Rows whose lower-cased email already belongs to another account are left
+    untouched and reported; they need a manual merge before the unique index
+    can be built, and re-running the migration picks up where it stopped.
+    """
+    collisions = []
+    last_id = 0
+    while True:
+        batch = bind.execute(
+            sa.select(users.c.id, users.c.email)
+            .where(users.c.id > last_id, users.c.email != sa.func.lower(users.c.email))
+            .order_by(users.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not batch:
+            break
+        last_id = batch[-1].id
+        lowered = []
+        for user_id, email in batch:
+            other = bind.execute(
+                sa.select(users.c.id).where(
+                    sa.func.lower(users.c.email) == email.lower(),
+                    users.c.id != user_id,
+                )
+            ).first()
+            if other is not None:
+                collisions.append((user_id, other.id, email))
+            else:
+                lowered.append(user_id)
+        if lowered:
+            bind.execute(
+                users.update()
+                .where(users.c.id.in_(lowered))
+                .values(email=sa.func.lower(users.c.email))
+            )
+    if collisions:
+        details = ", ".join(f"{a}/{b} ({email})" for a, b, email in collisions)
+        raise RuntimeError(f"Emails differing only by case (user ids): {details}")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        lower_email_backfill(bind)
+        op.create_index(UNIQUE_INDEX, "users", [sa.text("lower(email)")], unique=True)
+        return
+
+    # Every step runs outside a transaction: the indexes are built
+    # CONCURRENTLY and each batch's UPDATE commits on its own, so the table
+    # is never locked against writes and row locks are held only briefly.
+    with op.get_context().autocommit_block():
+        # Lets the per-row collision check use an index while backfilling.
+        op.create_index(
+            LOOKUP_INDEX,
+            "users",
+            [sa.text("lower(email)")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        lower_email_backfill(bind)
+        op.create_index(
+            UNIQUE_INDEX,
+            "users",
+            [sa.text("lower(email)")],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(LOOKUP_INDEX, table_name="users", postgresql_concurrently=True)
+        # Superseded by the functional index.
+        op.drop_constraint("users_email_key", "users", type_="unique")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.create_unique_constraint("users_email_key", "users", ["email"])
+    op.drop_index(UNIQUE_INDEX, table_name="users")
@@ -0,0 +1,41 @@
+"""Index users for the admin listing
+
+Revision ID: c81d4e7a9f03
+Revises: b3f58d2e61c4
+Create Date: 2026-10-18 17:25:40.093617
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c81d4e7a9f03"
+down_revision = "b3f58d2e61c4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    postgres = op.get_bind().dialect.name == "postgresql"
+    if postgres:
+        # CONCURRENTLY cannot run inside the migration transaction.
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "ix_users_created_at_id",
+                "users",
+                ["created_at", "id"],
+                postgresql_concurrently=True,
+            )
+            op.execute(
+                "CREATE INDEX CONCURRENTLY ix_users_email_lower_pattern "
+                "ON users (lower(email) text_pattern_ops)"
+            )
+        return
+    op.create_index("ix_users_created_at_id", "users", ["created_at", "id"])
+    op.create_index("ix_users_email_lower_pattern", "users", [sa.text("lower(email)")])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_email_lower_pattern", table_name="users")
+    op.drop_index("ix_users_created_at_id", table_name="users")
@@ -0,0 +1,67 @@
+"""Create idempotency_keys table
+
+Revision ID: d7e2f4a9b6c1
+Revises: a5c3e8f1d2b4
+Create Date: 2026-10-18 23:52:37.418206
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d7e2f4a9b6c1"
+down_revision = "a5c3e8f1d2b4"
+branch_labels = None
+depends_on = None
+
+POSTGRES_NOW = "now()"
+SQLITE_NOW = "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+def upgrade() -> None:
+    postgres = op.get_bind().dialect.name == "postgresql"
+    now = POSTGRES_NOW if postgres else SQLITE_NOW
+    op.create_table(
+        "idempotency_keys",
+        sa.Column("key", sa.String(length=320), nullable=False),
+        sa.Column("fingerprint", sa.String(length=64), nullable=False),
+        sa.Column("status", sa.Integer(), nullable=False),
+        sa.Column("body", sa.Text(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text(f"({now})"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text(f"({now})"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ux_idempotency_keys_key", "idempotency_keys", ["key"], unique=True)
+    op.create_index(
+        "ix_idempotency_keys_expires_at", "idempotency_keys", ["expires_at"]
+    )
+    if postgres:
+        # set_updated_at() was created along with the users trigger.
+        op.execute(
+            "CREATE TRIGGER idempotency_keys_set_updated_at BEFORE UPDATE ON "
+            "idempotency_keys FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+        )
+    else:
+        op.execute(
+            "CREATE TRIGGER idempotency_keys_set_updated_at AFTER UPDATE ON "
+            "idempotency_keys FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at "
+            f"BEGIN UPDATE idempotency_keys SET updated_at = {SQLITE_NOW} "
+            "WHERE id = NEW.id; END"
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("idempotency_keys")
@@ -0,0 +1,134 @@
+"""Server-side timestamps
+
+Revision ID: e4a7c2b9d5f1
+Revises: c81d4e7a9f03
+Create Date: 2026-10-18 19:05:12.418203
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e4a7c2b9d5f1"
+down_revision = "c81d4e7a9f03"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+TABLES = ("users", "outbox_messages")
+
+POSTGRES_NOW = sa.text("now()")
+# CURRENT_TIMESTAMP only has whole seconds on SQLite.
+SQLITE_NOW = sa.text("(strftime('%Y-%m-%d %H:%M:%f', 'now'))")
+
+POSTGRES_SET_UPDATED_AT = """
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+BEGIN
+    IF NEW.updated_at IS NOT DISTINCT FROM OLD.updated_at THEN
+        NEW.updated_at = now();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# Expression indexes, which batch mode drops when it rebuilds a SQLite table.
+SQLITE_EXPRESSION_INDEXES = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS ux_users_email_lower ON users (lower(email))",
+    "CREATE INDEX IF NOT EXISTS ix_users_email_lower_pattern ON users (lower(email))",
+)
+
+
+def backfill_updated_at(bind: sa.engine.Connection, table_name: str) -> None:
+    """Copy created_at into the missing updated_at values in id order,
+    ``BATCH_SIZE`` rows per UPDATE.
+
+    On Postgres each UPDATE commits on its own, so row locks are held for
+    one batch at a time; re-running the migration resumes where it stopped.
+    """
+    table = sa.table(
+        table_name,
+        sa.column("id", sa.Integer),
+        sa.column("created_at", sa.DateTime(timezone=True)),
+        sa.column("updated_at", sa.DateTime(timezone=True)),
+    )
+    last_id = 0
+    while True:
+        ids = (
+            bind.execute(
+                sa.select(table.c.id)
+                .where(table.c.id > last_id, table.c.updated_at.is_(None))
+                .order_by(table.c.id)
+                .limit(BATCH_SIZE)
+            )
+            .scalars()
+            .all()
+        )
+        if not ids:
+            return
+        bind.execute(
+            table.update()
+            .where(table.c.id.in_(ids))
+            .values(updated_at=table.c.created_at)
+        )
+        last_id = ids[-1]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        # Only the catalog changes: existing rows keep their values.
+        for table in TABLES:
+            op.alter_column(table, "created_at", server_default=POSTGRES_NOW)
+            op.alter_column(table, "updated_at", server_default=POSTGRES_NOW)
+        with op.get_context().autocommit_block():
+            for table in TABLES:
+                backfill_updated_at(bind, table)
+        for table in TABLES:
+            op.alter_column(table, "updated_at", nullable=False)
+            op.execute(POSTGRES_SET_UPDATED_AT)
+            op.execute(
+                f"CREATE TRIGGER {table}_set_updated_at BEFORE UPDATE ON {table} "
+                "FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+            )
+        return
+
+    for table in TABLES:
+        backfill_updated_at(bind, table)
+        with op.batch_alter_table(table, recreate="always") as batch_op:
+            batch_op.alter_column("created_at", server_default=SQLITE_NOW)
+            batch_op.alter_column(
+                "updated_at", server_default=SQLITE_NOW, nullable=False
+            )
+        # SQLite triggers cannot assign to NEW, so the row is updated again;
+        # the WHEN clause keeps that UPDATE from firing the trigger.
+        op.execute(
+            f"CREATE TRIGGER {table}_set_updated_at AFTER UPDATE ON {table} "
+            "FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at BEGIN "
+            f"UPDATE {table} SET updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now') "
+            "WHERE id = NEW.id; END"
+        )
+    for statement in SQLITE_EXPRESSION_INDEXES:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    postgres = op.get_bind().dialect.name == "postgresql"
+    for table in TABLES:
+        op.execute(
+            f"DROP TRIGGER IF EXISTS {table}_set_updated_at"
+            + (f" ON {table}" if postgres else "")
+        )
+        if postgres:
+            op.alter_column(table, "created_at", server_default=None)
+            op.alter_column(table, "updated_at", server_default=None, nullable=True)
+            continue
+        with op.batch_alter_table(table, recreate="always") as batch_op:
+            batch_op.alter_column("created_at", server_default=None)
+            batch_op.alter_column("updated_at", server_default=None, nullable=True)
+    if postgres:
+        op.execute("DROP FUNCTION IF EXISTS set_updated_at()")
+    else:
+        for statement in SQLITE_EXPRESSION_INDEXES:
+            op.execute(statement)
@@ -0,0 +1,79 @@
+"""Index users for the change feed
+
+Revision ID: f2b8d6a1c3e7
+Revises: e4a7c2b9d5f1
+Create Date: 2026-10-18 20:12:37.550914
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f2b8d6a1c3e7"
+down_revision = "e4a7c2b9d5f1"
+branch_labels = None
+depends_on = None
+
+TABLES = ("users", "outbox_messages")
+
+# SQLite compares timestamps as text: the database's own now() is padded to
+# the six fractional digits SQLAlchemy writes, so keyset pagination on
+# (updated_at, id) sorts both alike.
+SQLITE_NOW = "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+SQLITE_NOW_MILLISECONDS = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+# Expression indexes, which batch mode drops when it rebuilds a SQLite table.
+SQLITE_EXPRESSION_INDEXES = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS ux_users_email_lower ON users (lower(email))",
+    "CREATE INDEX IF NOT EXISTS ix_users_email_lower_pattern ON users (lower(email))",
+)
+
+
+def set_sqlite_now(now: str) -> None:
+    """Switch the SQLite defaults and updated_at triggers to ``now``."""
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_set_updated_at")
+        with op.batch_alter_table(table, recreate="always") as batch_op:
+            batch_op.alter_column("created_at", server_default=sa.text(f"({now})"))
+            batch_op.alter_column("updated_at", server_default=sa.text(f"({now})"))
+        op.execute(
+            f"CREATE TRIGGER {table}_set_updated_at AFTER UPDATE ON {table} "
+            "FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at BEGIN "
+            f"UPDATE {table} SET updated_at = {now} WHERE id = NEW.id; END"
+        )
+    for statement in SQLITE_EXPRESSION_INDEXES:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        # CONCURRENTLY cannot run inside the migration transaction.
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "ix_users_updated_at_id",
+                "users",
+                ["updated_at", "id"],
+                postgresql_concurrently=True,
+            )
+        return
+    # Pad the millisecond values written so far, with the trigger dropped so
+    # updated_at keeps its value.
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_set_updated_at")
+        op.execute(
+            f"UPDATE {table} SET "
+            "created_at = CASE WHEN length(created_at) = 23 "
+            "THEN created_at || '000' ELSE created_at END, "
+            "updated_at = CASE WHEN length(updated_at) = 23 "
+            "THEN updated_at || '000' ELSE updated_at END "
+            "WHERE length(created_at) = 23 OR length(updated_at) = 23"
+        )
+    set_sqlite_now(SQLITE_NOW)
+    op.create_index("ix_users_updated_at_id", "users", ["updated_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_updated_at_id", table_name="users")
+    if op.get_bind().dialect.name != "postgresql":
+        set_sqlite_now(SQLITE_NOW_MILLISECONDS)
@@ -0,0 +1,44 @@
+import logging
+import os
+
+from prometheus_client import start_http_server
+from sqlalchemy import create_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from app.v1.events.amqp_publisher import AmqpPublisher
+from app.v1.events.outbox_relay import OutboxRelay
+from app.v1.events.user_events import USER_EVENTS_EXCHANGE
+from config import DevelopmentConfig, ProductionConfig
+
+config_class = (
+    DevelopmentConfig if os.getenv("FLASK_ENV") == "development" else ProductionConfig
+)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    if config_class.METRICS_PORT:
+        start_http_server(config_class.METRICS_PORT)
+    engine = create_engine(config_class.DATABASE_URL, pool_pre_ping=True)
+    session = scoped_session(sessionmaker(bind=engine))
+    publisher = AmqpPublisher(
+        config_class.RABBITMQ_URL,
+        durable_queues=[config_class.EMAIL_QUEUE_NAME],
+        pool_size=1,
+        topic_exchanges=[USER_EVENTS_EXCHANGE],
+    )
+    relay = OutboxRelay(
+        session, publisher, batch_size=config_class.OUTBOX_RELAY_BATCH_SIZE
+    )
+    print("[RELAY] Relaying outbox messages. To exit press CTRL+C")
+    try:
+        relay.run(
+            idle_interval=config_class.OUTBOX_RELAY_IDLE_INTERVAL,
+            stats_interval=config_class.OUTBOX_RELAY_STATS_INTERVAL,
+        )
+    finally:
+        publisher.close()
+
+
+if __name__ == "__main__":
+    main()
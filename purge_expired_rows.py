@@ -0,0 +1,40 @@
+import logging
+import os
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from app.v1.repositories.idempotency_key_repository import IdempotencyKeyRepository
+from app.v1.repositories.revoked_token_repository import RevokedTokenRepository
+from app.v1.repositories.user_repository import UserRepository
+from config import DevelopmentConfig, ProductionConfig
+
+config_class = (
+    DevelopmentConfig if os.getenv("FLASK_ENV") == "development" else ProductionConfig
+)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    engine = create_engine(config_class.DATABASE_URL, pool_pre_ping=True)
+    session = scoped_session(sessionmaker(bind=engine))
+    try:
+        purged = UserRepository(session).purge_expired_verification_tokens(
+            batch_size=config_class.EXPIRED_ROWS_PURGE_BATCH_SIZE
+        )
+        logging.info("Purged %d expired verification tokens", purged)
+        purged = RevokedTokenRepository(session).purge_expired(
+            batch_size=config_class.EXPIRED_ROWS_PURGE_BATCH_SIZE
+        )
+        logging.info("Purged %d revocations of expired tokens", purged)
+        purged = IdempotencyKeyRepository(session).purge_expired(
+            batch_size=config_class.EXPIRED_ROWS_PURGE_BATCH_SIZE
+        )
+        logging.info("Purged %d expired idempotency keys", purged)
+    finally:
+        session.remove()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,12 @@
-from datetime import datetime, timedelta
-
-import jwt
 import pytest
-import pytz
 from flask.testing import FlaskClient
-from sqlalchemy import create_engine
+from flask_jwt_extended import create_access_token
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import scoped_session, sessionmaker
 
 from app import create_app
+from app.core.cache import profile_cache, token_state_cache
+from app.db.database import db
 from app.v1 import models
 from app.v1.models import User
 from config import BaseConfig
@@ -32,6 +31,13 @@ def db_session(db_engine):
     session.close()
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    yield
+    profile_cache.clear()
+    token_state_cache.clear()
+
+
 @pytest.fixture(scope="module")
 def app():
     app = create_app(BaseConfig.TEST_DATABASE_URL, testing=True)
@@ -43,6 +49,21 @@ def client(app) -> FlaskClient:
     return app.test_client()
 
 
+@pytest.fixture
+def statements(app):
+    """The SQL statements the app sends to its database during the test."""
+    recorded = []
+
+    def record(_conn, _cursor, statement, *_):
+        recorded.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    yield recorded
+    event.remove(engine, "before_cursor_execute", record)
+
+
 @pytest.fixture
 def test_user(db_session):
     user = User()
@@ -56,17 +77,25 @@ def test_user(db_session):
     db_session.commit()
     db_session.refresh(user)
 
-    return user
+    yield user
+
+    db_session.rollback()
+    db_session.query(User).filter_by(id=user.id).delete()
+    db_session.commit()
 
 
 @pytest.fixture
-def auth_token(test_user):
-    payload = {
-        "sub": str(test_user.id),
-        "exp": datetime.now(tz=pytz.utc) + timedelta(hours=1),
-    }
-    token = jwt.encode(payload, BaseConfig.JWT_SECRET_KEY, algorithm="HS256")
-    return token
+def auth_token(app, test_user):
+    # Issued the way login does, jti included, so the revocation check runs.
+    with app.app_context():
+        return create_access_token(
+            identity=str(test_user.id),
+            additional_claims={
+                "email": test_user.email,
+                "ver": test_user.token_version,
+                "adm": test_user.is_admin,
+            },
+        )
 
 
 @pytest.fixture
@@ -0,0 +1,109 @@
+import json
+from unittest.mock import MagicMock
+
+import pika
+import pytest
+from pika.exceptions import NackError, UnroutableError
+
+import email_worker
+from email_worker import ConcurrentConsumer, MailtrapError, choose_retry_delay
+
+BODY = json.dumps({"to_email": "test@example.com", "full_name": "Test"}).encode()
+API_URL = email_worker.config_class.MAILTRAP_API_URL
+
+
+@pytest.fixture
+def consumer():
+    connection = MagicMock()
+    connection.add_callback_threadsafe.side_effect = lambda callback: callback()
+    consumer = ConcurrentConsumer(
+        connection, 1, queue_name="email_queue", retry_delays=[5, 25], max_attempts=3
+    )
+    yield consumer
+    consumer.shutdown()
+
+
+def deliver(consumer, body=BODY, attempt=None):
+    channel = MagicMock()
+    headers = {email_worker.ATTEMPT_HEADER: attempt} if attempt else None
+    consumer._handle(channel, 7, pika.BasicProperties(headers=headers), body)
+    return channel
+
+
+def published_to(channel):
+    kwargs = channel.basic_publish.call_args.kwargs
+    assert kwargs["mandatory"]
+    return kwargs["routing_key"], kwargs["properties"].headers
+
+
+def test_rate_limited_send_is_retryable(requests_mock):
+    requests_mock.post(API_URL, status_code=429, headers={"Retry-After": "20"})
+    with pytest.raises(MailtrapError) as exc_info:
+        email_worker.send_email_via_mailtrap("a@example.com", "A", "S", "B")
+    assert exc_info.value.retryable
+    assert exc_info.value.retry_after == 20
+
+
+def test_sends_without_a_session_share_one(requests_mock):
+    requests_mock.post(API_URL, status_code=200)
+    email_worker.send_email_via_mailtrap("a@example.com", "A", "S", "B")
+    email_worker.send_email_via_mailtrap("b@example.com", "B", "S", "B")
+
+    assert email_worker.default_http_session() is email_worker.default_http_session()
+    assert requests_mock.call_count == 2
+
+
+def test_choose_retry_delay_honours_retry_after():
+    assert choose_retry_delay(1, None, [5, 25, 125]) == 5
+    assert choose_retry_delay(2, None, [5, 25, 125]) == 25
+    assert choose_retry_delay(1, 20, [5, 25, 125]) == 25
+    assert choose_retry_delay(9, 9999, [5, 25, 125]) == 125
+
+
+def test_server_error_goes_to_delay_queue(consumer, requests_mock):
+    requests_mock.post(API_URL, status_code=503)
+    channel = deliver(consumer)
+
+    routing_key, headers = published_to(channel)
+    assert routing_key == "email_queue.retry.5s"
+    assert headers[email_worker.ATTEMPT_HEADER] == 2
+    channel.basic_ack.assert_called_once_with(delivery_tag=7)
+    channel.basic_nack.assert_not_called()
+
+
+def test_exhausted_retries_are_dead_lettered(consumer, requests_mock):
+    requests_mock.post(API_URL, status_code=500)
+    channel = deliver(consumer, attempt=3)
+
+    routing_key, _ = published_to(channel)
+    assert routing_key == "email_queue.dead"
+    assert consumer.dead_lettered == 1
+
+
+def test_poison_message_is_dead_lettered_without_sending(consumer, requests_mock):
+    channel = deliver(consumer, body=b"not json")
+
+    routing_key, headers = published_to(channel)
+    assert routing_key == "email_queue.dead"
+    assert "Invalid JSON" in headers["x-error"]
+    assert not requests_mock.called
+
+
+def test_successful_send_is_acked(consumer, requests_mock):
+    requests_mock.post(API_URL, status_code=200)
+    channel = deliver(consumer)
+
+    channel.basic_publish.assert_not_called()
+    channel.basic_ack.assert_called_once_with(delivery_tag=7)
+    assert consumer.processed == 1
+
+
+@pytest.mark.parametrize("error", [NackError([]), UnroutableError([])])
+def test_failed_republish_requeues_the_delivery(consumer, requests_mock, error):
+    requests_mock.post(API_URL, status_code=503)
+    channel = MagicMock()
+    channel.basic_publish.side_effect = error
+    consumer._handle(channel, 7, pika.BasicProperties(), BODY)
+
+    channel.basic_nack.assert_called_once_with(delivery_tag=7, requeue=True)
+    channel.basic_ack.assert_not_called()
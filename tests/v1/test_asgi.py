@@ -0,0 +1,183 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from starlette.testclient import TestClient
+
+from app.asgi import create_asgi_app
+from app.core.password_hasher import PasswordHasher
+from app.core.rate_limiter import RateLimit, RateLimiter, login_rate_limiter
+from app.db.async_database import async_database_url
+from app.v1.models import OutboxMessage, User
+from config import BaseConfig
+
+
+@pytest.fixture(scope="module")
+def asgi_client():
+    with TestClient(create_asgi_app(BaseConfig.TEST_DATABASE_URL, testing=True)) as c:
+        yield c
+
+
+@pytest.fixture
+def verified_user(db_session):
+    user = User()
+    user.email = "asgi@example.com"
+    user.first_name = "Async"
+    user.last_name = "User"
+    user.phone_number = "+8412345678"
+    user.is_email_verified = True
+    user.password_hash = PasswordHasher(rounds=4).hash("password123")
+    db_session.add(user)
+    db_session.commit()
+    yield user
+    db_session.delete(user)
+    db_session.commit()
+
+
+def bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_async_database_url_swaps_in_the_asyncio_driver():
+    assert async_database_url("sqlite:////tmp/app.db").drivername == "sqlite+aiosqlite"
+    assert (
+        async_database_url("postgresql+psycopg2://u:p@db/app").drivername
+        == "postgresql+asyncpg"
+    )
+    with pytest.raises(ValueError):
+        async_database_url("mysql://u:p@db/app")
+
+
+def test_register_stages_the_verification_email(asgi_client, db_session):
+    payload = {
+        "email": "asgi-register@example.com",
+        "password": "password123",
+        "first_name": "Async",
+        "last_name": "Register",
+        "phone_number": "+8412345678",
+    }
+    first = asgi_client.post("/v1/auth/register", json=payload)
+    second = asgi_client.post("/v1/auth/register", json=payload)
+
+    assert first.status_code == 201
+    assert second.status_code == 400
+    assert "User already exists" in second.json()["error"]
+    user = db_session.query(User).filter_by(email="asgi-register@example.com").one()
+    assert user.password_hash != "password123"
+    db_session.query(OutboxMessage).delete()
+    db_session.delete(user)
+    db_session.commit()
+
+
+def test_login_profile_refresh_and_logout(asgi_client, verified_user):
+    login = asgi_client.post(
+        "/v1/auth/login", json={"email": "ASGI@example.com", "password": "password123"}
+    )
+    assert login.status_code == 200
+    tokens = login.json()
+
+    profile = asgi_client.get(
+        "/v1/users/profile", headers=bearer(tokens["access_token"])
+    )
+    assert profile.status_code == 200
+    assert profile.json()["email"] == "asgi@example.com"
+
+    updated = asgi_client.put(
+        "/v1/users/profile",
+        json={"first_name": "Renamed"},
+        headers=bearer(tokens["access_token"]),
+    )
+    assert updated.json()["user"]["first_name"] == "Renamed"
+
+    refreshed = asgi_client.post(
+        "/v1/auth/refresh", headers=bearer(tokens["refresh_token"])
+    )
+    assert refreshed.status_code == 200
+    reused = asgi_client.post(
+        "/v1/auth/refresh", headers=bearer(tokens["refresh_token"])
+    )
+    assert reused.status_code == 401
+
+    access_token = refreshed.json()["access_token"]
+    assert (
+        asgi_client.post("/v1/auth/logout", headers=bearer(access_token)).status_code
+        == 200
+    )
+    revoked = asgi_client.get("/v1/users/profile", headers=bearer(access_token))
+    assert revoked.status_code == 401
+    assert revoked.json() == {"msg": "Token has been revoked"}
+
+
+def test_login_rejects_a_wrong_password(asgi_client, verified_user):
+    response = asgi_client.post(
+        "/v1/auth/login", json={"email": "asgi@example.com", "password": "wrong"}
+    )
+    assert response.status_code == 500
+    assert response.json() == {"error": "Invalid credentials"}
+
+
+def test_password_change_hashes_off_the_event_loop(asgi_client, verified_user):
+    tokens = asgi_client.post(
+        "/v1/auth/login", json={"email": "asgi@example.com", "password": "password123"}
+    ).json()
+    headers = bearer(tokens["access_token"])
+    body = {"current_password": "password123", "new_password": "new-password"}
+    offloaded = []
+    to_thread = asyncio.to_thread
+
+    async def record(func, *args):
+        offloaded.append(func.__name__)
+        return await to_thread(func, *args)
+
+    with patch("app.v1.views.async_user_view.asyncio.to_thread", record):
+        wrong = asgi_client.put(
+            "/v1/users/password",
+            json={**body, "current_password": "guess"},
+            headers=headers,
+        )
+        response = asgi_client.put("/v1/users/password", json=body, headers=headers)
+
+    assert wrong.status_code == 400
+    assert response.status_code == 200
+    assert offloaded == ["verify", "verify", "hash"]
+    assert asgi_client.get("/v1/users/profile", headers=headers).status_code == 401
+
+
+def test_token_errors_match_flask_jwt_extended(asgi_client, verified_user):
+    missing = asgi_client.get("/v1/users/profile")
+    assert missing.status_code == 401
+    assert "Missing 'Bearer' type" in missing.json()["msg"]
+
+    tokens = asgi_client.post(
+        "/v1/auth/login", json={"email": "asgi@example.com", "password": "password123"}
+    ).json()
+    wrong_type = asgi_client.get(
+        "/v1/users/profile", headers=bearer(tokens["refresh_token"])
+    )
+    assert wrong_type.status_code == 422
+    assert wrong_type.json() == {"msg": "Only non-refresh tokens are allowed"}
+
+    not_admin = asgi_client.get("/v1/users", headers=bearer(tokens["access_token"]))
+    assert not_admin.status_code == 403
+
+
+def test_login_throttles_by_the_forwarded_client_ip(monkeypatch):
+    limiter = RateLimiter("login", login_rate_limiter.rule_settings)
+    limiter.rules = {"ip": RateLimit(1, 60), "email": RateLimit(100, 60)}
+    monkeypatch.setattr("app.v1.views.async_auth_view.login_rate_limiter", limiter)
+    with patch.object(BaseConfig, "TRUSTED_PROXY_COUNT", 1):
+        app = create_asgi_app(BaseConfig.TEST_DATABASE_URL, testing=True)
+    payload = {"email": "nobody@example.com", "password": "wrong"}
+
+    def login(forwarded_for):
+        with TestClient(app) as client:
+            return client.post(
+                "/v1/auth/login",
+                json=payload,
+                headers={"X-Forwarded-For": forwarded_for},
+            ).status_code
+
+    assert login("203.0.113.1") != 429
+    # Only the entry the trusted proxy appended counts, not a spoofed one.
+    assert login("198.51.100.7, 203.0.113.1") == 429
+    assert login("203.0.113.2") != 429
@@ -0,0 +1,94 @@
+import json
+
+from app.core.password_hasher import PasswordHasher
+from app.v1.models import OutboxMessage, User
+
+IMPORT_CSV = """email,first_name,last_name,phone_number,password,password_hash
+new.one@example.com,New,One,+841,password123,
+New.Two@Example.com,New,Two,+842,,{password_hash}
+TEST_USER@example.com,Existing,User,+843,password123,
+,No,Email,+844,password123,
+new.one@EXAMPLE.com,Repeated,Row,+845,password123,
+plain@example.com,Plain,Text,+846,,hunter2
+"""
+
+
+def test_import_inserts_new_users_and_skips_the_rest(
+    app, db_session, test_user, tmp_path
+):
+    path = tmp_path / "users.csv"
+    password_hash = PasswordHasher(rounds=4).hash("secret")
+    path.write_text(IMPORT_CSV.format(password_hash=password_hash))
+
+    result = app.test_cli_runner().invoke(
+        args=["users", "import", str(path), "--hash-workers", "0", "--chunk-size", "2"]
+    )
+
+    assert result.exit_code == 0, result.output
+    summary = json.loads(result.stdout.splitlines()[-1])
+    assert summary["inserted"] == 2
+    assert summary["skipped"] == 2
+    assert summary["invalid"] == 2
+
+    emails = ["new.one@example.com", "new.two@example.com"]
+    users = db_session.query(User).filter(User.email.in_(emails)).all()
+    assert {user.email for user in users} == set(emails)
+    assert all(not user.is_email_verified for user in users)
+    imported = next(user for user in users if user.email == "new.two@example.com")
+    assert imported.password_hash == password_hash
+    messages = db_session.query(OutboxMessage).filter_by(exchange="").all()
+    assert sorted(json.loads(m.body)["to_email"] for m in messages) == emails
+    created = {
+        event["data"]["email"]: event["id"]
+        for message in db_session.query(OutboxMessage).filter_by(
+            routing_key="user.created"
+        )
+        for event in json.loads(message.body)["events"]
+    }
+    assert {email: created.get(email) for email in emails} == {
+        user.email: user.id for user in users
+    }
+
+    db_session.query(OutboxMessage).delete()
+    db_session.query(User).filter(User.email.in_(emails)).delete()
+    db_session.commit()
+
+
+def test_jsonl_import_counts_bad_lines_as_invalid(app, db_session, tmp_path):
+    path = tmp_path / "users.jsonl"
+    path.write_text(
+        "\n".join(
+            [
+                json.dumps({"email": "jsonl@example.com", "password": "password123"}),
+                "{not json",
+                json.dumps(["jsonl-list@example.com"]),
+                json.dumps({"email": "bad-hash@example.com", "password_hash": "x$y"}),
+            ]
+        )
+    )
+
+    result = app.test_cli_runner().invoke(
+        args=["users", "import", str(path), "--hash-workers", "0"]
+    )
+
+    assert result.exit_code == 0, result.output
+    summary = json.loads(result.stdout.splitlines()[-1])
+    assert summary["read"] == 4
+    assert summary["inserted"] == 1
+    assert summary["invalid"] == 3
+
+    db_session.query(OutboxMessage).delete()
+    db_session.query(User).filter_by(email="jsonl@example.com").delete()
+    db_session.commit()
+
+
+def test_export_writes_one_json_line_per_user(app, test_user, tmp_path):
+    path = tmp_path / "users.jsonl"
+
+    result = app.test_cli_runner().invoke(args=["users", "export", str(path)])
+
+    assert result.exit_code == 0, result.output
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    exported = next(r for r in records if r["email"] == test_user.email)
+    assert exported["id"] == test_user.id
+    assert "password_hash" not in exported
@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import create_engine, exc
+
+from app.core.metrics import DB_POOL_CHECKED_OUT, DB_POOL_TIMEOUTS
+from app.db.database import InstrumentedQueuePool, engine_options, pool_stats
+
+SETTINGS = {
+    "DB_POOL_SIZE": 3,
+    "DB_MAX_OVERFLOW": 2,
+    "DB_POOL_TIMEOUT": 0.05,
+    "DB_POOL_RECYCLE": 600,
+    "DB_POOL_PRE_PING": True,
+    "DB_STATEMENT_TIMEOUT_MS": 5000,
+    "DB_PGBOUNCER": False,
+}
+
+
+def test_postgres_options_carry_pool_and_statement_timeout():
+    options = engine_options(SETTINGS, "postgresql://u:p@db/users")
+
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_size"] == 3
+    assert options["max_overflow"] == 2
+    assert options["connect_args"] == {"options": "-c statement_timeout=5000"}
+
+
+def test_pgbouncer_mode_drops_startup_options_and_prepared_statements():
+    settings = dict(SETTINGS, DB_PGBOUNCER=True)
+
+    assert "connect_args" not in engine_options(
+        settings, "postgresql+psycopg2://db/users"
+    )
+    options = engine_options(settings, "postgresql+psycopg://db/users")
+    assert options["connect_args"] == {"prepare_threshold": None}
+
+
+def test_pool_records_checkouts_and_timeouts(tmp_path):
+    settings = dict(SETTINGS, DB_POOL_SIZE=1, DB_MAX_OVERFLOW=0)
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    engine = create_engine(url, **engine_options(settings, url, "pool-test"))
+
+    held = engine.connect()
+    assert DB_POOL_CHECKED_OUT.labels("pool-test")._value.get() == 1
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    held.close()
+    assert DB_POOL_CHECKED_OUT.labels("pool-test")._value.get() == 0
+    assert DB_POOL_TIMEOUTS.labels("pool-test")._value.get() == 1
+
+    stats = pool_stats(engine)
+    assert stats["checkouts_total"] == 1
+    assert stats["timeouts_total"] == 1
+    assert stats["wait_seconds_max"] >= settings["DB_POOL_TIMEOUT"]
+    engine.dispose()
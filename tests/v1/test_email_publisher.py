@@ -0,0 +1,60 @@
+from unittest.mock import MagicMock, patch
+
+from pika.exceptions import StreamLostError
+
+from app.v1.events.email_publisher import EmailPublisher
+from app.v1.schemas.email_schema import EmailMessage
+
+MESSAGE = EmailMessage(
+    to_email="test@example.com", full_name="Test User", subject="Hi", body="Body"
+)
+
+
+@patch("app.v1.events.amqp_publisher.pika.BlockingConnection")
+def test_publisher_reuses_connection(mock_connection):
+    publisher = EmailPublisher("amqp://localhost")
+    publisher.publish_email(MESSAGE)
+    publisher.publish_email(MESSAGE)
+
+    mock_connection.assert_called_once()
+    channel = mock_connection.return_value.channel.return_value
+    channel.queue_declare.assert_called_once_with(queue="email_queue", durable=True)
+    assert channel.basic_publish.call_count == 2
+    assert channel.tx_commit.call_count == 2
+
+
+@patch("app.v1.events.amqp_publisher.pika.BlockingConnection")
+def test_publisher_batches_confirms(mock_connection):
+    publisher = EmailPublisher("amqp://localhost")
+    publisher.publish_emails([MESSAGE] * 3)
+
+    channel = mock_connection.return_value.channel.return_value
+    assert channel.basic_publish.call_count == 3
+    channel.tx_commit.assert_called_once()
+
+
+@patch("app.v1.events.amqp_publisher.pika.BlockingConnection")
+def test_publisher_reconnects_after_failure(mock_connection):
+    broken, healthy = MagicMock(), MagicMock()
+    broken.channel.return_value.basic_publish.side_effect = StreamLostError()
+    mock_connection.side_effect = [broken, healthy]
+
+    publisher = EmailPublisher("amqp://localhost")
+    publisher.publish_email(MESSAGE)
+
+    assert mock_connection.call_count == 2
+    healthy.channel.return_value.basic_publish.assert_called_once()
+
+
+@patch("app.v1.events.amqp_publisher.os.getpid")
+@patch("app.v1.events.amqp_publisher.pika.BlockingConnection")
+def test_publisher_reconnects_after_fork(mock_connection, mock_getpid):
+    mock_getpid.return_value = 100
+    publisher = EmailPublisher("amqp://localhost")
+    publisher.publish_email(MESSAGE)
+
+    mock_getpid.return_value = 101
+    publisher.publish_email(MESSAGE)
+
+    assert mock_connection.call_count == 2
+    mock_connection.return_value.close.assert_not_called()
@@ -0,0 +1,184 @@
+import threading
+
+import pytest
+from starlette.testclient import TestClient
+
+from app.asgi import create_asgi_app
+from app.core.idempotency import (
+    IdempotencyKeyMismatch,
+    IdempotencyStore,
+    IdempotentRequest,
+    IdempotentResponse,
+)
+from app.core.metrics import IDEMPOTENT_WORK_SAVED
+from app.v1.models import IdempotencyKey, OutboxMessage, User
+from config import BaseConfig
+
+PAYLOAD = {
+    "email": "idempotent@example.com",
+    "password": "password123",
+    "first_name": "Idem",
+    "last_name": "Potent",
+    "phone_number": "+8412345678",
+}
+
+
+@pytest.fixture
+def cleanup(db_session):
+    yield
+    db_session.query(IdempotencyKey).delete()
+    db_session.query(OutboxMessage).delete()
+    db_session.query(User).filter_by(email=PAYLOAD["email"]).delete()
+    db_session.commit()
+
+
+def saved(work):
+    return IDEMPOTENT_WORK_SAVED.labels("register", work)._value.get()
+
+
+def test_retry_with_the_same_key_replays_the_first_response(
+    client, db_session, cleanup
+):
+    headers = {"Idempotency-Key": "signup-1"}
+    hashes_saved = saved("password_hash")
+
+    first = client.post("/v1/auth/register", json=PAYLOAD, headers=headers)
+    retry = client.post("/v1/auth/register", json=PAYLOAD, headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json == first.json
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert saved("password_hash") == hashes_saved + 1
+    emails = (
+        db_session.query(OutboxMessage)
+        .filter(
+            OutboxMessage.routing_key == "email_queue",
+            OutboxMessage.body.contains(PAYLOAD["email"]),
+        )
+        .count()
+    )
+    assert emails == 1
+    stored = db_session.query(IdempotencyKey).filter_by(key="register:signup-1").one()
+    assert stored.status == 201
+
+
+def test_retry_is_replayed_by_another_worker(client, cleanup):
+    headers = {"Idempotency-Key": "signup-4"}
+    first = client.post("/v1/auth/register", json=PAYLOAD, headers=headers)
+
+    # A worker that never saw the first request answers from the database.
+    with TestClient(create_asgi_app(BaseConfig.TEST_DATABASE_URL, testing=True)) as (
+        asgi_client
+    ):
+        retry = asgi_client.post("/v1/auth/register", json=PAYLOAD, headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.headers["Idempotent-Replayed"] == "true"
+
+
+def test_taken_email_is_replayed_as_a_client_error(
+    client, db_session, test_user, cleanup
+):
+    payload = {**PAYLOAD, "email": test_user.email}
+    headers = {"Idempotency-Key": "signup-5"}
+    hashes_saved = saved("password_hash")
+
+    first = client.post("/v1/auth/register", json=payload, headers=headers)
+    retry = client.post("/v1/auth/register", json=payload, headers=headers)
+
+    assert first.status_code == retry.status_code == 400
+    assert "User already exists" in first.json["error"]
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert saved("password_hash") == hashes_saved + 1
+    # The 201 staged with the failed user insert was rolled back with it.
+    stored = db_session.query(IdempotencyKey).filter_by(key="register:signup-5").one()
+    assert stored.status == 400
+
+
+def test_key_reused_with_another_body_is_rejected(client, cleanup):
+    headers = {"Idempotency-Key": "signup-2"}
+    client.post("/v1/auth/register", json=PAYLOAD, headers=headers)
+
+    response = client.post(
+        "/v1/auth/register", json={**PAYLOAD, "first_name": "Other"}, headers=headers
+    )
+
+    assert response.status_code == 422
+
+
+def test_overlong_key_is_rejected(client):
+    response = client.post(
+        "/v1/auth/register", json=PAYLOAD, headers={"Idempotency-Key": "k" * 256}
+    )
+
+    assert response.status_code == 400
+
+
+def test_async_register_replays_too(cleanup):
+    app = create_asgi_app(BaseConfig.TEST_DATABASE_URL, testing=True)
+    headers = {"Idempotency-Key": "signup-3"}
+    with TestClient(app) as asgi_client:
+        first = asgi_client.post("/v1/auth/register", json=PAYLOAD, headers=headers)
+        retry = asgi_client.post("/v1/auth/register", json=PAYLOAD, headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.headers["Idempotent-Replayed"] == "true"
+
+
+def test_concurrent_requests_share_one_execution(db_session):
+    store = IdempotencyStore()
+    request = IdempotentRequest("test", None, "same-body")
+    started, joined, release = threading.Event(), threading.Event(), threading.Event()
+    # Called by a request joining the flight in progress, before it waits.
+    store._check_fingerprint = lambda *_: joined.set()
+    calls = []
+
+    def work():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return IdempotentResponse({"ok": True}, 201)
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(store.execute(request, work, db_session))
+        )
+        for _ in range(2)
+    ]
+    threads[0].start()
+    assert started.wait(5)
+    threads[1].start()
+    assert joined.wait(5)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert sorted(result.replayed for result in results) == [False, True]
+
+
+def test_server_errors_are_not_replayed(db_session, cleanup):
+    store = IdempotencyStore()
+    request = IdempotentRequest("test", "key", "body")
+    responses = iter(
+        [IdempotentResponse({"error": "down"}, 500), IdempotentResponse({}, 201)]
+    )
+
+    def execute(request):
+        return store.execute(request, lambda: next(responses), db_session)
+
+    assert execute(request).status == 500
+    assert execute(request).status == 201
+    assert execute(request).replayed
+    with pytest.raises(IdempotencyKeyMismatch):
+        execute(IdempotentRequest("test", "key", "other body"))
+
+
+def test_fingerprints_are_keyed_with_the_secret():
+    store, other = IdempotencyStore(), IdempotencyStore()
+    store.secret, other.secret = b"one", b"two"
+
+    assert store.fingerprint(PAYLOAD) == store.fingerprint(dict(PAYLOAD))
+    assert store.fingerprint(PAYLOAD) != other.fingerprint(PAYLOAD)
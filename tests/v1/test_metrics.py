@@ -0,0 +1,44 @@
+import runpy
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from prometheus_client import REGISTRY, generate_latest
+
+from app.core.metrics import PASSWORD_HASH_LATENCY
+from app.core.password_hasher import PasswordHasher
+
+
+def test_metrics_report_route_and_query_latency(client, test_user):
+    client.post(
+        "/v1/auth/login",
+        json={"email": test_user.email, "password": "wrong-password"},
+    )
+
+    body = generate_latest(REGISTRY).decode()
+
+    assert 'method="POST",route="/v1/auth/login"' in body
+    assert 'db_query_duration_seconds_count{operation="SELECT"}' in body
+    assert 'password_hash_duration_seconds_count{operation="verify"}' in body
+
+
+def test_metrics_are_not_served_on_the_api_port(client):
+    assert client.get("/metrics").status_code == 404
+
+
+def test_gunicorn_serves_metrics_on_the_metrics_port(monkeypatch, tmp_path):
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    monkeypatch.setenv("METRICS_PORT", "9123")
+    hooks = runpy.run_path(str(Path(__file__).parents[2] / "gunicorn.conf.py"))
+
+    with patch("prometheus_client.start_http_server") as start_http_server:
+        hooks["when_ready"](MagicMock())
+
+    start_http_server.assert_called_once()
+    assert start_http_server.call_args.args == (9123,)
+
+
+def test_password_hasher_observes_hash_time():
+    child = PASSWORD_HASH_LATENCY.labels("hash")
+    before = child._sum.get()
+    PasswordHasher(rounds=4).hash("password123")
+    assert child._sum.get() > before
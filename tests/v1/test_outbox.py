@@ -0,0 +1,56 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from pika.exceptions import AMQPError
+
+from app.v1.events.amqp_publisher import AmqpMessage
+from app.v1.events.outbox_relay import OutboxRelay
+from app.v1.models import OutboxMessage
+from app.v1.repositories.outbox_repository import OutboxRepository
+
+
+def stage_messages(db_session, count):
+    # Start from an empty outbox: other tests leave user events behind.
+    db_session.query(OutboxMessage).delete()
+    outbox_repo = OutboxRepository(db_session)
+    for i in range(count):
+        outbox_repo.add(
+            AmqpMessage(routing_key="email_queue", body=json.dumps({"i": i}).encode())
+        )
+    db_session.commit()
+
+
+def test_relay_publishes_batch_and_deletes_rows(db_session):
+    stage_messages(db_session, 3)
+    publisher = MagicMock()
+    relay = OutboxRelay(db_session, publisher, batch_size=2)
+
+    assert relay.relay_batch() == 2
+    assert relay.relay_batch() == 1
+    assert relay.relay_batch() == 0
+
+    assert publisher.publish_batch.call_count == 2
+    first_batch = publisher.publish_batch.call_args_list[0].args[0]
+    assert [json.loads(m.body)["i"] for m in first_batch] == [0, 1]
+    second_batch = publisher.publish_batch.call_args_list[1].args[0]
+    outbox_ids = [m.headers["outbox_id"] for m in first_batch + second_batch]
+    assert outbox_ids == sorted(outbox_ids) and len(set(outbox_ids)) == 3
+    assert db_session.query(OutboxMessage).count() == 0
+    assert relay.stats.published_total == 3
+    assert relay.stats.batches_total == 2
+
+
+def test_relay_keeps_rows_when_publish_fails(db_session):
+    stage_messages(db_session, 2)
+    publisher = MagicMock()
+    publisher.publish_batch.side_effect = AMQPError()
+    relay = OutboxRelay(db_session, publisher)
+
+    with pytest.raises(AMQPError):
+        relay.relay_batch()
+
+    assert db_session.query(OutboxMessage).count() == 2
+    assert relay.stats.failures_total == 1
+    db_session.query(OutboxMessage).delete()
+    db_session.commit()
@@ -0,0 +1,59 @@
+import pytest
+from werkzeug.security import generate_password_hash
+
+from app.core.password_hasher import PasswordHasher, password_hasher
+from app.v1.models import User
+
+
+def test_cost_change_triggers_rehash():
+    old_hash = PasswordHasher("bcrypt", rounds=4).hash("secret")
+    hasher = PasswordHasher("bcrypt", rounds=5)
+
+    verified, new_hash = hasher.verify_and_update("secret", old_hash)
+    assert verified
+    assert new_hash and new_hash.startswith("$2b$05$")
+    assert hasher.verify_and_update("secret", new_hash) == (True, None)
+    assert hasher.verify_and_update("wrong", old_hash) == (False, None)
+
+
+def test_cost_defaults_and_floors_are_per_scheme():
+    assert PasswordHasher("bcrypt").hash("x").startswith("$2b$12$")
+    pbkdf2_hash = PasswordHasher("pbkdf2_sha256").hash("x")
+    assert int(pbkdf2_hash.split("$")[2]) >= 1000
+
+    with pytest.raises(ValueError):
+        PasswordHasher("pbkdf2_sha256", rounds=12)
+    with pytest.raises(ValueError):
+        PasswordHasher("bcrypt", rounds=3)
+
+
+def test_unrecognised_hash_does_not_verify():
+    assert not PasswordHasher(rounds=4).verify("secret", "fakehashedpassword")
+
+
+@pytest.fixture
+def legacy_user(db_session):
+    user = User()
+    user.email = "legacy_hash@example.com"
+    user.first_name = "Legacy"
+    user.last_name = "Hash"
+    user.phone_number = "+8412345678"
+    user.is_email_verified = True
+    user.password_hash = generate_password_hash("password123")
+    db_session.add(user)
+    db_session.commit()
+    yield user
+    db_session.delete(user)
+    db_session.commit()
+
+
+def test_login_upgrades_legacy_werkzeug_hash(client, db_session, legacy_user):
+    response = client.post(
+        "/v1/auth/login",
+        json={"email": "legacy_hash@example.com", "password": "password123"},
+    )
+
+    assert response.status_code == 200
+    db_session.refresh(legacy_user)
+    assert legacy_user.password_hash.startswith("$2b$")
+    assert password_hasher.verify("password123", legacy_user.password_hash)
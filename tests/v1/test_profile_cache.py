@@ -0,0 +1,43 @@
+from unittest.mock import patch
+
+from app.core.cache import TTLCache
+from app.core.metrics import CACHE_EVICTIONS, CACHE_LOOKUPS
+from app.v1.repositories.user_repository import UserRepository, profile_cache_key
+
+
+def test_ttl_cache_evicts_least_recently_used_and_expires():
+    cache = TTLCache("lru-test", max_size=2, ttl=10)
+    with patch("app.core.cache.time.monotonic", return_value=0):
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+        assert cache.get("b") is None
+    with patch("app.core.cache.time.monotonic", return_value=11):
+        assert cache.get("a") is None
+
+    assert cache.stats() == {
+        "hits": 1,
+        "misses": 2,
+        "evictions": 1,
+        "expirations": 1,
+        "size": 1,
+    }
+    assert CACHE_LOOKUPS.labels("lru-test", "hit")._value.get() == 1
+    assert CACHE_LOOKUPS.labels("lru-test", "miss")._value.get() == 2
+    assert CACHE_EVICTIONS.labels("lru-test", "capacity")._value.get() == 1
+    assert CACHE_EVICTIONS.labels("lru-test", "expired")._value.get() == 1
+
+
+def test_profile_is_read_through_and_invalidated_on_update(db_session, test_user):
+    cache = TTLCache("test")
+    user_repo = UserRepository(db_session, cache=cache)
+
+    assert user_repo.get_user_profile(test_user.id)["first_name"] == "first_name"
+    with patch.object(UserRepository, "get_user_by_id") as mock_get_user_by_id:
+        user_repo.get_user_profile(test_user.id)
+        mock_get_user_by_id.assert_not_called()
+
+    user_repo.update_user(test_user.id, first_name="Changed")
+    assert cache.get(profile_cache_key(test_user.id)) is None
+    assert user_repo.get_user_profile(test_user.id)["first_name"] == "Changed"
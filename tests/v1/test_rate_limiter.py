@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+from app.core.metrics import RATE_LIMIT_REJECTIONS
+from app.core.rate_limiter import (
+    InMemoryRateLimitBackend,
+    RateLimit,
+    RateLimiter,
+    login_rate_limiter,
+)
+
+
+def test_sliding_window_rejects_until_previous_window_decays():
+    backend = InMemoryRateLimitBackend()
+    rate = RateLimit(limit=2, window=60)
+
+    assert backend.hit("k", rate, now=0)[0]
+    assert backend.hit("k", rate, now=1)[0]
+    allowed, retry_after = backend.hit("k", rate, now=2)
+    assert not allowed
+    assert retry_after == 58
+
+    # A second into the next window the previous count weighs 2 * 59/60.
+    assert backend.hit("k", rate, now=61)[0]
+    assert not backend.hit("k", rate, now=62)[0]
+
+
+def test_backend_is_bounded():
+    backend = InMemoryRateLimitBackend(max_keys=2)
+    rate = RateLimit(limit=1, window=60)
+    for key in ("a", "b", "c"):
+        backend.hit(key, rate, now=0)
+
+    assert backend.hit("a", rate, now=1)[0]
+    assert not backend.hit("c", rate, now=1)[0]
+
+
+@patch("app.v1.services.auth_service.AuthService.authenticate_user")
+def test_login_is_throttled_before_authentication(
+    mock_authenticate_user, client, monkeypatch
+):
+    limiter = RateLimiter("login", login_rate_limiter.rule_settings)
+    limiter.rules = {"ip": RateLimit(100, 60), "email": RateLimit(2, 60)}
+    monkeypatch.setattr("app.v1.views.auth_view.login_rate_limiter", limiter)
+    mock_authenticate_user.side_effect = ValueError("Invalid credentials")
+
+    rejected = RATE_LIMIT_REJECTIONS.labels("login", "email")
+    rejected_before = rejected._value.get()
+    payload = {"email": "Throttled@example.com", "password": "wrong"}
+    statuses = [client.post("/v1/auth/login", json=payload) for _ in range(3)]
+
+    assert [r.status_code for r in statuses] == [500, 500, 429]
+    assert int(statuses[-1].headers["Retry-After"]) >= 1
+    assert mock_authenticate_user.call_count == 2
+    assert limiter.stats() == {"evaluated_total": 3, "rejected_total": {"email": 1}}
+    assert rejected._value.get() == rejected_before + 1
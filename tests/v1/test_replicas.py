@@ -0,0 +1,81 @@
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import create_app
+from app.core.cache import TTLCache
+from app.db.database import db
+from app.db.replicas import replica_router
+from app.v1.models import Base, User
+from app.v1.repositories.user_repository import UserRepository
+from config import BaseConfig
+
+
+def seed(engine, first_name):
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        user = User()
+        user.id = 1
+        user.email = "replica@example.com"
+        user.first_name = first_name
+        user.last_name = "User"
+        user.phone_number = "+8412345678"
+        user.password_hash = "fakehashedpassword"
+        session.add(user)
+        session.commit()
+
+
+def make_app(tmp_path, replica_urls):
+    with patch.object(BaseConfig, "DATABASE_REPLICA_URLS", replica_urls):
+        app = create_app(f"sqlite:///{tmp_path / 'primary.db'}", testing=True)
+    with app.app_context():
+        seed(db.engines[None], "Primary")
+    return app
+
+
+def lookup_first_name(app):
+    with app.app_context():
+        return UserRepository(db.session).get_user_by_id(1).first_name
+
+
+@pytest.fixture
+def replica_app(tmp_path):
+    urls = [f"sqlite:///{tmp_path / f'replica{i}.db'}" for i in range(2)]
+    app = make_app(tmp_path, urls)
+    with app.app_context():
+        for i in range(2):
+            seed(db.engines[f"replica_{i}"], f"Replica{i}")
+    return app
+
+
+def test_lookups_round_robin_over_replicas(replica_app):
+    names = [lookup_first_name(replica_app) for _ in range(4)]
+    assert names == ["Replica0", "Replica1", "Replica0", "Replica1"]
+
+
+def test_reads_after_a_write_stay_on_primary(replica_app):
+    with replica_app.app_context():
+        repo = UserRepository(db.session)
+        assert repo.get_user_by_id(1).first_name.startswith("Replica")
+        repo.update_password_hash(1, "newhash")
+        db.session.expire_all()
+        assert repo.get_user_by_id(1).first_name == "Primary"
+
+
+def test_profiles_read_the_primary_when_they_are_cached(replica_app):
+    with replica_app.app_context():
+        cached = UserRepository(db.session, cache=TTLCache("test"))
+        assert cached.get_user_profile(1)["first_name"] == "Primary"
+        assert cached.get_user_profiles([1])[1]["first_name"] == "Primary"
+
+        uncached = UserRepository(db.session)
+        assert uncached.get_user_profile(1)["first_name"].startswith("Replica")
+
+
+def test_unreachable_replica_falls_back_to_primary(tmp_path):
+    app = make_app(tmp_path, [f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"])
+
+    assert lookup_first_name(app) == "Primary"
+    with app.app_context():
+        assert replica_router.pick(db.engines) is None
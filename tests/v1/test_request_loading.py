@@ -0,0 +1,66 @@
+from datetime import datetime
+
+import pytest
+import pytz
+from flask import Flask
+from marshmallow.exceptions import ValidationError
+
+from app.core.json_provider import OrjsonProvider
+from app.v1.schemas.auth_schema import RegisterRequest
+from app.v1.schemas.loader import RequestLoader
+from app.v1.schemas.user_schema import BatchGetUsersRequest, UserUpdateRequest
+
+REGISTER_PAYLOAD = {
+    "email": "loader@example.com",
+    "password": "password123",
+    "first_name": "Load",
+    "last_name": "Er",
+    "phone_number": "+8412345678",
+    "unknown": "ignored",
+}
+
+
+@pytest.mark.parametrize(
+    "cls, payload",
+    [
+        (RegisterRequest, REGISTER_PAYLOAD),
+        (UserUpdateRequest, {"first_name": "Only"}),
+        (UserUpdateRequest, {"last_name": None}),
+        (BatchGetUsersRequest, {"ids": [3, 1, 2]}),
+        (BatchGetUsersRequest, {"ids": ["3", 1]}),
+    ],
+)
+def test_loads_the_same_dataclass_as_the_schema(cls, payload):
+    loader = RequestLoader(cls)
+
+    assert loader.load(payload) == loader.schema.load(payload)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {key: value for key, value in REGISTER_PAYLOAD.items() if key != "email"},
+        dict(REGISTER_PAYLOAD, password=None),
+        dict(REGISTER_PAYLOAD, password=123),
+        [],
+    ],
+)
+def test_invalid_payloads_raise_the_schema_errors(payload):
+    with pytest.raises(ValidationError):
+        RequestLoader(RegisterRequest).load(payload)
+
+
+def test_orjson_provider_matches_the_stdlib_output():
+    app = Flask(__name__)
+    value = {
+        "created_at": datetime(2026, 1, 2, 3, 4, 5, tzinfo=pytz.utc),
+        "ids": [1, 2],
+        "name": "Ünïcode",
+    }
+    stdlib = app.json.loads(app.json.dumps(value))
+    app.json = OrjsonProvider(app)
+
+    assert app.json.loads(app.json.dumps(value)) == stdlib
+    with app.app_context():
+        assert app.json.loads(app.json.response(value).get_data()) == stdlib
+    assert app.json.dumps(2**70) == str(2**70)
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+
+from app.core.error_handlers import ValidationException
+from app.core.token_denylist import token_denylist
+from app.v1.models import User
+from app.v1.repositories.user_repository import (
+    UserRepository,
+    verification_token_digest,
+)
+
+
+@pytest.fixture
+def unverified_user(db_session):
+    user = User()
+    user.email = "round-trip@example.com"
+    user.first_name = "Round"
+    user.last_name = "Trip"
+    user.phone_number = "+8412345678"
+    user.password_hash = "fakehashedpassword"
+    user.verification_token_hash = verification_token_digest("round-trip-token")
+    user.verification_token_expiry = datetime.now(tz=pytz.utc) + timedelta(hours=1)
+    db_session.add(user)
+    db_session.commit()
+    yield user
+    db_session.delete(user)
+    db_session.commit()
+
+
+def test_profile_update_is_one_update_returning_and_its_event(
+    authorized_client, test_user, statements, monkeypatch
+):
+    # No denylist refresh falls due during the test.
+    monkeypatch.setattr(token_denylist, "sync_interval", 3600)
+    # Caches the token state and loads the denylist filter, so the PUT is
+    # authorised without a query: the token carries a jti, and the
+    # revocation check answers from the filter.
+    authorized_client.get("/v1/users/profile")
+    statements.clear()
+
+    response = authorized_client.put("/v1/users/profile", json={"last_name": "New"})
+
+    assert response.status_code == 200
+    assert response.json["user"] == {
+        "id": test_user.id,
+        "email": test_user.email,
+        "first_name": "first_name",
+        "last_name": "New",
+        "phone_number": "+8412345678",
+    }
+    # The user.updated event is staged in the outbox in the same transaction.
+    assert len(statements) == 2
+    assert statements[0].lstrip().upper().startswith("UPDATE")
+    assert "RETURNING" in statements[0].upper()
+    assert statements[1].lstrip().upper().startswith("INSERT INTO OUTBOX_MESSAGES")
+    assert authorized_client.get("/v1/users/profile").json["last_name"] == "New"
+
+
+def test_update_user_accepts_only_profile_fields(db_session, test_user):
+    with pytest.raises(ValidationException):
+        UserRepository(db_session).update_user(test_user.id, is_admin=True)
+    assert UserRepository(db_session).update_user(999_999, first_name="x") is None
+
+
+def test_verify_email_is_one_conditional_update_and_its_event(
+    client, db_session, unverified_user, statements
+):
+    response = client.get("/v1/auth/verify-email?token=round-trip-token")
+
+    assert response.status_code == 200
+    assert len(statements) == 2
+    assert statements[0].lstrip().upper().startswith("UPDATE")
+    assert statements[1].lstrip().upper().startswith("INSERT INTO OUTBOX_MESSAGES")
+    db_session.expire_all()
+    user = db_session.get(User, unverified_user.id)
+    assert user.is_email_verified
+    assert user.verification_token_hash is None
+
+    reused = client.get("/v1/auth/verify-email?token=round-trip-token")
+    assert "Invalid or expired token" in reused.json["error"]
+
+
+def test_verify_email_rejects_an_expired_token(db_session, unverified_user):
+    unverified_user.verification_token_expiry = datetime.now(tz=pytz.utc) - timedelta(
+        minutes=1
+    )
+    db_session.commit()
+
+    with pytest.raises(Exception, match="Invalid or expired token"):
+        UserRepository(db_session).verify_email("round-trip-token")
+    db_session.expire_all()
+    assert not db_session.get(User, unverified_user.id).is_email_verified
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+import pytz
+from sqlalchemy import event
+
+from app.v1.events.amqp_publisher import AmqpMessage
+from app.v1.models import OutboxMessage, User
+from app.v1.repositories.outbox_repository import OutboxRepository
+from app.v1.repositories.user_repository import UserRepository
+
+
+def as_utc(value):
+    return value if value.tzinfo else value.replace(tzinfo=pytz.utc)
+
+
+def test_insert_returns_the_database_timestamps(db_engine, db_session):
+    statements = []
+
+    def record(_conn, _cursor, statement, *_):
+        statements.append(statement)
+
+    user = User()
+    user.email = "timestamps@example.com"
+    user.first_name = "Time"
+    user.last_name = "Stamp"
+    user.phone_number = "+8412345678"
+    user.password_hash = "fakehashedpassword"
+    event.listen(db_engine, "before_cursor_execute", record)
+    try:
+        db_session.add(user)
+        db_session.flush()
+        created_at = user.created_at
+    finally:
+        event.remove(db_engine, "before_cursor_execute", record)
+
+    # Fetched by the INSERT itself, not computed at import time.
+    assert len(statements) == 1
+    assert "RETURNING" in statements[0].upper()
+    assert abs(datetime.now(tz=pytz.utc) - as_utc(created_at)) < timedelta(minutes=1)
+    db_session.rollback()
+
+
+def test_update_bumps_updated_at(db_session, test_user):
+    stale = datetime(2000, 1, 1, tzinfo=pytz.utc)
+    db_session.query(User).filter(User.id == test_user.id).update(
+        {User.updated_at: stale}, synchronize_session=False
+    )
+    db_session.commit()
+
+    UserRepository(db_session).update_user(test_user.id, first_name="Bumped")
+
+    db_session.expire_all()
+    updated_at = as_utc(db_session.get(User, test_user.id).updated_at)
+    assert updated_at > stale + timedelta(days=1)
+
+
+def test_outbox_rows_get_created_at_from_the_database(db_session):
+    message = AmqpMessage(routing_key="email_queue", body=b"{}")
+    OutboxRepository(db_session).add_many([message, message])
+    db_session.flush()
+
+    rows = db_session.query(OutboxMessage).filter_by(body="{}").all()
+    assert len(rows) == 2
+    assert all(row.created_at is not None for row in rows)
+    db_session.rollback()
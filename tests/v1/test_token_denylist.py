@@ -0,0 +1,163 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from flask_jwt_extended import decode_token
+
+from app.core.password_hasher import PasswordHasher
+from app.core.token_denylist import (
+    BloomFilter,
+    DatabaseDenylistStore,
+    InMemoryDenylistStore,
+    TokenDenylist,
+    token_denylist,
+)
+from app.v1.models import RevokedToken, User
+from app.v1.repositories.revoked_token_repository import RevokedTokenRepository
+
+
+@pytest.fixture
+def login_tokens(client, db_session):
+    user = User()
+    user.email = "refresh@example.com"
+    user.first_name = "Refresh"
+    user.last_name = "User"
+    user.phone_number = "+8412345678"
+    user.is_email_verified = True
+    user.password_hash = PasswordHasher(rounds=4).hash("password123")
+    db_session.add(user)
+    db_session.commit()
+
+    response = client.post(
+        "/v1/auth/login",
+        json={"email": "refresh@example.com", "password": "password123"},
+    )
+    yield response.json
+
+    db_session.delete(user)
+    db_session.commit()
+
+
+def bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_store_evicts_expired_entries():
+    store = InMemoryDenylistStore()
+    with patch("app.core.token_denylist.time.time", return_value=100):
+        store.add(None, "old", expires_at=150)
+        store.add(None, "new", expires_at=300)
+    with patch("app.core.token_denylist.time.time", return_value=200):
+        assert not store.contains(None, "old")
+        assert store.contains(None, "new")
+        assert not store.add(None, "new", expires_at=300)
+        store.add(None, "newer", expires_at=400)
+        assert len(store) == 2
+
+
+def test_bloom_front_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000)
+    for i in range(1000):
+        bloom.add(f"jti-{i}")
+    assert all(f"jti-{i}" in bloom for i in range(1000))
+
+    store = InMemoryDenylistStore()
+    denylist = TokenDenylist(store)
+    assert denylist.store is store
+    denylist.use_bloom = True
+    denylist.revoke(None, "revoked", expires_at=2**40)
+    assert denylist.is_revoked(None, "revoked")
+    assert not denylist.is_revoked(None, "live")
+
+
+def test_bloom_front_is_refreshed_in_the_background():
+    store = InMemoryDenylistStore()
+    denylist = TokenDenylist(store)
+    denylist.use_bloom = True
+    denylist.sync_interval = 0
+    assert not denylist.is_revoked(None, "elsewhere")
+    # Revoked by another worker sharing the store.
+    store.add(None, "elsewhere", expires_at=2**40)
+
+    # The check answers from the filter it has while a refresh loads.
+    assert not denylist.is_revoked(None, "elsewhere")
+    for thread in threading.enumerate():
+        if thread.name == "token-denylist-refresh":
+            thread.join(5)
+
+    assert denylist.is_revoked(None, "elsewhere")
+
+
+def test_unrevoked_token_check_needs_no_query(
+    client, login_tokens, statements, monkeypatch
+):
+    monkeypatch.setattr(token_denylist, "sync_interval", 3600)
+    headers = bearer(login_tokens["access_token"])
+    assert client.get("/v1/users/profile", headers=headers).status_code == 200
+    statements.clear()
+
+    assert client.get("/v1/users/profile", headers=headers).status_code == 200
+
+    assert not [s for s in statements if "revoked_tokens" in s]
+
+
+def test_database_store_is_shared_and_revokes_once(db_session):
+    first, second = TokenDenylist(), TokenDenylist()
+    assert isinstance(first.store, DatabaseDenylistStore)
+    expires_at = time.time() + 60
+
+    assert first.revoke(db_session, "shared-jti", expires_at)
+    assert second.is_revoked(db_session, "shared-jti")
+    assert not second.revoke(db_session, "shared-jti", expires_at)
+    assert not first.is_revoked(db_session, "other-jti")
+
+    db_session.query(RevokedToken).filter_by(jti="shared-jti").delete()
+    db_session.commit()
+
+
+def test_purge_deletes_only_expired_revocations(db_session):
+    repo = RevokedTokenRepository(db_session)
+    repo.revoke("expired-jti", time.time() - 60)
+    repo.revoke("live-jti", time.time() + 60)
+
+    assert repo.purge_expired(batch_size=1) >= 1
+
+    remaining = {token.jti for token in db_session.query(RevokedToken)}
+    assert "expired-jti" not in remaining
+    assert "live-jti" in remaining
+    db_session.query(RevokedToken).delete()
+    db_session.commit()
+
+
+def test_refresh_already_rotated_elsewhere_is_rejected(
+    app, client, db_session, login_tokens
+):
+    refresh_token = login_tokens["refresh_token"]
+    with app.app_context():
+        claims = decode_token(refresh_token)
+    # Another worker rotated the same token between our checks.
+    TokenDenylist().revoke(db_session, claims["jti"], claims["exp"])
+
+    response = client.post("/v1/auth/refresh", headers=bearer(refresh_token))
+
+    assert response.status_code == 401
+
+
+def test_refresh_rotates_and_old_refresh_token_is_rejected(client, login_tokens):
+    refresh_token = login_tokens["refresh_token"]
+
+    response = client.post("/v1/auth/refresh", headers=bearer(refresh_token))
+    assert response.status_code == 200
+    assert response.json["refresh_token"] != refresh_token
+
+    reused = client.post("/v1/auth/refresh", headers=bearer(refresh_token))
+    assert reused.status_code == 401
+
+
+def test_logout_revokes_access_token(client, login_tokens):
+    headers = bearer(login_tokens["access_token"])
+    assert client.get("/v1/users/profile", headers=headers).status_code == 200
+
+    assert client.post("/v1/auth/logout", headers=headers).status_code == 200
+    assert client.get("/v1/users/profile", headers=headers).status_code == 401
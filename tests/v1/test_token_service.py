@@ -0,0 +1,113 @@
+from unittest.mock import patch
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app.core.cache import TTLCache, token_state_cache
+from app.core.password_hasher import password_hasher
+from app.v1.models import OutboxMessage, User
+from app.v1.repositories.user_repository import UserRepository
+from app.v1.services.token_service import TokenService
+
+
+def test_current_version_is_resolved_from_cache(db_session, test_user):
+    service = TokenService(db_session, TTLCache("test"))
+
+    assert service.resolve_subject(test_user.id, 0).token_version == 0
+    with patch.object(UserRepository, "get_token_state") as mock_get_token_state:
+        assert service.resolve_subject(test_user.id, 0) is not None
+        assert service.resolve_subject(test_user.id, -1) is None
+        mock_get_token_state.assert_not_called()
+
+
+def test_revoked_token_is_rejected(authorized_client, db_session, test_user):
+    assert authorized_client.get("/v1/users/profile").status_code == 200
+
+    TokenService(db_session, token_state_cache).revoke_user_tokens(test_user.id)
+
+    response = authorized_client.get("/v1/users/profile")
+    assert response.status_code == 401
+
+
+def test_deactivated_user_is_rejected(authorized_client, db_session, test_user):
+    TokenService(db_session, token_state_cache).revoke_user_tokens(
+        test_user.id, deactivate=True
+    )
+    db_session.refresh(test_user)
+
+    assert not test_user.is_active
+    assert authorized_client.get("/v1/users/profile").status_code == 401
+
+
+@pytest.fixture
+def admin_headers(app, db_session):
+    admin = User()
+    admin.email = "token-admin@example.com"
+    admin.first_name = "Token"
+    admin.last_name = "Admin"
+    admin.phone_number = "+8412345678"
+    admin.password_hash = "fakehashedpassword"
+    admin.is_admin = True
+    db_session.add(admin)
+    db_session.commit()
+    with app.app_context():
+        token = create_access_token(
+            identity=str(admin.id), additional_claims={"ver": 0, "adm": True}
+        )
+    yield {"Authorization": f"Bearer {token}"}
+    db_session.query(OutboxMessage).delete()
+    db_session.delete(admin)
+    db_session.commit()
+
+
+def test_password_change_revokes_old_tokens(authorized_client, db_session, test_user):
+    test_user.password_hash = password_hasher.hash("old-password")
+    db_session.commit()
+    body = {"current_password": "old-password", "new_password": "new-password"}
+
+    wrong = authorized_client.put(
+        "/v1/users/password", json={**body, "current_password": "guess"}
+    )
+    assert wrong.status_code == 400
+    assert authorized_client.get("/v1/users/profile").status_code == 200
+
+    response = authorized_client.put("/v1/users/password", json=body)
+
+    assert response.status_code == 200
+    assert authorized_client.get("/v1/users/profile").status_code == 401
+    db_session.refresh(test_user)
+    assert password_hasher.verify("new-password", test_user.password_hash)
+
+
+@pytest.mark.parametrize("change", [{"is_active": False}, {"is_admin": False}])
+def test_admin_access_change_revokes_old_tokens(
+    client, admin_headers, authorized_client, test_user, change
+):
+    assert authorized_client.get("/v1/users/profile").status_code == 200
+
+    response = client.patch(
+        f"/v1/users/{test_user.id}", json=change, headers=admin_headers
+    )
+
+    assert response.status_code == 200
+    assert authorized_client.get("/v1/users/profile").status_code == 401
+
+
+def test_demoted_admin_token_loses_admin_access(client, admin_headers, db_session):
+    admin_id = db_session.query(User.id).filter_by(email="token-admin@example.com")
+    response = client.patch(
+        f"/v1/users/{admin_id.scalar()}",
+        json={"is_admin": False},
+        headers=admin_headers,
+    )
+
+    assert response.status_code == 200
+    assert client.get("/v1/users", headers=admin_headers).status_code == 401
+
+
+def test_access_change_for_unknown_user(client, admin_headers):
+    response = client.patch(
+        "/v1/users/999999", json={"is_active": False}, headers=admin_headers
+    )
+
+    assert response.status_code == 404
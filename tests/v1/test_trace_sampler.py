@@ -0,0 +1,33 @@
+import pytest
+
+from app.extensions.sentry import TraceSampler, parse_route_rates
+
+
+def context(path, parent_sampled=None):
+    return {"wsgi_environ": {"PATH_INFO": path}, "parent_sampled": parent_sampled}
+
+
+def test_parse_route_rates_orders_longest_prefix_first():
+    assert parse_route_rates("/v1=0.5, /v1/auth/login=0.1,") == [
+        ("/v1/auth/login", 0.1),
+        ("/v1", 0.5),
+    ]
+
+
+@pytest.mark.parametrize(
+    "path, parent_sampled, expected",
+    [
+        ("/v1/auth/login", None, 0.1),
+        ("/v1/users/profile", None, 0.5),
+        ("/other", None, 0.01),
+        ("/other", True, 1.0),
+        ("/v1/auth/login", False, 0.0),
+        ("/metrics", True, 0.0),
+    ],
+)
+def test_sampler_decisions(path, parent_sampled, expected):
+    sampler = TraceSampler(
+        0.01, parse_route_rates("/v1=0.5,/v1/auth/login=0.1"), ["/metrics"]
+    )
+
+    assert sampler(context(path, parent_sampled)) == expected
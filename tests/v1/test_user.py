@@ -1,5 +1,19 @@
 from unittest.mock import patch
 
+import pytest
+
+from app.core.error_handlers import ValidationException
+from app.v1.models import OutboxMessage, User
+from app.v1.repositories.user_repository import UserRepository
+from app.v1.schemas.auth_schema import RegisterRequest
+
+REGISTER_PAYLOAD = {
+    "password": "password123",
+    "first_name": "Case",
+    "last_name": "User",
+    "phone_number": "+8412345678",
+}
+
 
 @patch("app.v1.events.email_publisher.EmailPublisher.publish_email")
 def test_register_success(mock_publish_email, client, db_session):
@@ -16,7 +30,55 @@ def test_register_success(mock_publish_email, client, db_session):
     )
     assert response.status_code == 201
     assert "message" in response.json
-    mock_publish_email.assert_called_once()
+    # The email is relayed from the outbox, not published inside the request.
+    mock_publish_email.assert_not_called()
+    outbox_message = (
+        db_session.query(OutboxMessage)
+        .filter(
+            OutboxMessage.routing_key == "email_queue",
+            OutboxMessage.body.contains("test@example.com"),
+        )
+        .one()
+    )
+    assert outbox_message.routing_key == "email_queue"
+
+
+def test_register_rejects_email_differing_only_by_case(client, db_session, statements):
+    first = client.post(
+        "/v1/auth/register", json={**REGISTER_PAYLOAD, "email": "Case@Example.com"}
+    )
+    second = client.post(
+        "/v1/auth/register", json={**REGISTER_PAYLOAD, "email": "case@EXAMPLE.com"}
+    )
+
+    assert first.status_code == 201
+    assert second.status_code == 400
+    assert "User already exists" in second.json["error"]
+    # Duplicates are caught by the unique index, not a lookup beforehand.
+    assert not [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+
+    user = db_session.query(User).filter_by(email="case@example.com").one()
+    db_session.query(OutboxMessage).delete()
+    db_session.delete(user)
+    db_session.commit()
+
+
+def test_other_unique_violations_are_not_reported_as_duplicates(db_session):
+    repo = UserRepository(db_session)
+    first = repo.create_user(
+        RegisterRequest(email="token-one@example.com", **REGISTER_PAYLOAD), "same"
+    )
+
+    with pytest.raises(Exception) as error:
+        repo.create_user(
+            RegisterRequest(email="token-two@example.com", **REGISTER_PAYLOAD), "same"
+        )
+
+    assert not isinstance(error.value, ValidationException)
+    assert "Error creating user" in str(error.value)
+    db_session.query(OutboxMessage).delete()
+    db_session.delete(first)
+    db_session.commit()
 
 
 def test_update_user_info(authorized_client, db_session, test_user):
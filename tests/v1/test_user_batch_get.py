@@ -0,0 +1,81 @@
+import pytest
+
+from app.core.cache import profile_cache
+from app.v1.models import User
+from app.v1.repositories.user_repository import profile_cache_key
+
+SERVICE_TOKEN = "test-service-token"
+
+
+@pytest.fixture
+def service_headers(app):
+    app.config["INTERNAL_SERVICE_TOKENS"] = [SERVICE_TOKEN]
+    yield {"Authorization": f"Bearer {SERVICE_TOKEN}"}
+    app.config["INTERNAL_SERVICE_TOKENS"] = []
+
+
+@pytest.fixture
+def batch_users(db_session):
+    users = []
+    for i in range(3):
+        user = User()
+        user.email = f"batch-{i}@example.com"
+        user.first_name = "Batch"
+        user.last_name = str(i)
+        user.phone_number = "+8412345678"
+        user.password_hash = "fakehashedpassword"
+        db_session.add(user)
+        users.append(user)
+    db_session.commit()
+    yield users
+    for user in users:
+        db_session.delete(user)
+    db_session.commit()
+
+
+def test_returns_profiles_in_request_order(client, service_headers, batch_users):
+    ids = [batch_users[2].id, 999_999, batch_users[0].id, batch_users[2].id]
+    response = client.post(
+        "/v1/internal/users:batchGet", json={"ids": ids}, headers=service_headers
+    )
+
+    assert response.status_code == 200
+    assert [user["id"] for user in response.json["users"]] == [
+        batch_users[2].id,
+        batch_users[0].id,
+    ]
+    assert response.json["missing_ids"] == [999_999]
+    assert response.headers["Server-Timing"].startswith("lookup;dur=")
+
+
+def test_serves_cached_profiles_and_caches_the_rest(
+    client, service_headers, batch_users
+):
+    cached = {"id": batch_users[0].id, "email": "from-cache@example.com"}
+    profile_cache.set(profile_cache_key(batch_users[0].id), cached)
+
+    response = client.post(
+        "/v1/internal/users:batchGet",
+        json={"ids": [batch_users[0].id, batch_users[1].id]},
+        headers=service_headers,
+    )
+
+    assert response.json["users"][0] == cached
+    assert profile_cache.get(profile_cache_key(batch_users[1].id)) is not None
+
+
+def test_rejects_missing_or_wrong_service_token(client, service_headers):
+    for headers in ({}, {"Authorization": "Bearer wrong"}):
+        response = client.post(
+            "/v1/internal/users:batchGet", json={"ids": [1]}, headers=headers
+        )
+        assert response.status_code == 401
+
+
+def test_rejects_empty_and_oversized_batches(app, client, service_headers):
+    max_ids = app.config["INTERNAL_BATCH_MAX_IDS"]
+    for ids in ([], list(range(1, max_ids + 2)), ["x"]):
+        response = client.post(
+            "/v1/internal/users:batchGet", json={"ids": ids}, headers=service_headers
+        )
+        assert response.status_code == 400
@@ -0,0 +1,206 @@
+import json
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+import pytz
+from sqlalchemy import update
+
+from app.v1.events.outbox_relay import OutboxRelay
+from app.v1.events.user_events import (
+    USER_CREATED,
+    USER_EVENTS_EXCHANGE,
+    USER_UPDATED,
+    USER_VERIFIED,
+    UserEvent,
+    build_user_event_messages,
+)
+from app.v1.models import OutboxMessage, User
+from app.v1.repositories.user_repository import UserRepository
+from app.v1.schemas.auth_schema import RegisterRequest
+
+SERVICE_TOKEN = "test-service-token"
+
+
+def last_event_body(db_session, routing_key):
+    message = (
+        db_session.query(OutboxMessage)
+        .filter_by(exchange=USER_EVENTS_EXCHANGE, routing_key=routing_key)
+        .order_by(OutboxMessage.id.desc())
+        .first()
+    )
+    return json.loads(message.body)
+
+
+@pytest.fixture
+def service_headers(app):
+    app.config["INTERNAL_SERVICE_TOKENS"] = [SERVICE_TOKEN]
+    yield {"Authorization": f"Bearer {SERVICE_TOKEN}"}
+    app.config["INTERNAL_SERVICE_TOKENS"] = []
+
+
+@pytest.fixture
+def feed_users(db_session):
+    users = []
+    for i in range(4):
+        user = User()
+        user.email = f"feed-{i}@example.com"
+        user.first_name = "Feed"
+        user.last_name = str(i)
+        user.phone_number = "+8412345678"
+        user.password_hash = "fakehashedpassword"
+        db_session.add(user)
+        users.append(user)
+    db_session.commit()
+    # Three settled changes, long before anything else in the table, and one
+    # too recent to be served.
+    changed_at = datetime(2000, 1, 1, tzinfo=pytz.utc)
+    for user, updated_at in zip(
+        users,
+        [changed_at, changed_at, changed_at + timedelta(seconds=1), None],
+    ):
+        db_session.execute(
+            update(User)
+            .where(User.id == user.id)
+            .values(updated_at=updated_at or datetime.now(tz=pytz.utc))
+        )
+    db_session.commit()
+    yield users
+    for user in users:
+        db_session.delete(user)
+    db_session.commit()
+
+
+def test_events_are_batched_per_type():
+    messages = build_user_event_messages(
+        [
+            UserEvent(USER_UPDATED, 1, {"first_name": "A"}),
+            UserEvent(USER_VERIFIED, 2),
+            UserEvent(USER_UPDATED, 2, {"last_name": "B"}),
+        ]
+    )
+
+    assert [message.routing_key for message in messages] == [
+        USER_UPDATED,
+        USER_VERIFIED,
+    ]
+    assert all(message.exchange == USER_EVENTS_EXCHANGE for message in messages)
+    body = json.loads(messages[0].body)
+    assert body["v"] == 1
+    assert body["events"] == [
+        {"id": 1, "data": {"first_name": "A"}},
+        {"id": 2, "data": {"last_name": "B"}},
+    ]
+
+
+def test_create_update_and_verify_stage_events(db_session):
+    user = UserRepository(db_session).create_user(
+        RegisterRequest(
+            email="Events@Example.com",
+            password="fakehashedpassword",
+            first_name="Event",
+            last_name="Sourced",
+            phone_number="+8412345678",
+        ),
+        "events-token",
+    )
+
+    assert last_event_body(db_session, USER_CREATED)["events"] == [
+        {
+            "id": user.id,
+            "data": {
+                "email": "events@example.com",
+                "first_name": "Event",
+                "last_name": "Sourced",
+                "phone_number": "+8412345678",
+                "is_email_verified": False,
+            },
+        }
+    ]
+
+    UserRepository(db_session).update_user(user.id, last_name="Driven")
+    assert last_event_body(db_session, USER_UPDATED)["events"] == [
+        {"id": user.id, "data": {"last_name": "Driven"}}
+    ]
+
+    UserRepository(db_session).verify_email("events-token")
+    assert last_event_body(db_session, USER_VERIFIED)["events"] == [
+        {"id": user.id, "data": {}}
+    ]
+
+    db_session.query(OutboxMessage).delete()
+    db_session.delete(user)
+    db_session.commit()
+
+
+def test_relayed_events_carry_increasing_versions(db_session):
+    user = UserRepository(db_session).create_user(
+        RegisterRequest(
+            email="versions@example.com",
+            password="fakehashedpassword",
+            first_name="Event",
+            last_name="Versioned",
+            phone_number="+8412345678",
+        ),
+        "versions-token",
+    )
+    user_id = user.id
+    for last_name in ("First", "Second"):
+        UserRepository(db_session).update_user(user_id, last_name=last_name)
+    publisher = MagicMock()
+
+    OutboxRelay(db_session, publisher).relay_batch()
+
+    versions = {
+        json.loads(message.body)["events"][0]["data"].get("last_name"): message.headers[
+            "outbox_id"
+        ]
+        for message in publisher.publish_batch.call_args.args[0]
+        if message.routing_key == USER_UPDATED
+    }
+    assert versions["First"] < versions["Second"]
+
+    db_session.query(OutboxMessage).delete()
+    db_session.query(User).filter_by(id=user_id).delete()
+    db_session.commit()
+
+
+def test_changes_page_through_settled_changes_in_order(
+    client, service_headers, feed_users
+):
+    first = client.get("/v1/internal/users/changes?limit=2", headers=service_headers)
+
+    assert first.status_code == 200
+    assert [user["id"] for user in first.json["users"]] == [
+        feed_users[0].id,
+        feed_users[1].id,
+    ]
+    assert first.json["users"][0]["last_name"] == "0"
+
+    second = client.get(
+        "/v1/internal/users/changes",
+        query_string={"limit": 1, "cursor": first.json["next_cursor"]},
+        headers=service_headers,
+    )
+    assert [user["id"] for user in second.json["users"]] == [feed_users[2].id]
+
+    rest = client.get(
+        "/v1/internal/users/changes",
+        query_string={"limit": 1000, "cursor": second.json["next_cursor"]},
+        headers=service_headers,
+    )
+    assert feed_users[3].id not in [user["id"] for user in rest.json["users"]]
+
+
+def test_changes_require_a_service_token(client):
+    response = client.get("/v1/internal/users/changes")
+
+    assert response.status_code == 401
+
+
+def test_changes_reject_a_bad_cursor(client, service_headers):
+    response = client.get(
+        "/v1/internal/users/changes?cursor=not-a-cursor", headers=service_headers
+    )
+
+    assert response.status_code == 400
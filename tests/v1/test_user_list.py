@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+from flask_jwt_extended import create_access_token
+
+from app.v1.models import User
+
+
+@pytest.fixture
+def listed_users(db_session):
+    start = datetime(2026, 1, 1, tzinfo=pytz.utc)
+    users = []
+    for i in range(5):
+        user = User()
+        user.email = f"list-{i}@example.com"
+        user.first_name = "List"
+        user.last_name = str(i)
+        user.phone_number = "+8412345678"
+        user.password_hash = "fakehashedpassword"
+        user.is_admin = i == 0
+        user.is_email_verified = i % 2 == 0
+        user.created_at = start + timedelta(minutes=i)
+        db_session.add(user)
+        users.append(user)
+    db_session.commit()
+    yield users
+    for user in users:
+        db_session.delete(user)
+    db_session.commit()
+
+
+def token_headers(app, user):
+    with app.app_context():
+        token = create_access_token(
+            identity=str(user.id), additional_claims={"ver": 0, "adm": user.is_admin}
+        )
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_pages_cover_matches_newest_first(app, client, listed_users):
+    headers = token_headers(app, listed_users[0])
+    emails, cursor, pages = [], None, 0
+    while True:
+        params = {"email_prefix": "LIST-", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/v1/users", query_string=params, headers=headers)
+        assert response.status_code == 200
+        emails += [user["email"] for user in response.json["users"]]
+        cursor = response.json["next_cursor"]
+        pages += 1
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert emails == [f"list-{i}@example.com" for i in reversed(range(5))]
+
+
+def test_boolean_filters(app, client, listed_users):
+    response = client.get(
+        "/v1/users",
+        query_string={"email_prefix": "list-", "is_email_verified": "false"},
+        headers=token_headers(app, listed_users[0]),
+    )
+    assert [user["email"] for user in response.json["users"]] == [
+        "list-3@example.com",
+        "list-1@example.com",
+    ]
+
+
+def test_listing_requires_admin(app, client, listed_users):
+    response = client.get("/v1/users", headers=token_headers(app, listed_users[1]))
+    assert response.status_code == 403
+
+
+def test_invalid_cursor_is_rejected(app, client, listed_users):
+    response = client.get(
+        "/v1/users",
+        query_string={"cursor": "not-a-cursor"},
+        headers=token_headers(app, listed_users[0]),
+    )
+    assert response.status_code == 400
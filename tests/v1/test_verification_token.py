@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+from sqlalchemy import text
+
+from app.v1.models import User
+from app.v1.repositories.user_repository import (
+    UserRepository,
+    verification_token_digest,
+)
+
+
+def add_unverified_user(db_session, email, token, expiry):
+    user = User()
+    user.email = email
+    user.first_name = "Unverified"
+    user.last_name = "User"
+    user.phone_number = "+8412345678"
+    user.password_hash = "fakehashedpassword"
+    user.verification_token_hash = verification_token_digest(token)
+    user.verification_token_expiry = expiry
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+@pytest.fixture
+def unverified_users(db_session):
+    now = datetime.now(tz=pytz.utc)
+    users = [
+        add_unverified_user(
+            db_session, "live@example.com", "live-token", now + timedelta(hours=1)
+        ),
+        add_unverified_user(
+            db_session, "expired@example.com", "expired-token", now - timedelta(hours=1)
+        ),
+    ]
+    yield users
+    db_session.query(User).filter(User.id.in_([u.id for u in users])).delete()
+    db_session.commit()
+
+
+def test_verify_email_matches_stored_digest(client, db_session, unverified_users):
+    live = unverified_users[0]
+    assert live.verification_token_hash != "live-token"
+
+    response = client.get("/v1/auth/verify-email?token=live-token")
+    assert response.status_code == 200
+
+    db_session.expire_all()
+    user = db_session.get(User, live.id)
+    assert user.is_email_verified
+    assert user.verification_token_hash is None
+
+
+def test_purge_clears_only_expired_tokens(db_session, unverified_users):
+    live, expired = unverified_users
+
+    purged = UserRepository(db_session).purge_expired_verification_tokens(batch_size=1)
+
+    assert purged == 1
+    db_session.expire_all()
+    assert db_session.get(User, expired.id).verification_token_hash is None
+    assert db_session.get(User, live.id).verification_token_hash is not None
+
+
+def test_token_lookup_uses_partial_index(db_session):
+    query = db_session.query(User).filter_by(
+        verification_token_hash=verification_token_digest("any-token")
+    )
+    statement = query.statement.compile(
+        dialect=db_session.bind.dialect, compile_kwargs={"literal_binds": True}
+    )
+    if db_session.bind.dialect.name == "postgresql":
+        # The test table is tiny; take a sequential scan off the table.
+        db_session.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = db_session.execute(text(f"EXPLAIN {statement}")).scalars().all()
+    else:
+        plan = [
+            row[-1]
+            for row in db_session.execute(text(f"EXPLAIN QUERY PLAN {statement}"))
+        ]
+    assert "ix_users_verification_token_hash" in " ".join(plan)